@@ -7,6 +7,47 @@ class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "this-is-the-default-key")
     MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
     DB_NAME = os.getenv("DB_NAME", "Development")
+    # Connection pool of the MongoClient shared by each worker process
+    MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", 100))
+    MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", 0))
+    MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", 300000))
+    MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", 5000))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000))
+    MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", 10000))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", 2000))
+    # Default number of documents of a listing page
+    PAGE_SIZE = int(os.getenv("PAGE_SIZE", 100))
+    # Largest page a listing request can ask for
+    MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", 1000))
+    # Live games kept by each worker process, snapshotted every few moves or seconds
+    GAME_CACHE_SIZE = int(os.getenv("GAME_CACHE_SIZE", 256))
+    GAME_CACHE_TTL = int(os.getenv("GAME_CACHE_TTL", 900))
+    GAME_CACHE_FLUSH_MOVES = int(os.getenv("GAME_CACHE_FLUSH_MOVES", 8))
+    GAME_CACHE_FLUSH_SECONDS = int(os.getenv("GAME_CACHE_FLUSH_SECONDS", 5))
+    # Gunicorn workers of the Procfile, more than one needing GAME_LOCKS=mongo and SOCKETIO_MESSAGE_QUEUE
+    WEB_WORKERS = int(os.getenv("WEB_WORKERS", 1))
+    # Per-game locks: local to the process (one worker) or mongo leases (several workers)
+    GAME_LOCKS = os.getenv("GAME_LOCKS", "local")
+    GAME_LOCK_TTL = float(os.getenv("GAME_LOCK_TTL", 5))
+    GAME_LOCK_TIMEOUT = float(os.getenv("GAME_LOCK_TIMEOUT", 2))
+    # Queue relaying the Socket.IO events between workers (redis://..., memory:// in one process)
+    SOCKETIO_MESSAGE_QUEUE = os.getenv("SOCKETIO_MESSAGE_QUEUE", os.getenv("REDIS_URL"))
+    # Without sticky sessions, several workers need websocket only clients
+    SOCKETIO_TRANSPORTS = os.getenv("SOCKETIO_TRANSPORTS", "websocket,polling").split(",")
+    # Bot searches: process pool of BOT_WORKERS per worker, thread or inline
+    BOT_POOL = os.getenv("BOT_POOL", "process")
+    BOT_WORKERS = int(os.getenv("BOT_WORKERS", 2))
+    # Default search time of the montecarlo bots
+    BOT_BUDGET_MS = float(os.getenv("BOT_BUDGET_MS", 300))
+    # Bot turns of a busy or stale game: retries, the first delay doubling at each one
+    BOT_RETRIES = int(os.getenv("BOT_RETRIES", 5))
+    BOT_RETRY_SECONDS = float(os.getenv("BOT_RETRY_SECONDS", 0.1))
+    # Create the missing collection indexes in the background at app startup, the unique
+    # indexes of locks and plays being always created before serving with several workers
+    MONGO_ENSURE_INDEXES = os.getenv("MONGO_ENSURE_INDEXES", "1") == "1"
+    # Level of the app log, and the engine events of every move logged at info level
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    ENGINE_EVENT_LOG = os.getenv("ENGINE_EVENT_LOG", "0") == "1"
 
 
 class ProductionConfig(Config):
@@ -16,3 +57,4 @@ class ProductionConfig(Config):
 class DevelopmentConfig(Config):
     DEBUG = True
     DEVELOPMENT = True
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG")
@@ -25,7 +25,7 @@ def create_app(test_config=None):
 
     gunicorn_logger = logging.getLogger('gunicorn.error')
     app.logger.handlers = gunicorn_logger.handlers
-    app.logger.setLevel(logging.DEBUG)
+    app.logger.setLevel(app.config.get('LOG_LEVEL', 'INFO'))
     app.logger.debug('App Initialization')
 
     db_name = app.config.get("DB_NAME")
@@ -35,9 +35,18 @@ def create_app(test_config=None):
     def hello():
         return "This is Automatic Waffle, the backend of a scrabble app"
 
-    # Link with mongo db
+    # Link with mongo db, all requests of the process sharing one pooled client
     from scrabble_flask import db
     db.link_app(app)
+    # Per-process cache of the live games
+    from scrabble_flask import game_cache
+    game_cache.link_app(app)
+    # Per-game locks, shared by the workers if configured
+    from scrabble_flask import game_lock
+    game_lock.link_app(app)
+    # Worker pool of the computer players
+    from scrabble_flask import bot_pool
+    bot_pool.link_app(app)
     # Blueprint registrations
     from scrabble_flask.routes import game, play, player
     
@@ -45,6 +54,10 @@ def create_app(test_config=None):
     app.register_blueprint(game.bp)
     app.register_blueprint(play.bp)
 
+    # Real-time game events
+    from scrabble_flask import events
+    events.link_app(app)
+
     # CORS
     CORS(app, supports_credentials=True)
 
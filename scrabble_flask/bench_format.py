@@ -0,0 +1,60 @@
+"""
+Compare the game codec of format_helpers with the jsonpickle path
+
+Encode/decode time and stored size of a mid-game Scrabble, run with:
+    python -m scrabble_flask.bench_format [--moves 12] [--repeat 200]
+"""
+import argparse
+import timeit
+
+import bson
+
+from scrabble_flask.format_helpers import (doc_to_game, doc_to_obj, game_to_doc,
+                                           game_to_msgpack, msgpack, msgpack_to_game,
+                                           obj_to_doc)
+from scrabble_python import Player, Scrabble, Tile
+from scrabble_python.movegen import generate_moves
+
+
+def play_game(nb_moves: int) -> Scrabble:
+    """
+    Return a game after nb_moves best scoring moves
+    """
+    game = Scrabble(players=[Player('player_1'), Player('player_2')])
+    for _ in range(nb_moves):
+        moves = generate_moves(game.board, game.get_curr_rack())
+        if not moves:
+            break
+        move = max(moves, key=lambda move: move.score)
+        rack = game.get_curr_rack()
+        for tile in move.tiles:
+            # The rack holds a blank (*) for each blank placed on the board
+            rack.remove(Tile('*') if tile.blank else Tile(tile.letter))
+        rack.extend(game.purse.draw(min(len(move), len(game.purse))))
+        game.save_move(move.tiles)
+    return game
+
+
+def bench(name, encode, decode, game, repeat):
+    encoded = encode(game)
+    size = len(encoded) if isinstance(encoded, bytes) else len(bson.encode(encoded))
+    encode_ms = timeit.timeit(lambda: encode(game), number=repeat) / repeat * 1e3
+    decode_ms = timeit.timeit(lambda: decode(encoded), number=repeat) / repeat * 1e3
+    print(f'{name:<12}{size:>10}{encode_ms:>12.3f}{decode_ms:>12.3f}')
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Benchmark the game serialization formats')
+    parser.add_argument('--moves', type=int, default=12, help='moves played before encoding')
+    parser.add_argument('--repeat', type=int, default=200, help='runs per measure')
+    args = parser.parse_args(argv)
+    game = play_game(args.moves)
+    print(f'{"format":<12}{"bytes":>10}{"encode ms":>12}{"decode ms":>12}')
+    bench('jsonpickle', obj_to_doc, doc_to_obj, game, args.repeat)
+    bench('codec bson', game_to_doc, doc_to_game, game, args.repeat)
+    if msgpack is not None:
+        bench('codec mpack', game_to_msgpack, msgpack_to_game, game, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+Worker pool running the computer players
+
+A bot seat of a game is a player whose id starts with bot-, its strategy
+being stored in the bots field of the game document:
+    bots: {player_id: {strategy, budget_ms}}
+The move of a bot is searched in a pool of worker processes (BOT_POOL), from
+an encoded copy of the game, so that a long search never blocks the event
+loop serving the other games: the request or background task waiting for it
+only polls the future. thread runs the searches in threads of the process,
+inline runs them at once in the caller (tests).
+The pool also records the games whose bot turns are being played by the
+process, so that a game has one bot task at a time.
+"""
+from concurrent.futures import (BrokenExecutor, Future, ProcessPoolExecutor,
+                                ThreadPoolExecutor)
+from threading import Lock
+from uuid import uuid4
+
+from flask import Flask, current_app
+
+from scrabble_flask.format_helpers import doc_to_game
+from scrabble_python.bots import BOTS, make_bot
+
+BOT_PREFIX = 'bot-'
+POOL_KINDS = ('process', 'thread', 'inline')
+
+
+def is_bot(player_id: str) -> bool:
+    return player_id.startswith(BOT_PREFIX)
+
+
+def new_bot_seat(spec: dict) -> dict:
+    """
+    Return the player document of a new bot seat
+    """
+    return {'id': f'{BOT_PREFIX}{uuid4()}', 'pseudo': f'{spec["strategy"]} bot'}
+
+
+def parse_bot_spec(spec, default_budget_ms: float) -> dict:
+    """
+    Return the {strategy, budget_ms} of a bot seat given as a strategy name
+    or a dict, raise a ValueError if invalid
+    """
+    if isinstance(spec, str):
+        spec = {'strategy': spec}
+    if not isinstance(spec, dict) or spec.get('strategy') not in BOTS:
+        raise ValueError(f'bot strategy is one of {list(BOTS)}')
+    budget_ms = spec.get('budget_ms', default_budget_ms)
+    if isinstance(budget_ms, bool) or not isinstance(budget_ms, (int, float)) or budget_ms <= 0:
+        raise ValueError('bot budget_ms is a positive number')
+    return {'strategy': spec['strategy'], 'budget_ms': budget_ms}
+
+
+def choose_bot_move(game_doc: dict, spec: dict) -> dict:
+    """
+    Return the {(x, y): letter} move of the current player of the encoded
+    game, None to pass, run in a pool worker
+    The bot is seeded by the game, so that a search is reproducible
+    """
+    game = doc_to_game(game_doc)
+    options = {'budget_ms': spec['budget_ms']} if spec['strategy'] == 'montecarlo' else {}
+    bot = make_bot(spec['strategy'], seed=game.purse.seed + game.turn, **options)
+    return bot.choose(game)
+
+
+class BotPool:
+    """
+    Executor of the bot searches: process, thread or inline
+    """
+
+    def __init__(self, kind: str = 'process', workers: int = 2) -> None:
+        if kind not in POOL_KINDS:
+            raise ValueError(f'bot pool kind is one of {POOL_KINDS}')
+        self.kind = kind
+        self.workers = workers
+        self.executor = None
+        # Games whose bot turns are played by a task of this process
+        self.games = set()
+        self.games_lock = Lock()
+
+    @property
+    def inline(self) -> bool:
+        return self.kind == 'inline'
+
+    def submit(self, fn, *args) -> Future:
+        if self.inline:
+            future = Future()
+            try:
+                future.set_result(fn(*args))
+            except Exception as err:
+                future.set_exception(err)
+            return future
+        # Workers are started on first use, after the server forked
+        if self.executor is None:
+            executor_class = ProcessPoolExecutor if self.kind == 'process' else ThreadPoolExecutor
+            self.executor = executor_class(max_workers=self.workers)
+        try:
+            return self.executor.submit(fn, *args)
+        except BrokenExecutor:
+            # A worker died: the pool is started again
+            self.shutdown()
+            return self.submit(fn, *args)
+
+    def claim(self, game_id: str) -> bool:
+        """
+        Record that a task plays the bot turns of the game, False if one already does
+        """
+        with self.games_lock:
+            if game_id in self.games:
+                return False
+            self.games.add(game_id)
+            return True
+
+    def release(self, game_id: str) -> None:
+        with self.games_lock:
+            self.games.discard(game_id)
+
+    def shutdown(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+def get_bot_pool() -> BotPool:
+    return current_app.extensions['bot_pool']
+
+
+def link_app(app: Flask) -> None:
+    app.extensions['bot_pool'] = BotPool(app.config.get('BOT_POOL', 'process'),
+                                         app.config.get('BOT_WORKERS', 2))
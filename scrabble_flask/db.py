@@ -1,28 +1,112 @@
-from flask import Flask, current_app, g
+import os
+from threading import Thread
+
+from flask import Flask, current_app
+from pymongo import ASCENDING, IndexModel, MongoClient
+from pymongo.errors import PyMongoError
 
 from scrabble_flask.mongo_api import MongoAPI
 
+# MongoClient options set from the app config
+POOL_OPTIONS = {
+    'maxPoolSize': 'MONGO_MAX_POOL_SIZE',
+    'minPoolSize': 'MONGO_MIN_POOL_SIZE',
+    'maxIdleTimeMS': 'MONGO_MAX_IDLE_TIME_MS',
+    'connectTimeoutMS': 'MONGO_CONNECT_TIMEOUT_MS',
+    'serverSelectionTimeoutMS': 'MONGO_SERVER_SELECTION_TIMEOUT_MS',
+    'socketTimeoutMS': 'MONGO_SOCKET_TIMEOUT_MS',
+    'waitQueueTimeoutMS': 'MONGO_WAIT_QUEUE_TIMEOUT_MS',
+}
+
+# Indexes of the lookups and listings of each collection, built in the background
+INDEXES = {
+    'players': [
+        IndexModel([('id', ASCENDING)], unique=True),
+    ],
+    'games': [
+        IndexModel([('id', ASCENDING)], unique=True),
+        # Listings filtered by state, in id order
+        IndexModel([('state', ASCENDING), ('id', ASCENDING)]),
+    ],
+}
+# Unique indexes the concurrent workers rely on, built before serving: the
+# lease upserts of a game collide on locks, a turn logged twice on plays
+UNIQUE_INDEXES = {
+    'locks': [
+        IndexModel([('id', ASCENDING)], unique=True),
+    ],
+    'plays': [
+        # The move log of a game, one move per turn
+        IndexModel([('game_id', ASCENDING), ('turn', ASCENDING)], unique=True),
+    ],
+}
+
+# One client (and so one connection pool) per process, uri and options
+_clients = {}
+# (client id, database name, collection) whose indexes were already ensured
+_indexed = set()
+
+
+def create_mongo_client(config) -> MongoClient:
+    """
+    Return the MongoClient of this process for the config, created on first call
+    The client connects lazily, on its first operation
+    """
+    options = {option: config[key] for option, key in POOL_OPTIONS.items() if config.get(key) is not None}
+    client_key = (os.getpid(), config['MONGO_URI'], tuple(sorted(options.items())))
+    if client_key not in _clients:
+        _clients[client_key] = MongoClient(config['MONGO_URI'], connect=False, **options)
+    return _clients[client_key]
+
 
 def get_mongo_db(collection: str) -> MongoAPI:
-    if f'{collection}_db' not in g:
+    """
+    Return the MongoAPI handle of the collection, all handles sharing the app client
+    """
+    mongo_apis = current_app.extensions['mongo_apis']
+    if collection not in mongo_apis:
         current_app.logger.debug(f'MONGODB {collection} Opened')
-        g.setdefault(f'{collection}_db', MongoAPI(
+        mongo_apis[collection] = MongoAPI(
             collection=collection,
-            uri=current_app.config['MONGO_URI'],
-            db_name=current_app.config['DB_NAME']
-        ))
-        
-    return g.get(f'{collection}_db')
+            db_name=current_app.config['DB_NAME'],
+            client=current_app.extensions['mongo_client']
+        )
+    return mongo_apis[collection]
+
 
-# TODO fix close the connection
-def close_mongo_db(e=None):
-    coll_names = ['players_db', 'games_db', 'plays_db']
-    mongo_colls = [g.pop(coll_name, None) for coll_name in coll_names]
-    for mongo in [mongo for mongo in mongo_colls if mongo is not None]:
-        current_app.logger.debug(f'MONGODB {mongo.collection.name} Closed')
-        mongo.close_db()
+def ensure_indexes(app: Flask, indexes: dict) -> bool:
+    """
+    Create the missing {collection: indexes} of the app database, once per client
+    Return False if the database failed, the failure being logged
+    """
+    client = app.extensions['mongo_client']
+    db_name = app.config['DB_NAME']
+    try:
+        for collection, collection_indexes in indexes.items():
+            if (id(client), db_name, collection) not in _indexed:
+                MongoAPI(collection, db_name=db_name, client=client).ensure_indexes(collection_indexes)
+                _indexed.add((id(client), db_name, collection))
+    except PyMongoError as err:
+        app.logger.error(f'MONGODB Indexes of {list(indexes)} not ensured: {err}')
+        return False
+    app.logger.debug(f'MONGODB Indexes of {list(indexes)} ensured')
+    return True
 
 
 def link_app(app: Flask):
+    app.extensions['mongo_client'] = create_mongo_client(app.config)
+    app.extensions['mongo_apis'] = {}
     app.logger.debug('MONGODB Linked')
-    app.teardown_appcontext(close_mongo_db)
+    # Several workers serialize the moves of a game through the unique indexes:
+    # a worker does not serve without them. A single one locks its games itself.
+    shared = app.config.get('GAME_LOCKS', 'local') == 'mongo' or app.config.get('WEB_WORKERS', 1) > 1
+    if shared and not ensure_indexes(app, UNIQUE_INDEXES):
+        raise RuntimeError('the unique indexes of locks and plays are needed by several workers')
+    if app.config.get('MONGO_ENSURE_INDEXES', True):
+        # In the background, so that an unreachable database does not delay the startup
+        client_db = (id(app.extensions['mongo_client']), app.config['DB_NAME'])
+        indexes = {collection: collection_indexes
+                   for collection, collection_indexes in (INDEXES | UNIQUE_INDEXES).items()
+                   if (*client_db, collection) not in _indexed}
+        if indexes:
+            Thread(target=ensure_indexes, args=(app, indexes), name='mongo-indexes', daemon=True).start()
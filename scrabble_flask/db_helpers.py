@@ -1,6 +1,9 @@
-from flask import abort
+from flask import Response, abort, current_app, json, stream_with_context
+from pymongo import ASCENDING
 from scrabble_flask.db import get_mongo_db
 
+BOOL_ARGS = {'true': True, '1': True, 'false': False, '0': False}
+
 
 def get_body_or_400(request, req_params, opt_params=None):
     if opt_params is None:
@@ -18,9 +21,69 @@ def get_body_or_400(request, req_params, opt_params=None):
         return body
 
 
-def get_n_docs(collection, n):
-    collection_api = get_mongo_db(collection)
-    return collection_api.read_many_docs(n)
+def forbidden(err_msg, **details):
+    return Response(response=json.dumps({'err_msg': err_msg} | details),
+                    status=403,
+                    mimetype='application/json')
+
+
+def get_page_args_or_400(request, filter_args=None):
+    """
+    Return the (filter, after, limit) of a listing request
+    after is the id of the last document of the previous page, limit (or its
+    alias n) the page size, capped at MAX_PAGE_SIZE
+    filter_args maps the accepted query parameters to (field, type) pairs
+    """
+    if filter_args is None:
+        filter_args = {}
+    filt = {}
+    for arg, (field, arg_type) in filter_args.items():
+        value = request.args.get(arg)
+        if value is None:
+            continue
+        if arg_type is bool:
+            if value.lower() not in BOOL_ARGS:
+                abort(400, description=f'Invalid {arg} parameter, expected true or false')
+            value = BOOL_ARGS[value.lower()]
+        filt[field] = value
+    default_limit = request.args.get('n', current_app.config.get('PAGE_SIZE', 100), int)
+    limit = request.args.get('limit', default_limit, int)
+    if limit < 1:
+        abort(400, description='Invalid limit parameter, expected a positive integer')
+    return filt, request.args.get('after'), min(limit, current_app.config.get('MAX_PAGE_SIZE', 1000))
+
+
+def iter_page_docs(collection, filt=None, after=None, limit=0, projection=None):
+    """
+    Return a cursor on the documents following the after id, in id order
+    The unique id index serves both the seek and the sort
+    """
+    filt = {} if filt is None else dict(filt)
+    if after is not None:
+        filt['id'] = {'$gt': after}
+    return get_mongo_db(collection).iter_docs(filt, limit, projection, sort=[('id', ASCENDING)])
+
+
+def stream_json_array(docs):
+    """
+    Serialize the documents as a JSON array, one document at a time
+    """
+    yield '['
+    for idx, doc in enumerate(docs):
+        yield (',' if idx else '') + json.dumps(doc)
+    yield ']'
+
+
+def stream_page_or_400(collection, request, filter_args=None, projection=None):
+    """
+    Return a response streaming a page of the collection documents as they
+    are read from the cursor, so that listings use constant memory
+    """
+    filt, after, limit = get_page_args_or_400(request, filter_args)
+    docs = iter_page_docs(collection, filt, after, limit, projection)
+    return Response(response=stream_with_context(stream_json_array(docs)),
+                    status=200,
+                    mimetype='application/json')
 
 
 def delete_doc_or_404(collection, doc_id, id_key='id'):
@@ -31,9 +94,9 @@ def delete_doc_or_404(collection, doc_id, id_key='id'):
     return delete_result
 
 
-def get_doc_or_404(collection, doc_id, id_key='id'):
+def get_doc_or_404(collection, doc_id, id_key='id', projection=None):
     coll_api = get_mongo_db(collection)
-    doc = coll_api.read_one_doc({id_key: doc_id})
+    doc = coll_api.read_one_doc({id_key: doc_id}, projection)
     if(doc is None):
         abort(
             404, description=f'Document {id_key}: {doc_id} not found in collection: {collection}')
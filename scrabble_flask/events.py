@@ -0,0 +1,100 @@
+"""
+Real-time game events over Socket.IO
+
+Clients connect to the /game namespace and watch games: each game is a room,
+and every change of a game (join, leave, start, move) is pushed to its room
+as a compact diff, so that clients never poll the API.
+
+Events emitted to a game room:
+    player_joined: game_id, player {id, pseudo}, nb_players
+    player_left: game_id, player_id, nb_players
+    game_started: game_id, turn, curr_player
+    move_played: game_id, turn, curr_player, player_id, kind, tiles, words,
+        score, scores, nb_purse, finished
+
+With several workers, SOCKETIO_MESSAGE_QUEUE (a Redis url) relays the events
+of a worker to the clients connected to the others; memory:// relays them
+between the apps of a single process, standing in for a queue in tests.
+"""
+import queue
+from collections import defaultdict
+
+import socketio as python_socketio
+from flask import Flask, current_app, request
+from flask_socketio import Namespace, SocketIO, join_room, leave_room
+
+NAMESPACE = '/game'
+MEMORY_QUEUE = 'memory://'
+
+
+class MemoryManager(python_socketio.PubSubManager):
+    """
+    In-process message queue: every manager of a channel gets the messages
+    published by the others, as the workers sharing a Redis queue would
+    """
+    name = 'memory'
+    channels = defaultdict(list)
+
+    def initialize(self):
+        self.queue = queue.Queue()
+        self.channels[self.channel].append(self.queue)
+        super().initialize()
+
+    def _publish(self, data):
+        message = self.json.dumps(data)
+        for manager_queue in self.channels[self.channel]:
+            manager_queue.put(message)
+
+    def _listen(self):
+        while True:
+            yield self.queue.get()
+
+
+class GameNamespace(Namespace):
+    """
+    Socket.IO namespace with one room per game
+    """
+
+    def on_connect(self, auth=None):
+        current_app.logger.debug(f'SOCKETIO {request.sid} connected')
+
+    def on_disconnect(self, reason=None):
+        current_app.logger.debug(f'SOCKETIO {request.sid} disconnected')
+
+    def on_watch(self, message):
+        """
+        Join the room of the game {game_id}, acknowledged with the game id
+        """
+        join_room(message['game_id'])
+        return {'game_id': message['game_id'], 'watching': True}
+
+    def on_unwatch(self, message):
+        leave_room(message['game_id'])
+        return {'game_id': message['game_id'], 'watching': False}
+
+
+def get_socketio(app: Flask = None) -> SocketIO:
+    return (app or current_app).extensions['socketio']
+
+
+def emit_game_event(game_id: str, event: str, diff: dict) -> None:
+    """
+    Push the diff of a game to the clients watching it, whatever their worker
+    """
+    get_socketio().emit(event, {'game_id': game_id} | diff, to=game_id, namespace=NAMESPACE)
+
+
+def link_app(app: Flask) -> SocketIO:
+    options = {'cors_allowed_origins': '*', 'async_mode': app.config.get('SOCKETIO_ASYNC_MODE')}
+    if app.config.get('SOCKETIO_TRANSPORTS'):
+        options['transports'] = app.config['SOCKETIO_TRANSPORTS']
+    message_queue = app.config.get('SOCKETIO_MESSAGE_QUEUE')
+    channel = app.config.get('SOCKETIO_CHANNEL', 'flask-socketio')
+    if message_queue == MEMORY_QUEUE:
+        options['client_manager'] = MemoryManager(channel=channel)
+    elif message_queue:
+        options['message_queue'] = message_queue
+        options['channel'] = channel
+    socketio = SocketIO(app, **options)
+    socketio.on_namespace(GameNamespace(NAMESPACE))
+    return socketio
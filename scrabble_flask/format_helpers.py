@@ -1,6 +1,19 @@
 import json
 import jsonpickle
 
+from scrabble_python import Board, Player, Purse, Scrabble, Tile, Word
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional, only needed by the msgpack form
+    msgpack = None
+
+# Version of the game documents written by game_to_doc
+CODEC_VERSION = 1
+# Bit of a packed board square holding a blank
+BLANK_BIT = 0x80
+
+
 def obj_to_doc(obj: object) -> dict:
     return json.loads(jsonpickle.encode(obj))
 
@@ -17,4 +30,97 @@ def doc_to_JSONstr(doc: dict) -> str:
     return json.dumps(doc)
 
 def obj_to_JSONstr(obj: object) -> str:
-    return jsonpickle.encode(obj)
\ No newline at end of file
+    return jsonpickle.encode(obj)
+
+
+def board_to_bytes(board: Board) -> bytes:
+    """
+    Pack the board into one byte per square: the letter code, plus BLANK_BIT for a blank
+    """
+    return bytes(code | BLANK_BIT if blank else code for code, blank in zip(board.grid, board.blanks))
+
+def bytes_to_board(packed: bytes, lang: str = 'fr') -> Board:
+    size = int(len(packed) ** 0.5)
+    board = Board.__new__(Board)
+    board.__setstate__({
+        'SIZE': size,
+        'LANG': lang,
+        'grid': bytes(byte & ~BLANK_BIT for byte in packed),
+        'blanks': bytes(byte >> 7 for byte in packed)
+    })
+    return board
+
+def purse_to_doc(purse: Purse) -> dict:
+    """
+    The purse as its letter count vector (one byte per letter code) and its generator state
+    """
+    return {'counts': bytes(purse.counts), 'seed': purse.seed, 'nb_draws': purse.nb_draws}
+
+def doc_to_purse(doc: dict, lang: str = 'fr') -> Purse:
+    purse = Purse.__new__(Purse)
+    purse.__setstate__({'LANG': lang, 'counts': list(doc['counts']), 'seed': doc['seed'], 'nb_draws': doc['nb_draws']})
+    return purse
+
+def player_to_doc(player: Player) -> dict:
+    """
+    The player with its rack as a string of letters, * for a blank
+    """
+    return {'id': player.ID, 'score': player.score, 'rack': ''.join(tile.letter for tile in player.rack)}
+
+def doc_to_player(doc: dict, lang: str = 'fr') -> Player:
+    return Player(doc['id'], doc['score'], [Tile(letter, lang=lang) for letter in doc['rack']])
+
+def game_to_doc(game: Scrabble) -> dict:
+    """
+    Encode a game into a compact BSON-friendly document
+    """
+    return {
+        'v': CODEC_VERSION,
+        'config': dict(game.config),
+        'turn': game.turn,
+        'turn_rd': game.turn_rd,
+        'players': [player_to_doc(game.players[pl_id]) for pl_id in game.pl_ids],
+        'board': board_to_bytes(game.board),
+        'purse': purse_to_doc(game.purse),
+        'history': [
+            [turn, [[word.text, *word.start, word.direction, word.score] for word in words]]
+            for turn, words in game.history.items()
+        ]
+    }
+
+def doc_to_game(doc: dict) -> Scrabble:
+    """
+    Decode a document written by game_to_doc
+    """
+    if doc.get('v') != CODEC_VERSION:
+        raise ValueError(f'Unsupported game document version: {doc.get("v")}')
+    config = doc['config']
+    lang = config['LANG']
+    history = {}
+    for turn, words in doc['history']:
+        history[turn] = []
+        for text, x, y, direction, score in words:
+            word = Word(text, (x, y), direction, lang)
+            word.score = score
+            history[turn].append(word)
+    return Scrabble(
+        players=[doc_to_player(player_doc, lang) for player_doc in doc['players']],
+        board_size=config['BOARD_SIZE'],
+        rack_size=config['RACK_SIZE'],
+        lang=lang,
+        turn=doc['turn'],
+        turn_rd=doc['turn_rd'],
+        history=history,
+        purse=doc_to_purse(doc['purse'], lang),
+        board=bytes_to_board(doc['board'], lang)
+    )
+
+def game_to_msgpack(game: Scrabble) -> bytes:
+    if msgpack is None:
+        raise ImportError('msgpack is required for the msgpack game form')
+    return msgpack.packb(game_to_doc(game), use_bin_type=True)
+
+def msgpack_to_game(packed: bytes) -> Scrabble:
+    if msgpack is None:
+        raise ImportError('msgpack is required for the msgpack game form')
+    return doc_to_game(msgpack.unpackb(packed, raw=False, strict_map_key=False))
@@ -0,0 +1,335 @@
+"""
+Per-process cache of the live games
+
+Running games are kept as Scrabble instances, so reading and validating a
+move never touches the database. Each move is appended at once to the plays
+log (see move_log), while the whole game is written back later as a snapshot
+(write-behind). A game missing from the cache is rebuilt from its snapshot
+and the moves logged since.
+
+The game documents carry a version number, bumped by each move: a snapshot
+is only written if the stored document is still at the version the cache
+last read or wrote, and a move only logged if its turn is not logged yet.
+A game updated meanwhile by another process is dropped from the cache and
+reloaded.
+"""
+import atexit
+import logging
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from threading import RLock
+
+from flask import Flask, current_app
+from pymongo import ASCENDING
+from pymongo.errors import DuplicateKeyError, PyMongoError
+
+from scrabble_flask.db import get_mongo_db
+from scrabble_flask.format_helpers import doc_to_game, game_to_doc
+from scrabble_flask.move_log import replay
+from scrabble_python import Scrabble
+from scrabble_python.events import logging_listener
+
+# Field of the game documents holding the encoded Scrabble
+STATE_FIELD = 'scrabble'
+
+
+class StaleGame(Exception):
+    """
+    The stored game was updated by another process since it was cached
+    """
+
+    def __init__(self, game_id: str) -> None:
+        super().__init__(f'game {game_id} was updated by another process')
+        self.game_id = game_id
+
+
+class _Entry:
+    __slots__ = ('game', 'version', 'stored_version', 'accessed_at', 'dirty_since')
+
+    def __init__(self, game: Scrabble, version: int, now: float) -> None:
+        self.game = game
+        self.version = version
+        self.stored_version = version
+        self.accessed_at = now
+        self.dirty_since = None
+
+    @property
+    def dirty(self) -> bool:
+        return self.version != self.stored_version
+
+
+class GameCache:
+    """
+    LRU cache of Scrabble instances keyed by game id
+
+        games_api: MongoAPI of the games collection
+        plays_api: MongoAPI of the plays collection, None to keep no move log
+        max_size: number of games kept, the least recently used being evicted
+        ttl: seconds after which an idle game is evicted
+        flush_moves, flush_seconds: a dirty game snapshot is written once it
+            is this many moves or seconds ahead of the stored one
+        listeners: event listeners attached to every cached game
+    The cache lock only guards the entries: the database reads and writes of
+    a game run under the lock of this game, so a slow one stalls no other game
+    """
+
+    def __init__(self, games_api, plays_api=None, max_size: int = 256, ttl: float = 900, flush_moves: int = 8,
+                 flush_seconds: float = 5, clock=time.monotonic, listeners=()) -> None:
+        self.games_api = games_api
+        self.plays_api = plays_api
+        self.max_size = max_size
+        self.ttl = ttl
+        self.flush_moves = flush_moves
+        self.flush_seconds = flush_seconds
+        self.clock = clock
+        self.listeners = tuple(listeners)
+        self.entries = OrderedDict()
+        self.lock = RLock()
+        # game id: [lock, number of threads holding or waiting for it]
+        self.game_locks = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, game_id: str) -> bool:
+        return game_id in self.entries
+
+    def get(self, game_id: str) -> Scrabble:
+        """
+        Return the live game, rebuilt from its snapshot and move log on a miss
+        None if the game does not exist or is not running
+        """
+        with self.lock:
+            entry = self._access(game_id)
+        if entry is not None:
+            return entry.game
+        # Loaded under the lock of the game only, the other games being served meanwhile
+        with self.locked(game_id):
+            with self.lock:
+                # Loaded by another thread meanwhile
+                entry = self._access(game_id)
+            if entry is not None:
+                return entry.game
+            doc = self.games_api.read_one_doc({'id': game_id}, {STATE_FIELD: 1, 'version': 1, 'state': 1})
+            if doc is None or STATE_FIELD not in doc or doc.get('state', 'running') != 'running':
+                return None
+            game = doc_to_game(doc[STATE_FIELD])
+            entry = _Entry(game, doc.get('version', 0), self.clock())
+            if self.plays_api is not None:
+                records = self.plays_api.iter_docs(
+                    {'game_id': game_id, 'turn': {'$gte': game.turn}}, sort=[('turn', ASCENDING)])
+                # The snapshot lags behind the replayed moves
+                entry.version += replay(game, records)
+                if entry.dirty:
+                    entry.dirty_since = self.clock()
+            self._insert(game_id, entry)
+        return game
+
+    @contextmanager
+    def locked(self, game_id: str, blocking: bool = True):
+        """
+        Hold the lock of the game, so that its moves are applied one at a time
+        while the other games of the process are played concurrently
+        Yield whether the lock is held, False if busy and not blocking
+        """
+        with self.lock:
+            game_lock = self.game_locks.setdefault(game_id, [RLock(), 0])
+            game_lock[1] += 1
+        acquired = game_lock[0].acquire(blocking)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                game_lock[0].release()
+            with self.lock:
+                game_lock[1] -= 1
+                if not game_lock[1]:
+                    del self.game_locks[game_id]
+
+    def version(self, game_id: str) -> int:
+        return self.entries[game_id].version
+
+    def add(self, game_id: str, game: Scrabble, version: int = 0, dirty: bool = True) -> None:
+        """
+        Cache a new live game, whose stored document is at version
+        A dirty game is ahead of its stored document until its first flush
+        """
+        entry = _Entry(game, version, self.clock())
+        if dirty:
+            self._mark_dirty(entry)
+        self._insert(game_id, entry)
+
+    def touch(self, game_id: str, record: dict = None) -> int:
+        """
+        Record a move applied to the cached game and return its new version
+        The move record is appended to the log and the game snapshot written if
+        far enough ahead of the stored one, raising StaleGame if another process
+        updated the game meanwhile
+        On any failure the game is dropped, to be reloaded from the database on
+        the next read. The error is only raised if the move is not logged: a
+        failed snapshot of a logged move is made up by its replay.
+        """
+        with self.locked(game_id):
+            with self.lock:
+                entry = self.entries[game_id]
+            logged = record is not None and self.plays_api is not None
+            if logged:
+                try:
+                    self.plays_api.insert_doc(dict(record))
+                except DuplicateKeyError as err:
+                    self.discard(game_id)
+                    raise StaleGame(game_id) from err
+                except PyMongoError:
+                    self.discard(game_id)
+                    raise
+            with self.lock:
+                self.entries.move_to_end(game_id)
+                self._mark_dirty(entry)
+            if entry.version - entry.stored_version >= self.flush_moves \
+                    or self.clock() - entry.dirty_since >= self.flush_seconds:
+                try:
+                    self._flush_entry(game_id, entry)
+                except (StaleGame, PyMongoError):
+                    self.discard(game_id)
+                    if not logged:
+                        raise
+            return entry.version
+
+    def flush(self, game_id: str = None) -> int:
+        """
+        Write back the dirty games (or only game_id) and return how many were written
+        Games updated meanwhile by another process are dropped
+        """
+        with self.lock:
+            game_ids = [game_id] if game_id is not None else list(self.entries)
+        flushed = 0
+        for dirty_id in game_ids:
+            # A game in the middle of a move in another thread is written later
+            with self.locked(dirty_id, blocking=False) as acquired:
+                if not acquired:
+                    continue
+                with self.lock:
+                    entry = self.entries.get(dirty_id)
+                if entry is None or not entry.dirty:
+                    continue
+                try:
+                    self._flush_entry(dirty_id, entry)
+                except StaleGame:
+                    continue
+                flushed += 1
+        return flushed
+
+    def evict_idle(self) -> list[str]:
+        """
+        Write back and evict the games idle for more than ttl seconds
+        """
+        with self.lock:
+            limit = self.clock() - self.ttl
+            idle_ids = []
+            # Entries are in access order, the idle ones come first
+            for game_id, entry in self.entries.items():
+                if entry.accessed_at >= limit:
+                    break
+                idle_ids.append(game_id)
+        return [game_id for game_id in idle_ids if self._evict(game_id)]
+
+    def maintain(self) -> None:
+        """
+        Write back the games dirty for more than flush_seconds and evict the idle ones
+        """
+        with self.lock:
+            limit = self.clock() - self.flush_seconds
+            dirty_ids = [game_id for game_id, entry in self.entries.items()
+                         if entry.dirty and entry.dirty_since <= limit]
+        for game_id in dirty_ids:
+            self.flush(game_id)
+        self.evict_idle()
+
+    def discard(self, game_id: str) -> None:
+        """
+        Forget the game without writing it back
+        """
+        with self.lock:
+            self.entries.pop(game_id, None)
+
+    def _access(self, game_id: str) -> _Entry:
+        entry = self.entries.get(game_id)
+        if entry is not None:
+            self.entries.move_to_end(game_id)
+            entry.accessed_at = self.clock()
+        return entry
+
+    def _insert(self, game_id: str, entry: _Entry) -> None:
+        for listener in self.listeners:
+            entry.game.add_listener(listener)
+        with self.lock:
+            self.entries[game_id] = entry
+            self.entries.move_to_end(game_id)
+            lru_ids = list(self.entries)[:max(len(self.entries) - self.max_size, 0)]
+        # Least recently used first, a game busy in another thread being kept
+        for lru_id in lru_ids:
+            self._evict(lru_id)
+
+    def _evict(self, game_id: str) -> bool:
+        """
+        Write back and forget the game, unless busy or it could not be written back
+        """
+        with self.locked(game_id, blocking=False) as acquired:
+            if not acquired:
+                return False
+            self.flush(game_id)
+            with self.lock:
+                entry = self.entries.get(game_id)
+                if entry is not None and entry.dirty:
+                    return False
+                self.entries.pop(game_id, None)
+            return True
+
+    def _mark_dirty(self, entry: _Entry) -> None:
+        if not entry.dirty:
+            entry.dirty_since = self.clock()
+        entry.version += 1
+        entry.accessed_at = self.clock()
+
+    def _flush_entry(self, game_id: str, entry: _Entry) -> None:
+        """
+        Write the game snapshot, under the lock of the game only
+        """
+        updated = self.games_api.update_versioned_doc(
+            {'id': game_id}, entry.stored_version, entry.version, {STATE_FIELD: game_to_doc(entry.game)})
+        if not updated:
+            self.discard(game_id)
+            raise StaleGame(game_id)
+        entry.stored_version = entry.version
+        entry.dirty_since = None
+
+
+def get_game_cache() -> GameCache:
+    return current_app.extensions['game_cache']
+
+
+def link_app(app: Flask) -> None:
+    with app.app_context():
+        games_api = get_mongo_db('games')
+        plays_api = get_mongo_db('plays')
+    app.extensions['game_cache'] = GameCache(
+        games_api,
+        plays_api,
+        max_size=app.config.get('GAME_CACHE_SIZE', 256),
+        ttl=app.config.get('GAME_CACHE_TTL', 900),
+        flush_moves=app.config.get('GAME_CACHE_FLUSH_MOVES', 8),
+        flush_seconds=app.config.get('GAME_CACHE_FLUSH_SECONDS', 5),
+        # Engine events go to the app log only if asked, games being silent otherwise
+        listeners=[logging_listener(app.logger, logging.INFO)] if app.config.get('ENGINE_EVENT_LOG') else []
+    )
+
+    # Games still dirty at exit are written back
+    atexit.register(app.extensions['game_cache'].flush)
+
+    @app.teardown_appcontext
+    def maintain_game_cache(exception):
+        try:
+            app.extensions['game_cache'].maintain()
+        except PyMongoError as err:
+            app.logger.error(f'GAME CACHE Write-behind failed: {err}')
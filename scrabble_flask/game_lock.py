@@ -0,0 +1,114 @@
+"""
+Per-game locks, so that the moves of a game are applied one at a time
+
+Within a process, each game has its own lock in the game cache. Across
+worker processes, LEASES set to mongo adds a lease per game in the locks
+collection: the lease expires by itself if its worker dies, and records the
+turn of the game when released, so that a worker whose cached game lags
+behind reloads it before applying a move. Any worker can then serve any
+game, without sticky sessions.
+"""
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from flask import Flask, current_app
+from pymongo.errors import DuplicateKeyError
+
+from scrabble_flask.db import get_mongo_db
+from scrabble_flask.events import MEMORY_QUEUE
+from scrabble_flask.game_cache import get_game_cache
+
+
+class GameBusy(Exception):
+    """
+    The game lease is held by another worker
+    """
+
+    def __init__(self, game_id: str) -> None:
+        super().__init__(f'game {game_id} is busy')
+        self.game_id = game_id
+
+
+class Lease:
+    __slots__ = ('game_id', 'owner', 'turn')
+
+    def __init__(self, game_id: str, owner: str = None, turn: int = None) -> None:
+        self.game_id = game_id
+        self.owner = owner
+        self.turn = turn
+
+
+class MongoLeases:
+    """
+    Expiring game leases shared by the workers through the locks collection
+
+        ttl: seconds after which a lease not released expires
+        timeout: seconds waited for a busy lease before giving up
+    """
+
+    def __init__(self, locks_api, ttl: float = 5, timeout: float = 2, retry_delay: float = 0.005) -> None:
+        self.locks_api = locks_api
+        self.ttl = ttl
+        self.timeout = timeout
+        self.retry_delay = retry_delay
+
+    def acquire(self, game_id: str) -> Lease:
+        """
+        Take the game lease, raise GameBusy if still held by another worker after timeout
+        """
+        owner = str(uuid4())
+        deadline = time.monotonic() + self.timeout
+        while True:
+            now = datetime.now(timezone.utc)
+            try:
+                doc = self.locks_api.find_one_and_update_doc(
+                    {'id': game_id, '$or': [{'owner': None}, {'expires': {'$lt': now}}]},
+                    {'$set': {'owner': owner, 'expires': now + timedelta(seconds=self.ttl)}},
+                    upsert=True
+                )
+                return Lease(game_id, owner, doc.get('turn'))
+            except DuplicateKeyError:
+                # The lease exists and is held: no document matched, the upsert collided
+                if time.monotonic() >= deadline:
+                    raise GameBusy(game_id)
+                time.sleep(self.retry_delay)
+
+    def release(self, lease: Lease) -> None:
+        self.locks_api.update_one_doc({'id': lease.game_id, 'owner': lease.owner},
+                                      {'owner': None, 'turn': lease.turn})
+
+
+@contextmanager
+def game_turn(game_id: str):
+    """
+    Hold the locks of the game while a move is applied, yielding its lease
+    Set lease.turn to the game turn once the move is applied
+    """
+    leases = current_app.extensions['game_leases']
+    with get_game_cache().locked(game_id):
+        if leases is None:
+            yield Lease(game_id)
+            return
+        lease = leases.acquire(game_id)
+        try:
+            yield lease
+        finally:
+            leases.release(lease)
+
+
+def link_app(app: Flask) -> None:
+    # Several workers share the game locks and events through the database and the message queue
+    workers = app.config.get('WEB_WORKERS', 1)
+    if workers > 1 and (app.config.get('GAME_LOCKS', 'local') != 'mongo'
+                        or app.config.get('SOCKETIO_MESSAGE_QUEUE') in (None, '', MEMORY_QUEUE)):
+        raise RuntimeError(f'{workers} workers need GAME_LOCKS=mongo and a SOCKETIO_MESSAGE_QUEUE')
+    leases = None
+    if app.config.get('GAME_LOCKS', 'local') == 'mongo':
+        with app.app_context():
+            locks_api = get_mongo_db('locks')
+        leases = MongoLeases(locks_api,
+                             ttl=app.config.get('GAME_LOCK_TTL', 5),
+                             timeout=app.config.get('GAME_LOCK_TIMEOUT', 2))
+    app.extensions['game_leases'] = leases
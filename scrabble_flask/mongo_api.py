@@ -1,6 +1,15 @@
 import time
 
-from pymongo import MongoClient
+from pymongo import MongoClient, ReturnDocument
+
+
+def with_projection(projection=None):
+    """
+    Return the server-side projection, the _id field being always excluded
+    """
+    if projection is None:
+        return {'_id': 0}
+    return {'_id': 0} | projection
 
 
 class MongoAPI:
@@ -17,6 +26,8 @@ class MongoAPI:
         Name of the database to connect
     collection : str
         Name of the document collection, without collection name only ping method is available
+    client : MongoClient
+        Shared client to use instead of opening a new one from uri, it is then not closed by close_db
 
     Methods
     -------
@@ -37,10 +48,19 @@ class MongoAPI:
 
     update(filt, dataToBeUpdate)
         Update the first document matching the filter parameter filt, with the data in the parameter dataToBeUpdated
+    find_one_and_update_doc(filt, update)
+        Atomically apply update operators to the first document matching filt and return it updated
+    update_versioned_doc(filt, version, new_version, data_to_put)
+        Update the document matching filt only if it is still at the expected version
+    iter_docs(filt, n, projection, sort)
+        Iterate lazily over the documents matching filt
+    ensure_indexes(indexes)
+        Create the missing indexes of the collection
     """
 
-    def __init__(self, collection, uri, db_name):
-        self.client = MongoClient(uri)
+    def __init__(self, collection, uri=None, db_name=None, client=None):
+        self.owns_client = client is None
+        self.client = MongoClient(uri) if client is None else client
         self.cursor = self.client[db_name]
         self.collection = self.cursor[collection]
 
@@ -90,39 +110,54 @@ class MongoAPI:
         return {'Status': 'Document Successfully Deleted'} if response.deleted_count > 0 else {'Status': 'Document not found'}
     
     
-    def read_random_docs(self, n=1):
-        random_docs = self.collection.aggregate(([{ "$sample": { "size": n } }]))
-        return [{item: data[item] for item in data if item != '_id'} for data in random_docs]
+    def read_random_docs(self, n=1, projection=None):
+        random_docs = self.collection.aggregate([{"$sample": {"size": n}}, {"$project": with_projection(projection)}])
+        return list(random_docs)
 
 
-    def read_many_docs(self, filt = None, n=0):
+    def read_many_docs(self, filt = None, n=0, projection=None):
         """
         Find many documents in the collection matching the filter
 
             Parameters:
                 filt (dict): JSON object defining the filter to applicate
                 n (int): number of document you want (0 is equivalent to no limit)
+                projection (dict): fields to include or exclude, _id is always excluded
             Returns
                 output (list): list of JSON objects representing the found documents
         """
+        return list(self.iter_docs(filt, n, projection))
+
+    def iter_docs(self, filt=None, n=0, projection=None, sort=None):
+        """
+        Iterate lazily over the documents in the collection matching the filter
+
+            Parameters:
+                filt (dict): JSON object defining the filter to applicate
+                n (int): number of document you want (0 is equivalent to no limit)
+                projection (dict): fields to include or exclude, _id is always excluded
+                sort (list): (field, direction) pairs ordering the documents
+            Returns
+                output (Cursor): cursor yielding the found documents batch by batch
+        """
         if filt is None:
             filt = {}
-        documents = self.collection.find(filt).limit(n)
-        return [{item: data[item] for item in data if item != '_id'} for data in documents]
+        cursor = self.collection.find(filt, with_projection(projection)).limit(n)
+        if sort is not None:
+            cursor = cursor.sort(sort)
+        return cursor
 
-    def read_one_doc(self, filt):
+    def read_one_doc(self, filt, projection=None):
         """
         Find one document in the collection, the first matching the filter
 
             Parameters:
                 filt (dict): JSON object defining the filter to applicate
+                projection (dict): fields to include or exclude, _id is always excluded
             Returns
                 output (dict): JSON objects representing the found document
         """
-        document = self.collection.find_one(filt)
-        if document is None:
-            return None
-        return {item: document[item] for item in document if item != '_id'}
+        return self.collection.find_one(filt, with_projection(projection))
 
     def update_one_doc(self, filt, data_to_put):
         """
@@ -138,5 +173,50 @@ class MongoAPI:
         response = self.collection.update_one(filt, updated_data)
         return {'Status': 'Document Successfully Updated' if response.modified_count > 0 else "Nothing was updated."}
 
+    def update_versioned_doc(self, filt, version, new_version, data_to_put):
+        """
+        Update one document only if it is still at the expected version (optimistic concurrency)
+
+            Parameters:
+                filt (dict): JSON object defining the filter to applicate
+                version (int): expected version of the document, 0 matching a document never versioned
+                new_version (int): version of the document once updated
+                data_to_put (dict): JSON object representing the data to be updated
+            Returns
+                output (bool): True if the document was at the expected version and is updated
+        """
+        version_filt = {'$in': [0, None]} if version == 0 else version
+        response = self.collection.update_one(filt | {'version': version_filt},
+                                              {'$set': data_to_put | {'version': new_version}})
+        return response.matched_count > 0
+
+    def ensure_indexes(self, indexes):
+        """
+        Create the indexes of the collection which do not exist yet
+
+            Parameters:
+                indexes (list): pymongo IndexModel declarations
+            Returns
+                output (list): names of the indexes
+        """
+        return self.collection.create_indexes(indexes)
+
+    def find_one_and_update_doc(self, filt, update, upsert=False, projection=None):
+        """
+        Atomically update one document in the collection, the first matching the filter, in a single round trip
+
+            Parameters:
+                filt (dict): JSON object defining the filter to applicate
+                update (dict): update operators to apply ($set, $addToSet, $pull...)
+                upsert (bool): insert the document if none matches the filter
+                projection (dict): fields to include or exclude, _id is always excluded
+            Returns
+                output (dict): JSON object representing the updated document, None if no document matched
+        """
+        document = self.collection.find_one_and_update(
+            filt, update, projection=with_projection(projection), upsert=upsert, return_document=ReturnDocument.AFTER)
+        return document
+
     def close_db(self):
-        self.client.close()
+        if self.owns_client:
+            self.client.close()
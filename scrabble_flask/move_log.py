@@ -0,0 +1,87 @@
+"""
+Append-only log of the moves of the games
+
+Each move is a small document of the plays collection, unique per game and
+turn, holding what is needed to replay it without validation:
+    game_id, turn, player_id
+    kind: play, exchange or pass
+    tiles: [x, y, letter] placed for a play (lowercase letter for a blank),
+        letters returned to the purse for an exchange (* for a blank)
+    words: [text, x, y, direction, score] formed by a play
+    score: points scored by a play, bonuses of a full rack and of the game end included
+    drawn: letters drawn from the purse
+    nb_draws: number of draws of the purse generator after the move
+The game document holds a periodic snapshot of the whole game (its scrabble
+field, see game_cache), a game being rebuilt from its latest snapshot and
+the moves played since.
+"""
+from datetime import datetime, timezone
+
+from scrabble_python import Scrabble, Tile, Word
+
+MOVE_KINDS = ('play', 'exchange', 'pass')
+
+
+def make_record(game_id: str, turn: int, player_id: str, kind: str, tiles=(), words=(),
+                score: int = 0, drawn=(), nb_draws: int = 0) -> dict:
+    """
+    Return the log record of a move played at turn, tiles and drawn being Tile lists
+    """
+    if kind not in MOVE_KINDS:
+        raise ValueError(f'move kind is one of {MOVE_KINDS}')
+    if kind == 'play':
+        tiles = [[*tile.pos, tile.letter.lower() if tile.blank else tile.letter] for tile in tiles]
+    else:
+        tiles = ''.join(tile.letter for tile in tiles)
+    return {
+        'game_id': game_id,
+        'turn': turn,
+        'player_id': player_id,
+        'kind': kind,
+        'tiles': tiles,
+        'words': [[word.text, *word.start, word.direction, word.score] for word in words],
+        'score': score,
+        'drawn': ''.join(tile.letter for tile in drawn),
+        'nb_draws': nb_draws,
+        'created_at': datetime.now(timezone.utc)
+    }
+
+
+def apply_record(game: Scrabble, record: dict) -> None:
+    """
+    Replay a recorded move on the game, which must be at the record turn
+    """
+    if record['turn'] != game.turn:
+        raise ValueError(f'record of turn {record["turn"]} replayed at turn {game.turn}')
+    lang = game.config['LANG']
+    player = game.players[record['player_id']]
+    rack = player.rack
+    if record['kind'] == 'play':
+        tiles = [Tile(letter.upper(), (x, y), lang, blank=letter.islower()) for x, y, letter in record['tiles']]
+        for tile in tiles:
+            rack.remove(Tile('*' if tile.blank else tile.letter, lang=lang))
+        game.board.add_tiles(tiles)
+        player.score += record['score']
+    elif record['kind'] == 'exchange':
+        returned = [Tile(letter, lang=lang) for letter in record['tiles']]
+        for tile in returned:
+            rack.remove(tile)
+        game.purse.put_back(returned)
+    rack.extend(game.purse.replay_draw(record['drawn'], record['nb_draws']))
+    words = []
+    for text, x, y, direction, score in record['words']:
+        word = Word(text, (x, y), direction, lang)
+        word.score = score
+        words.append(word)
+    game.pass_turn(words)
+
+
+def replay(game: Scrabble, records) -> int:
+    """
+    Replay the records following the game snapshot, in turn order, and return their number
+    """
+    nb_records = 0
+    for record in records:
+        apply_record(game, record)
+        nb_records += 1
+    return nb_records
@@ -1,28 +1,50 @@
 from uuid import uuid4
 from datetime import datetime, timezone
 
-from flask import Blueprint, Response, abort, json, request
+from flask import Blueprint, Response, abort, current_app, json, request
+from scrabble_flask.bot_pool import new_bot_seat, parse_bot_spec
 from scrabble_flask.db import get_mongo_db
+from scrabble_flask.events import emit_game_event
+from scrabble_flask.format_helpers import game_to_doc
+from scrabble_flask.game_cache import STATE_FIELD, get_game_cache
+from scrabble_flask.routes.play import schedule_bot_turns
 
-from scrabble_python import Scrabble
+from scrabble_python import Player, Scrabble
 
-from scrabble_flask.db_helpers import (delete_doc_or_404, get_body_or_400,
-                                  get_doc_or_404, get_n_docs)
+from scrabble_flask.db_helpers import (forbidden, get_body_or_400,
+                                  get_doc_or_404, stream_page_or_400)
 
 bp = Blueprint('game', __name__, url_prefix='/game')
 
+MAX_PLAYERS = 4
+# Query parameters filtering the game listing
+GAME_FILTERS = {
+    'state': ('state', str),
+    'private': ('config.private', bool),
+    'lang': ('config.lang', str)
+}
+# Player fields embedded in the game documents
+PLAYER_FIELDS = {'id': 1, 'pseudo': 1}
+# Game fields left out of the responses: the encoded live game and its version
+GAME_PROJECTION = {STATE_FIELD: 0, 'version': 0}
+
 
 @bp.route('/', methods=['GET', 'POST'])
 def index():
     """
-    GET: Get all (or n: query parameter) game documents
-    POST: Create a new game document
+    GET: Get a page of game documents (after, limit: query parameters),
+    filtered by state, private or lang
+    POST: Create a new game document, bots filling seats next to the creator
+    (bots: [strategy or {strategy, budget_ms}, ...], strategy being greedy,
+    leave or montecarlo)
     """
     if request.method == 'POST':
         req_params = ['name', 'nb_players', 'creator_id']
-        opt_params = ['board_size', 'rack_size', 'lang', 'private']
+        opt_params = ['board_size', 'rack_size', 'lang', 'private', 'bots']
         body = get_body_or_400(request, req_params, opt_params)
-        creator_doc = get_doc_or_404('players', body['creator_id'])
+        bot_specs = get_bot_specs_or_400(body)
+        creator_doc = get_doc_or_404('players', body['creator_id'], projection=PLAYER_FIELDS)
+        bot_docs = [new_bot_seat(spec) for spec in bot_specs]
 
         config = {
             'board_size': body.get('board_size', Scrabble.df_bsize),
@@ -38,7 +60,8 @@ def index():
             'creator_id': body['creator_id'],
             'name': body['name'],
             'nb_players': body['nb_players'],
-            'players': [creator_doc],
+            'players': [creator_doc, *bot_docs],
+            'bots': {bot_doc['id']: spec for bot_doc, spec in zip(bot_docs, bot_specs)},
             'config': config
         }
 
@@ -47,16 +70,26 @@ def index():
                         status=201,
                         mimetype='application/json')
 
-    n = request.args.get('n', 0, int)
-    game_docs = get_n_docs('games', n)
-    return Response(response=json.dumps(game_docs),
-                    status=200,
-                    mimetype='application/json')
+    return stream_page_or_400('games', request, GAME_FILTERS, projection=GAME_PROJECTION)
+
+
+def get_bot_specs_or_400(body) -> list[dict]:
+    """
+    Return the specs of the bot seats of a new game, leaving a seat to the creator
+    """
+    bots = body.get('bots', [])
+    if not isinstance(bots, list) or bots and not (isinstance(body['nb_players'], int)
+                                                   and len(bots) < body['nb_players']):
+        abort(400, description='Invalid bots parameter, a list of at most nb_players - 1 bots')
+    try:
+        return [parse_bot_spec(spec, current_app.config.get('BOT_BUDGET_MS', 300)) for spec in bots]
+    except ValueError as err:
+        abort(400, description=f'Invalid bots parameter, {err}')
 
 
 @bp.route('/<game_id>', methods=['GET'])
 def get_game(game_id):
-    game_doc = get_doc_or_404('games', game_id)
+    game_doc = get_doc_or_404('games', game_id, projection=GAME_PROJECTION)
     return Response(response=json.dumps(game_doc),
                     status=200,
                     mimetype='application/json')
@@ -64,41 +97,98 @@ def get_game(game_id):
 
 @bp.route('/join', methods=['PUT'])
 def join_game():
+    """
+    Add the player to the game in one atomic update, the filter enforcing
+    the game capacity and avoiding duplicate joins under concurrent requests
+    """
     req_params = ['game_id', 'player_id']
     body = get_body_or_400(request, req_params)
-    player_doc = get_doc_or_404('players', body['player_id'])
-    game_doc = get_doc_or_404('games', body['game_id'])
-    players = game_doc['players']
-    # Avoid duplicate join
-    if body['player_id'] not in [player['id'] for player in players]:
-        players.append(player_doc)
-    update_result = get_mongo_db('games').update_one_doc(
-        {'id': body['game_id']}, game_doc)
-    return Response(response=json.dumps(update_result),
+    player_doc = get_doc_or_404('players', body['player_id'], projection=PLAYER_FIELDS)
+    game_doc = get_mongo_db('games').find_one_and_update_doc(
+        {
+            'id': body['game_id'],
+            'players.id': {'$ne': body['player_id']},
+            '$expr': {'$lt': [{'$size': '$players'}, {'$ifNull': ['$nb_players', MAX_PLAYERS]}]}
+        },
+        {'$addToSet': {'players': player_doc}},
+        projection=GAME_PROJECTION
+    )
+    if game_doc is None:
+        # Nothing matched: unknown game, player already in or full game
+        game_doc = get_doc_or_404('games', body['game_id'], projection=GAME_PROJECTION)
+        if body['player_id'] not in [player['id'] for player in game_doc['players']]:
+            return forbidden('game is complete')
+    else:
+        emit_game_event(body['game_id'], 'player_joined',
+                        {'player': player_doc, 'nb_players': len(game_doc['players'])})
+    return Response(response=json.dumps(game_doc | {'Status': 'Player Successfully Joined'}),
                     status=201,
                     mimetype='application/json')
 
 
 @bp.route('/leave', methods=['PUT'])
 def leave_game():
+    """
+    Remove the player from the game in one atomic update, the creator cannot leave
+    """
     req_params = ['game_id', 'player_id']
     body = get_body_or_400(request, req_params)
-    player_doc = get_doc_or_404('players', body['player_id'])
-    game_doc = get_doc_or_404('games', body['game_id'])
-    players = game_doc['players']
-    # Avoid duplicate remove
-    if body['player_id'] in [player['id'] for player in players]:
-        players.remove(player_doc)
-    update_result = get_mongo_db('games').update_one_doc(
-        {'id': body['game_id']}, game_doc)
-    return Response(response=json.dumps(update_result),
+    game_doc = get_mongo_db('games').find_one_and_update_doc(
+        {'id': body['game_id'], 'creator_id': {'$ne': body['player_id']}},
+        {'$pull': {'players': {'id': body['player_id']}}},
+        projection=GAME_PROJECTION
+    )
+    if game_doc is None:
+        # Nothing matched: unknown game or creator leaving
+        get_doc_or_404('games', body['game_id'], projection={'id': 1})
+        return forbidden('creator cannot leave')
+    emit_game_event(body['game_id'], 'player_left',
+                    {'player_id': body['player_id'], 'nb_players': len(game_doc['players'])})
+    return Response(response=json.dumps(game_doc | {'Status': 'Player Successfully Left'}),
                     status=201,
                     mimetype='application/json')
 
 
 @bp.route('/start', methods=['PUT'])
 def start_game():
+    """
+    Deal the racks of a complete game, which becomes running
+    """
     req_params = ['game_id']
-    body = get_body_or_400(request, req_params)
+    opt_params = ['creator_id']
+    body = get_body_or_400(request, req_params, opt_params)
     game_doc = get_doc_or_404('games', body['game_id'])
-    abort(404)
+    if body.get('creator_id', game_doc['creator_id']) != game_doc['creator_id']:
+        return forbidden('only the creator can start')
+    players = game_doc['players']
+    if len(players) != game_doc.get('nb_players', len(players)):
+        return forbidden('uncomplete game')
+    if game_doc.get('state', 'unstarted') != 'unstarted':
+        return forbidden('game already started')
+
+    config = game_doc.get('config', {})
+    game = Scrabble(
+        players=[Player(player['id']) for player in players],
+        board_size=config.get('board_size', Scrabble.df_bsize),
+        rack_size=config.get('rack_size', Scrabble.df_rsize),
+        lang=config.get('lang', Scrabble.df_lang)
+    )
+    # The first snapshot, only written if nobody started the game meanwhile
+    game_doc = get_mongo_db('games').find_one_and_update_doc(
+        {'id': body['game_id'], 'state': game_doc.get('state', {'$exists': False})},
+        {'$set': {
+            'state': 'running',
+            'started_at': datetime.now(timezone.utc),
+            STATE_FIELD: game_to_doc(game),
+            'version': 0
+        }},
+        projection=GAME_PROJECTION
+    )
+    if game_doc is None:
+        return forbidden('game already started')
+    get_game_cache().add(body['game_id'], game, version=0, dirty=False)
+    emit_game_event(body['game_id'], 'game_started', {'turn': game.turn, 'curr_player': game.curr_player})
+    schedule_bot_turns(body['game_id'], game.curr_player)
+    return Response(response=json.dumps(game_doc | {'curr_player': game.curr_player}),
+                    status=201,
+                    mimetype='application/json')
@@ -1,26 +1,331 @@
-from datetime import datetime, timezone
-from uuid import uuid4
+from contextlib import contextmanager
 
-from flask import Blueprint, Response, abort, json, request
+from flask import (Blueprint, Flask, Response, abort, after_this_request,
+                   current_app, json, request)
+from pymongo.errors import PyMongoError
+from scrabble_flask.bot_pool import choose_bot_move, get_bot_pool, is_bot
 from scrabble_flask.db import get_mongo_db
-from scrabble_flask.db_helpers import (get_body_or_400,
+from scrabble_flask.db_helpers import (forbidden, get_body_or_400,
                                   get_doc_or_404)
+from scrabble_flask.events import emit_game_event, get_socketio
+from scrabble_flask.format_helpers import game_to_doc
+from scrabble_flask.game_cache import StaleGame, get_game_cache
+from scrabble_flask.game_lock import GameBusy, Lease, game_turn
+from scrabble_flask.move_log import make_record
+from scrabble_flask.timing import PhaseTimer
 from scrabble_python import Scrabble
+from scrabble_python.errors import BadWords, ScrabbleError
 
 bp = Blueprint('play', __name__, url_prefix='/play')
 
 
+def parse_move_or_400(tiles) -> dict:
+    """
+    Return the {(x, y): letter} move of the [[x, y, letter], ...] tiles of a body
+    A lowercase letter is a blank played as this letter
+    """
+    try:
+        move = {(int(x), int(y)): str(letter) for x, y, letter in tiles}
+    except (TypeError, ValueError):
+        abort(400, description='Invalid tiles parameter, format: [[x, y, letter], ...]')
+    if not all(len(letter) == 1 and letter.isascii() and letter.isalpha() for letter in move.values()):
+        abort(400, description='Invalid tiles parameter, letters are A-Z, a-z for a blank')
+    if not move or len(move) != len(tiles):
+        abort(400, description='Invalid tiles parameter, at least one tile and one tile per square')
+    return move
+
+
+def get_live_game(game_id: str, lease: Lease) -> Scrabble:
+    """
+    Return the live game, None if it is not running
+    A cached game behind the turn of the lease was played by another worker meanwhile: it is reloaded
+    """
+    cache = get_game_cache()
+    game = cache.get(game_id)
+    if game is not None and lease.turn is not None and game.turn != lease.turn:
+        cache.discard(game_id)
+        game = cache.get(game_id)
+    return game
+
+
+def get_running_game_or_403(game_id: str, player_id: str, lease: Lease) -> Scrabble:
+    """
+    Return the live game, if it is the turn of the player
+    """
+    game = get_live_game(game_id, lease)
+    if game is None:
+        get_doc_or_404('games', game_id, projection={'id': 1})
+        abort(forbidden('game not running'))
+    if player_id not in game.players:
+        abort(forbidden('player not in game'))
+    if player_id != game.curr_player:
+        if is_bot(game.curr_player):
+            resume_bot_turns(game_id, game.curr_player)
+        abort(forbidden('not your turn'))
+    return game
+
+
+@contextmanager
+def game_turn_or_503(game_id: str):
+    """
+    Hold the game locks while a move is applied, the game being busy in another worker after a timeout
+    """
+    try:
+        with game_turn(game_id) as lease:
+            yield lease
+    except GameBusy:
+        abort(Response(response=json.dumps({'err_msg': 'game busy, retry'}),
+                       status=503,
+                       mimetype='application/json'))
+
+
+def play_tiles(game: Scrabble, game_id: str, move: dict) -> dict:
+    """
+    Validate, score and apply the move of the current player, refilling its rack
+    Return the log record of the move, raise a ScrabbleError if it is invalid
+    """
+    player_id = game.curr_player
+    player = game.players[player_id]
+    tiles = game.check_format_move(move)
+    words = game.board.get_next_words(tiles)
+    turn, score = game.turn, player.score
+    drawn = game.update_rack(move)
+    game.save_move(tiles, words)
+    return make_record(game_id, turn, player_id, 'play', tiles, words, player.score - score,
+                       drawn, game.purse.nb_draws)
+
+
+def pass_turn(game: Scrabble, game_id: str) -> dict:
+    """
+    Pass the turn of the current player and return the log record of the move
+    """
+    record = make_record(game_id, game.turn, game.curr_player, 'pass', nb_draws=game.purse.nb_draws)
+    game.pass_turn()
+    return record
+
+
+def log_move(game: Scrabble, game_id: str, record: dict) -> int:
+    """
+    Log the move and return the new game version, the final snapshot of a
+    finished game being written at once
+    Raise StaleGame if another process logged this turn meanwhile, a
+    PyMongoError if the move could not be logged: the cached game, ahead of
+    the log, is then dropped
+    """
+    cache = get_game_cache()
+    version = cache.touch(game_id, record)
+    if record['kind'] == 'play' and not game.players[record['player_id']].rack:
+        # The move is logged, a failure here is not the move's
+        try:
+            cache.flush(game_id)
+            get_mongo_db('games').update_one_doc({'id': game_id}, {'state': 'finished'})
+        except PyMongoError as err:
+            current_app.logger.error(f'PLAY {game_id} finished game not written: {err}')
+        finally:
+            cache.discard(game_id)
+    return version
+
+
+def persist_move(game: Scrabble, game_id: str, record: dict) -> int:
+    try:
+        return log_move(game, game_id, record)
+    except StaleGame:
+        abort(Response(response=json.dumps({'err_msg': 'game was updated meanwhile, retry'}),
+                       status=409,
+                       mimetype='application/json'))
+    except PyMongoError as err:
+        current_app.logger.error(f'PLAY {game_id} move not logged: {err}')
+        abort(Response(response=json.dumps({'err_msg': 'move not saved, retry'}),
+                       status=503,
+                       mimetype='application/json'))
+
+
+def move_state(game: Scrabble, record: dict, version: int) -> dict:
+    """
+    Return the game state following the move, as answered to its player
+    """
+    player = game.players[record['player_id']]
+    return {
+        'turn': game.turn,
+        'curr_player': game.curr_player,
+        'version': version,
+        'move': {key: record[key] for key in ('player_id', 'kind', 'tiles', 'words', 'score')},
+        'scores': {pl_id: game.players[pl_id].score for pl_id in game.pl_ids},
+        'rack': ''.join(tile.letter for tile in player.rack),
+        'nb_purse': len(game.purse),
+        'finished': record['kind'] == 'play' and not player.rack
+    }
+
+
+def emit_move_played(record: dict, state: dict) -> None:
+    # Watchers get the public part of the state: no rack
+    emit_game_event(record['game_id'], 'move_played',
+                    {key: value for key, value in state.items() if key not in ('rack', 'move', 'version')}
+                    | state['move'])
+
+
+def move_response(game: Scrabble, record: dict, version: int, timer: PhaseTimer) -> Response:
+    state = move_state(game, record, version)
+    emit_move_played(record, state)
+    timer.lap('response')
+    current_app.logger.debug(f'PLAY {record["game_id"]} turn {record["turn"]} {timer.header()}')
+    response = Response(response=json.dumps(state),
+                        status=201,
+                        mimetype='application/json')
+    response.headers['Server-Timing'] = timer.header()
+    return response
+
+
+def schedule_bot_turns(game_id: str, curr_player: str) -> None:
+    """
+    Play the turns of the bots following a move, in a background task
+    """
+    if not is_bot(curr_player):
+        return
+    app = current_app._get_current_object()
+    if get_bot_pool().inline:
+        run_bot_turns(app, game_id)
+    else:
+        get_socketio().start_background_task(run_bot_turns, app, game_id)
+
+
+def resume_bot_turns(game_id: str, curr_player: str) -> None:
+    """
+    Schedule the pending turn of a bot once the response is sent, the game
+    locks being released: a task stopped by an error or a restart left it
+    """
+    @after_this_request
+    def schedule(response: Response) -> Response:
+        schedule_bot_turns(game_id, curr_player)
+        return response
+
+
+def run_bot_turns(app: Flask, game_id: str) -> None:
+    """
+    Play the game while its current player is a bot, one task per game
+    A busy or stale game is retried after a growing delay, BOT_RETRIES
+    times, the turn being resumed by the next request on the game otherwise
+    """
+    bot_pool = app.extensions['bot_pool']
+    if not bot_pool.claim(game_id):
+        return
+    try:
+        with app.app_context():
+            bots = {}
+            retries = 0
+            while True:
+                try:
+                    if not play_bot_turn(app, game_id, bots):
+                        return
+                    retries = 0
+                except (GameBusy, StaleGame, PyMongoError) as err:
+                    if retries == app.config.get('BOT_RETRIES', 5):
+                        app.logger.error(f'BOT {game_id} turn stopped: {err}')
+                        return
+                    delay = app.config.get('BOT_RETRY_SECONDS', 0.1) * 2 ** retries
+                    retries += 1
+                    app.logger.warning(f'BOT {game_id} turn retried in {delay} s: {err}')
+                    get_socketio().sleep(delay)
+    finally:
+        bot_pool.release(game_id)
+
+
+def play_bot_turn(app: Flask, game_id: str, bots: dict) -> bool:
+    """
+    Search and play the move of the current player if a bot, False otherwise
+    The search runs in the bot pool without holding the game locks, its move
+    being dropped if the game turn changed meanwhile. A failed search passes
+    the bot turn
+    """
+    with game_turn(game_id) as lease:
+        game = get_live_game(game_id, lease)
+        if game is None or not is_bot(game.curr_player):
+            return False
+        turn, player_id, game_doc = game.turn, game.curr_player, game_to_doc(game)
+    if player_id not in bots:
+        bots.update(get_mongo_db('games').read_one_doc({'id': game_id}, {'bots': 1}).get('bots', {}))
+    spec = bots.get(player_id) or {'strategy': 'greedy', 'budget_ms': app.config.get('BOT_BUDGET_MS', 300)}
+    try:
+        future = get_bot_pool().submit(choose_bot_move, game_doc, spec)
+        while not future.done():
+            get_socketio().sleep(app.config.get('BOT_POLL_SECONDS', 0.01))
+        move = future.result()
+    except Exception as err:
+        app.logger.error(f'BOT {game_id} search failed: {err!r}')
+        move = None
+    with game_turn(game_id) as lease:
+        game = get_live_game(game_id, lease)
+        if game is None:
+            return False
+        if game.turn == turn:
+            record = play_bot_move(game, game_id, move)
+            version = log_move(game, game_id, record)
+            lease.turn = game.turn
+            emit_move_played(record, move_state(game, record, version))
+    return True
+
+
+def play_bot_move(game: Scrabble, game_id: str, move: dict) -> dict:
+    """
+    Apply the move chosen by a bot, None or an invalid move passing its turn
+    """
+    if move is not None:
+        try:
+            return play_tiles(game, game_id, move)
+        except ScrabbleError as err:
+            current_app.logger.error(f'BOT {game_id} invalid move {move}: {err}')
+    return pass_turn(game, game_id)
+
+
 @bp.route('/', methods=['PUT'])
 def index():
+    """
+    Play tiles ([[x, y, letter], ...]) for the current player of a running game
+    A blank is played as a lowercase letter: [7, 7, 'e']
+    """
+    timer = PhaseTimer()
     req_params = ['game_id', 'player_id', 'tiles']
     body = get_body_or_400(request, req_params)
-    game_doc = get_doc_or_404('games', body['game_id'])
-    abort(404)
+    move = parse_move_or_400(body['tiles'])
+    # Moves of a game are applied one at a time
+    with game_turn_or_503(body['game_id']) as lease:
+        game = get_running_game_or_403(body['game_id'], body['player_id'], lease)
+        timer.lap('load')
+        try:
+            record = play_tiles(game, body['game_id'], move)
+        except BadWords as err:
+            return forbidden(str(err),
+                             bad_words=[word.text for word in err.bad_words],
+                             good_words=[word.text for word in err.good_words])
+        except ScrabbleError as err:
+            return forbidden(str(err))
+        timer.lap('play')
+        version = persist_move(game, body['game_id'], record)
+        lease.turn = game.turn
+        timer.lap('persist')
+        # Emitted before the next move of the game
+        response = move_response(game, record, version, timer)
+    schedule_bot_turns(body['game_id'], game.curr_player)
+    return response
 
 
 @bp.route('/abort', methods=['PUT'])
 def abort_play():
+    """
+    Pass the turn of the current player of a running game
+    """
+    timer = PhaseTimer()
     req_params = ['game_id', 'player_id']
     body = get_body_or_400(request, req_params)
-    game_doc = get_doc_or_404('games', body['game_id'])
-    abort(404)
+    with game_turn_or_503(body['game_id']) as lease:
+        game = get_running_game_or_403(body['game_id'], body['player_id'], lease)
+        timer.lap('load')
+        record = pass_turn(game, body['game_id'])
+        timer.lap('play')
+        version = persist_move(game, body['game_id'], record)
+        lease.turn = game.turn
+        timer.lap('persist')
+        # Emitted before the next move of the game
+        response = move_response(game, record, version, timer)
+    schedule_bot_turns(body['game_id'], game.curr_player)
+    return response
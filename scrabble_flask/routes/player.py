@@ -6,7 +6,7 @@ from flask import Blueprint, Response, json, request
 
 from scrabble_flask.db import get_mongo_db
 from scrabble_flask.db_helpers import (delete_doc_or_404, get_body_or_400,
-                                  get_doc_or_404, get_n_docs)
+                                  get_doc_or_404, stream_page_or_400)
 
 
 bp = Blueprint('player', __name__, url_prefix='/player')
@@ -15,7 +15,7 @@ bp = Blueprint('player', __name__, url_prefix='/player')
 @bp.route('/', methods=['GET', 'POST'])
 def index():
     """
-    GET: Get all (or n: query parameter) player documents
+    GET: Get a page of player documents (after, limit: query parameters)
     POST: Create a new player document
     """
     if request.method == 'POST':
@@ -33,11 +33,7 @@ def index():
                         status=201,
                         mimetype='application/json')
 
-    n = request.args.get('n', 0, int)
-    player_docs = get_n_docs('players', n)
-    return Response(response=json.dumps(player_docs),
-                    status=200,
-                    mimetype='application/json')
+    return stream_page_or_400('players', request)
 
 
 @bp.route('/<player_id>', methods=['GET', 'DELETE'])
@@ -0,0 +1,28 @@
+import time
+
+
+class PhaseTimer:
+    """
+    Time the consecutive phases of a request, in milliseconds
+
+    Each lap closes the current phase, the durations are reported in a
+    Server-Timing header
+    """
+
+    def __init__(self) -> None:
+        self.phases = []
+        self.started_at = self.last = time.perf_counter()
+
+    def lap(self, phase: str) -> float:
+        now = time.perf_counter()
+        duration = (now - self.last) * 1e3
+        self.phases.append((phase, duration))
+        self.last = now
+        return duration
+
+    @property
+    def total(self) -> float:
+        return (self.last - self.started_at) * 1e3
+
+    def header(self) -> str:
+        return ', '.join(f'{phase};dur={duration:.2f}' for phase, duration in [*self.phases, ('total', self.total)])
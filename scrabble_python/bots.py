@@ -0,0 +1,210 @@
+"""
+Computer players
+
+A bot chooses the move of the current player of a game, in the format of a
+human submission ({(x, y): letter}, a lowercase letter being a blank), or
+None to pass its turn:
+    greedy: the best scoring move
+    leave: the best score plus the value of the tiles left on the rack
+    montecarlo: the best leave moves, ranked by the replies of the opponent
+        on random racks, simulated until its time budget (ms) is spent
+"""
+import random
+import time
+from collections import Counter
+from functools import lru_cache
+
+from .movegen import Move, best_moves, generate_moves
+
+BINGO_BONUS = 50
+# Value of keeping a tile on the rack, in points (single tile leaves of
+# tournament play, the blank and the S being the keepers)
+TILE_LEAVES = {
+    '*': 25.0, 'A': 1.0, 'B': -2.0, 'C': 0.9, 'D': 0.5, 'E': 4.0, 'F': -2.2, 'G': -2.9,
+    'H': 1.1, 'I': -2.1, 'J': -1.5, 'K': -1.0, 'L': -0.2, 'M': -0.6, 'N': 0.2, 'O': -2.5,
+    'P': -0.5, 'Q': -6.8, 'R': 1.4, 'S': 7.9, 'T': -0.1, 'U': -5.1, 'V': -5.5, 'W': -3.8,
+    'X': 3.3, 'Y': -0.6, 'Z': 5.1
+}
+VOWELS = frozenset('AEIOUY')
+DUPLICATE_PENALTY = 3.0
+BALANCE_PENALTY = 2.0
+
+
+@lru_cache(maxsize=1 << 14)
+def leave_value(leave: str) -> float:
+    """
+    Return the value of the letters (sorted, * for a blank) kept on a rack:
+    the sum of their single tile values, less duplicates and vowel/consonant imbalance
+    """
+    value = sum(TILE_LEAVES.get(letter, 0.0) for letter in leave)
+    value -= DUPLICATE_PENALTY * sum(count - 1 for count in Counter(leave).values())
+    vowels = sum(letter in VOWELS for letter in leave)
+    consonants = sum(letter not in VOWELS and letter != '*' for letter in leave)
+    value -= BALANCE_PENALTY * max(abs(vowels - consonants) - 1, 0)
+    return value
+
+
+def rack_leave(rack_letters: str, move: Move) -> str:
+    """
+    Return the sorted letters left on the rack once the move is played
+    """
+    leave = list(rack_letters)
+    for _, _, letter, blank in move.placements:
+        leave.remove('*' if blank else letter)
+    return ''.join(sorted(leave))
+
+
+def move_points(move: Move, rack_size: int) -> int:
+    return move.score + (BINGO_BONUS if len(move) == rack_size else 0)
+
+
+def move_to_play(move: Move) -> dict:
+    """
+    Return the {(x, y): letter} submission of a generated move
+    """
+    return {(x, y): letter.lower() if blank else letter for x, y, letter, blank in move.placements}
+
+
+class Bot:
+    """
+    Base of the computer players, choosing a move among the generated ones
+    """
+    name = None
+
+    def __init__(self, seed: int = None) -> None:
+        self.rng = random.Random(seed)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}()'
+
+    def choose(self, game) -> dict:
+        """
+        Return the move of the current player of the game, None to pass
+        """
+        moves = generate_moves(game.board, game.get_curr_rack())
+        if not moves:
+            return None
+        return move_to_play(self.pick(game, moves))
+
+    def pick(self, game, moves: list[Move]) -> Move:
+        raise NotImplementedError
+
+
+class GreedyBot(Bot):
+    """
+    Play the best scoring move
+    """
+    name = 'greedy'
+
+    def choose(self, game) -> dict:
+        # Only the best move is built
+        moves = best_moves(game.board, game.get_curr_rack(), 1, game.config['RACK_SIZE'], BINGO_BONUS)
+        if not moves:
+            return None
+        return move_to_play(moves[0])
+
+    def pick(self, game, moves: list[Move]) -> Move:
+        rack_size = game.config['RACK_SIZE']
+        return max(moves, key=lambda move: move_points(move, rack_size))
+
+
+class LeaveBot(Bot):
+    """
+    Play the move maximizing its score plus the value of the tiles kept
+    """
+    name = 'leave'
+
+    def equities(self, game, moves: list[Move]) -> list[float]:
+        rack_letters = ''.join(tile.letter for tile in game.get_curr_rack())
+        rack_size = game.config['RACK_SIZE']
+        # The last tiles of the purse leave nothing to keep for
+        if not len(game.purse):
+            return [move_points(move, rack_size) for move in moves]
+        return [move_points(move, rack_size) + leave_value(rack_leave(rack_letters, move)) for move in moves]
+
+    def pick(self, game, moves: list[Move]) -> Move:
+        equities = self.equities(game, moves)
+        return moves[max(range(len(moves)), key=equities.__getitem__)]
+
+
+class MonteCarloBot(LeaveBot):
+    """
+    Rank the best leave moves by their equity less the mean best reply of the
+    opponent, its rack sampled from the tiles unseen by the bot
+    Simulations run in rounds over the candidates, best equity first, until
+    budget_ms is spent, counted from the move generation of the bot. The
+    generation stops at half the budget once a move is found, the rest being
+    left to rank its moves and simulate, and a best reply search cut by the
+    deadline is not counted
+    """
+    name = 'montecarlo'
+
+    def __init__(self, seed: int = None, budget_ms: float = 300, nb_candidates: int = 8) -> None:
+        super().__init__(seed)
+        self.budget_ms = budget_ms
+        self.nb_candidates = nb_candidates
+
+    def __repr__(self) -> str:
+        return f'MonteCarloBot({self.budget_ms} ms, {self.nb_candidates} candidates)'
+
+    def choose(self, game) -> dict:
+        start = time.perf_counter()
+        deadline = start + self.budget_ms / 1e3
+        moves = generate_moves(game.board, game.get_curr_rack(), start + self.budget_ms / 2e3)
+        if not moves:
+            return None
+        return move_to_play(self.pick(game, moves, deadline))
+
+    def pick(self, game, moves: list[Move], deadline: float = None) -> Move:
+        if deadline is None:
+            deadline = time.perf_counter() + self.budget_ms / 1e3
+        ranked = sorted(zip(self.equities(game, moves), range(len(moves))), reverse=True)[:self.nb_candidates]
+        equities = [equity for equity, _ in ranked]
+        candidates = [moves[idx] for _, idx in ranked]
+        unseen = self.unseen_tiles(game)
+        rack_size = game.config['RACK_SIZE']
+        if len(candidates) == 1 or not unseen:
+            return candidates[0]
+        replies = [0] * len(candidates)
+        nb_runs = [0] * len(candidates)
+        while time.perf_counter() < deadline:
+            opp_rack = self.rng.sample(unseen, min(rack_size, len(unseen)))
+            for idx, move in enumerate(candidates):
+                board = game.board.copy()
+                board.add_tiles(move.tiles)
+                best_reply = best_moves(board, opp_rack, 1, rack_size, BINGO_BONUS, deadline)
+                # A reply search cut by the deadline may have missed the best reply
+                if time.perf_counter() >= deadline:
+                    break
+                replies[idx] += move_points(best_reply[0], rack_size) if best_reply else 0
+                nb_runs[idx] += 1
+        # Out of time in the first round, the candidates left are not ranked
+        simulated = [idx for idx, runs in enumerate(nb_runs) if runs]
+        if not simulated:
+            return candidates[0]
+        best = max(simulated, key=lambda idx: equities[idx] - replies[idx] / nb_runs[idx])
+        return candidates[best]
+
+    @staticmethod
+    def unseen_tiles(game) -> list:
+        """
+        Return the tiles the current player cannot see: purse and opponent racks
+        """
+        unseen = game.purse.tiles
+        for pl_id, player in game.players.items():
+            if pl_id != game.curr_player:
+                unseen.extend(player.rack)
+        return unseen
+
+
+BOTS = {bot.name: bot for bot in (GreedyBot, LeaveBot, MonteCarloBot)}
+
+
+def make_bot(strategy: str, seed: int = None, **options) -> Bot:
+    """
+    Return a bot of the strategy (greedy, leave or montecarlo)
+    Options are the keyword arguments of the bot class (budget_ms, nb_candidates)
+    """
+    if strategy not in BOTS:
+        raise ValueError(f'bot strategy is one of {list(BOTS)}')
+    return BOTS[strategy](seed, **options)
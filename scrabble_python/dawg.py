@@ -0,0 +1,366 @@
+"""
+Compact binary DAWG / GADDAG lexicons
+
+A compiled lexicon is a header followed by a flat array of 32-bit edges.
+A node is a run of consecutive edges sorted by letter code, each edge being:
+    bits 0-4:  letter code (A=1 ... Z=26, GADDAG separator=27)
+    bit 5:     the path ending with this edge is a word
+    bit 6:     last edge of its node
+    bits 7-31: index of the first edge of the child node (0 for no child)
+Compiled files are memory-mapped read-only, so every worker process of a
+machine shares the same pages and queries run directly on the mapped buffer.
+
+Build all compiled lexicons with:
+    python -m scrabble_python.dawg [--gaddag] [lang ...]
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+from array import array
+from functools import lru_cache
+
+from .helpers import create_dictionary, get_avail_langs, get_path
+
+DICT_DIR = 'scrabble_python/dict_and_dist/dictionaries/'
+COMPILED_DIR = 'scrabble_python/dict_and_dist/compiled/'
+
+SEP = '>'
+SEP_CODE = 27
+LETTER_MASK = 0x1F
+WORD_FLAG = 0x20
+LAST_FLAG = 0x40
+CHILD_SHIFT = 7
+ALL_LETTERS = (1 << 27) - 2  # bits of the letter codes 1 (A) to 26 (Z)
+WILDCARDS = '*?'
+
+HEADER = struct.Struct('<4sIIII12x')
+VERSION = 1
+MAGICS = {'dawg': b'DAWG', 'gaddag': b'GDAG'}
+
+
+def letter_code(letter: str) -> int:
+    return SEP_CODE if letter == SEP else ord(letter) - 64
+
+
+def code_letter(code: int) -> str:
+    return SEP if code == SEP_CODE else chr(code + 64)
+
+
+def encode(word: str) -> bytes:
+    return bytes(letter_code(letter) for letter in word)
+
+
+def playable_words(words: list[str]) -> list[str]:
+    """
+    Return the uppercased playable words of a raw dictionary word list
+    Capitalized entries (Martini, Minitel...) are proper nouns, not playable
+    """
+    return [word.upper() for word in words if word.islower() and word.isascii() and word.isalpha()]
+
+
+def gaddag_entries(word: str) -> list[str]:
+    """
+    Return the GADDAG paths of a word: rev(prefix) > suffix for each non empty
+    prefix, the separator being omitted for the whole reversed word
+    """
+    entries = [word[::-1]]
+    for i in range(1, len(word)):
+        entries.append(word[i - 1::-1] + SEP + word[i:])
+    return entries
+
+
+class _BuildNode:
+    __slots__ = ('final', 'edges')
+
+    def __init__(self) -> None:
+        self.final = False
+        self.edges = {}
+
+    def key(self) -> tuple:
+        return (self.final, tuple((code, id(child)) for code, child in self.edges.items()))
+
+
+def build_edges(entries: list[bytes]) -> tuple[array, int]:
+    """
+    Build the minimized automaton of the encoded entries (Daciuk's incremental
+    algorithm on sorted input) and return its flat edge array and root index
+    """
+    root = _BuildNode()
+    register = {}
+    unchecked = []
+    previous = b''
+
+    def minimize(down_to):
+        while len(unchecked) > down_to:
+            parent, code, child = unchecked.pop()
+            key = child.key()
+            if key in register:
+                parent.edges[code] = register[key]
+            else:
+                register[key] = child
+
+    for entry in sorted(set(entries)):
+        common = 0
+        for a, b in zip(entry, previous):
+            if a != b:
+                break
+            common += 1
+        minimize(common)
+        node = unchecked[-1][2] if unchecked else root
+        for code in entry[common:]:
+            child = _BuildNode()
+            node.edges[code] = child
+            unchecked.append((node, code, child))
+            node = child
+        node.final = True
+        previous = entry
+    minimize(0)
+
+    # Lay out nodes, index 0 is a sentinel so that 0 means "no child"
+    offsets = {}
+    order = []
+    stack = [root]
+    size = 1
+    while stack:
+        node = stack.pop()
+        if id(node) in offsets or not node.edges:
+            continue
+        offsets[id(node)] = size
+        order.append(node)
+        size += len(node.edges)
+        stack.extend(node.edges.values())
+
+    edges = array('I', bytes(4 * size))
+    for node in order:
+        idx = offsets[id(node)]
+        codes = sorted(node.edges)
+        for i, code in enumerate(codes):
+            child = node.edges[code]
+            edge = code | (offsets.get(id(child), 0) << CHILD_SHIFT)
+            if child.final:
+                edge |= WORD_FLAG
+            if i == len(codes) - 1:
+                edge |= LAST_FLAG
+            edges[idx + i] = edge
+    return edges, offsets.get(id(root), 0)
+
+
+class Dawg:
+    """
+    Read-only automaton over a buffer of 32-bit edges
+
+    Nodes are edge indices, the root node being Dawg.root
+    """
+
+    def __init__(self, edges, root: int, nb_words: int, kind: str = 'dawg', mapping=None) -> None:
+        self.edges = edges
+        self.root = root
+        self.nb_words = nb_words
+        self.kind = kind
+        self._mapping = mapping
+
+    @classmethod
+    def from_words(cls, words: list[str], kind: str = 'dawg') -> 'Dawg':
+        """
+        Build an in-memory automaton from uppercase words
+        """
+        if kind == 'gaddag':
+            entries = [encode(entry) for word in words for entry in gaddag_entries(word)]
+        else:
+            entries = [encode(word) for word in words]
+        edges, root = build_edges(entries)
+        return cls(edges, root, len(set(words)), kind)
+
+    @classmethod
+    def load(cls, path: str) -> 'Dawg':
+        """
+        Memory-map a compiled lexicon file
+        """
+        with open(path, 'rb') as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, root, nb_words, _ = HEADER.unpack_from(mapping)
+        kinds = {magic_: kind for kind, magic_ in MAGICS.items()}
+        if magic not in kinds or version != VERSION:
+            mapping.close()
+            raise ValueError(f'{path}: not a compiled lexicon (version {VERSION})')
+        if sys.byteorder == 'little':
+            edges = memoryview(mapping)[HEADER.size:].cast('I')
+        else:
+            edges = array('I', mapping[HEADER.size:])
+            edges.byteswap()
+        return cls(edges, root, nb_words, kinds[magic], mapping)
+
+    def save(self, path: str) -> None:
+        """
+        Atomically write the compiled lexicon file
+        """
+        edges = array('I', self.edges)
+        if sys.byteorder != 'little':
+            edges.byteswap()
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as file:
+            file.write(HEADER.pack(MAGICS[self.kind], VERSION, self.root, self.nb_words, len(edges)))
+            file.write(edges.tobytes())
+        os.replace(tmp_path, path)
+
+    def __len__(self) -> int:
+        return self.nb_words
+
+    def __repr__(self) -> str:
+        return f'Dawg({self.kind}, {self.nb_words} words, {len(self.edges)} edges)'
+
+    def children(self, node: int):
+        """
+        Yield (code, is_word, child) for each edge leaving the node
+        """
+        edges = self.edges
+        while node:
+            edge = edges[node]
+            yield edge & LETTER_MASK, bool(edge & WORD_FLAG), edge >> CHILD_SHIFT
+            if edge & LAST_FLAG:
+                return
+            node += 1
+
+    def edge(self, node: int, code: int) -> int:
+        """
+        Return the edge leaving the node with the letter code, 0 if none
+        """
+        edges = self.edges
+        while node:
+            edge = edges[node]
+            edge_code = edge & LETTER_MASK
+            if edge_code == code:
+                return edge
+            if edge_code > code or edge & LAST_FLAG:
+                return 0
+            node += 1
+        return 0
+
+    def follow(self, word: str, node: int = None) -> int:
+        """
+        Return the edge reached by spelling the word from the node, 0 if none
+        """
+        edge = 0
+        node = self.root if node is None else node
+        for letter in word:
+            edge = self.edge(node, letter_code(letter))
+            if not edge:
+                return 0
+            node = edge >> CHILD_SHIFT
+        return edge
+
+    def __contains__(self, word: str) -> bool:
+        if self.kind == 'gaddag':
+            word = word[::-1]
+        return bool(self.follow(word) & WORD_FLAG)
+
+    def has_prefix(self, prefix: str) -> bool:
+        """
+        Return True if at least one word starts with prefix
+        """
+        if self.kind == 'gaddag':
+            reverse = prefix[::-1]
+            return bool(self.follow(reverse + SEP) or self.follow(reverse) & WORD_FLAG)
+        return prefix == '' or bool(self.follow(prefix))
+
+    def iter_words(self, prefix: str = ''):
+        """
+        Yield the words starting with prefix, in alphabetical order
+        """
+        if self.kind != 'dawg':
+            raise ValueError('words can only be enumerated from a dawg')
+        if prefix:
+            edge = self.follow(prefix)
+            if not edge:
+                return
+            if edge & WORD_FLAG:
+                yield prefix
+            yield from self._walk(edge >> CHILD_SHIFT, prefix)
+        else:
+            yield from self._walk(self.root, prefix)
+
+    def match(self, pattern: str):
+        """
+        Yield the words matching the pattern, in alphabetical order, a wildcard
+        (* or ?) standing for any letter
+        Each wildcard branches over the edges of its node only, never over the
+        26 letters, so a pattern costs a walk of the matching paths
+        """
+        if self.kind != 'dawg':
+            raise ValueError('words can only be matched from a dawg')
+        if pattern:
+            codes = [0 if letter in WILDCARDS else letter_code(letter) for letter in pattern]
+            yield from self._match(self.root, codes, 0, '')
+
+    def _match(self, node: int, codes: list[int], depth: int, text: str):
+        code = codes[depth]
+        if code:
+            edge = self.edge(node, code)
+            branches = [(code, bool(edge & WORD_FLAG), edge >> CHILD_SHIFT)] if edge else []
+        else:
+            branches = self.children(node)
+        last = depth == len(codes) - 1
+        for code, is_word, child in branches:
+            if last:
+                if is_word:
+                    yield text + code_letter(code)
+            elif child:
+                yield from self._match(child, codes, depth + 1, text + code_letter(code))
+
+    def _walk(self, node: int, text: str):
+        for code, is_word, child in self.children(node):
+            word = text + code_letter(code)
+            if is_word:
+                yield word
+            yield from self._walk(child, word)
+
+
+def compiled_path(lang: str, kind: str = 'dawg', dirPath: str = COMPILED_DIR) -> str:
+    return f'{dirPath}{lang}{kind.capitalize()}.bin'
+
+
+def compile_lexicon(lang: str = 'fr', kind: str = 'dawg', dirPath: str = COMPILED_DIR) -> str:
+    """
+    Compile the dictionary of the requested language and return the file path
+    """
+    os.makedirs(dirPath, exist_ok=True)
+    words = playable_words(create_dictionary(lang, DICT_DIR))
+    path = compiled_path(lang, kind, dirPath)
+    Dawg.from_words(words, kind).save(path)
+    return path
+
+
+def is_stale(lang: str, kind: str = 'dawg', dirPath: str = COMPILED_DIR) -> bool:
+    path = compiled_path(lang, kind, dirPath)
+    return not os.path.exists(path) \
+        or os.path.getmtime(path) < os.path.getmtime(get_path(lang, DICT_DIR))
+
+
+@lru_cache(maxsize=None)
+def load_lexicon(lang: str = 'fr', kind: str = 'dawg') -> Dawg:
+    """
+    Return the memory-mapped compiled lexicon, compiling it first if missing
+    """
+    if is_stale(lang, kind):
+        compile_lexicon(lang, kind)
+    return Dawg.load(compiled_path(lang, kind))
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Compile dictionaries into binary DAWG/GADDAG files')
+    parser.add_argument('langs', nargs='*', help='languages to compile, all by default')
+    parser.add_argument('--gaddag', action='store_true', help='also compile the GADDAGs')
+    parser.add_argument('--force', action='store_true', help='recompile up to date files')
+    args = parser.parse_args(argv)
+    kinds = ['dawg', 'gaddag'] if args.gaddag else ['dawg']
+    for lang in args.langs or get_avail_langs():
+        for kind in kinds:
+            if args.force or is_stale(lang, kind):
+                path = compile_lexicon(lang, kind)
+                print(f'{lang} {kind}: {path}')
+
+
+if __name__ == '__main__':
+    main()
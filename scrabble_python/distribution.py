@@ -0,0 +1,60 @@
+from functools import lru_cache
+
+from .helpers import create_distribution
+
+# Letter codes: the blank is 0 and letters A to Z are 1 to 26 (as in the lexicon DAWG)
+ALPHABET = '*ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+CODES = {letter: code for code, letter in enumerate(ALPHABET)}
+
+
+class Distribution:
+    """
+    The immutable letter distribution of a language
+
+    values and counts are tuples indexed by letter code, letters keeps the
+    letters of the distribution file in their original order
+    """
+
+    __slots__ = ('LANG', 'letters', 'values', 'counts')
+
+    def __init__(self, dist: dict, lang: str = 'fr') -> None:
+        values = [0] * len(ALPHABET)
+        counts = [0] * len(ALPHABET)
+        for letter, infos in dist.items():
+            values[CODES[letter]] = infos['value']
+            counts[CODES[letter]] = infos['count']
+        self.LANG = lang
+        self.letters = tuple(dist)
+        self.values = tuple(values)
+        self.counts = tuple(counts)
+
+    def __repr__(self) -> str:
+        return f'Distribution({self.LANG}, {len(self)} tiles)'
+
+    def __len__(self) -> int:
+        return sum(self.counts)
+
+    def __contains__(self, letter: str) -> bool:
+        return letter in self.letters
+
+    def __iter__(self):
+        return iter(self.letters)
+
+    def value(self, letter: str) -> int:
+        if letter not in self.letters:
+            raise KeyError(letter)
+        return self.values[CODES[letter]]
+
+    def count(self, letter: str) -> int:
+        if letter not in self.letters:
+            raise KeyError(letter)
+        return self.counts[CODES[letter]]
+
+
+@lru_cache(maxsize=None)
+def get_distribution(lang: str = 'fr') -> Distribution:
+    """
+    Return the letter distribution of the requested language, parsed on first call only
+    Use get_distribution.cache_clear() to force a reload
+    """
+    return Distribution(create_distribution(lang, 'dict'), lang)
@@ -0,0 +1,85 @@
+"""
+Structured events of the game engine
+
+A Scrabble calls its listeners, functions taking a GameEvent, as the game
+goes on. Events are only built when a listener is attached, a game without
+listeners being silent at no cost:
+    move_applied: player_id, tiles, words, score (bingo bonus included)
+    move_rejected: player_id, error
+    bingo: player_id, bonus
+    tiles_exchanged: player_id, nb_tiles
+    purse_empty: player_id, missing (tiles which could not be drawn)
+    game_over: player_id (finisher), bonus, scores {player_id: score}, winner
+    scores: scores {player_id: score}, asked by get_print_scores
+    game_info: purse (tiles left), scores, board, rack, asked by display_info
+The CLI attaches print_event, a server a logging_listener if configured.
+"""
+import logging
+
+MOVE_APPLIED = 'move_applied'
+MOVE_REJECTED = 'move_rejected'
+BINGO = 'bingo'
+TILES_EXCHANGED = 'tiles_exchanged'
+PURSE_EMPTY = 'purse_empty'
+GAME_OVER = 'game_over'
+SCORES = 'scores'
+GAME_INFO = 'game_info'
+
+
+class GameEvent:
+    __slots__ = ('name', 'turn', 'player_id', 'data')
+
+    def __init__(self, name: str, turn: int, player_id: str, data: dict) -> None:
+        self.name = name
+        self.turn = turn
+        self.player_id = player_id
+        self.data = data
+
+    def __repr__(self) -> str:
+        return f'GameEvent({self.name}, {self.turn}, {self.player_id}, {self.data})'
+
+    def to_dict(self) -> dict:
+        return {'event': self.name, 'turn': self.turn, 'player_id': self.player_id} | self.data
+
+
+def print_event(event: GameEvent) -> None:
+    """
+    Listener printing the events for a human player
+    """
+    data = event.data
+    if event.name == MOVE_APPLIED:
+        print(f'Added words: {data["words"]}')
+        print(f'{event.player_id} scores {data["score"]}')
+    elif event.name == MOVE_REJECTED:
+        print(f'{type(data["error"]).__name__}: {data["error"]}')
+    elif event.name == BINGO:
+        print(f'Scrabble!!! +{data["bonus"]} bonus points!!!')
+    elif event.name == TILES_EXCHANGED:
+        print(f'{event.player_id} exchanges {data["nb_tiles"]} tiles')
+    elif event.name == PURSE_EMPTY:
+        print('No more tile in purse')
+    elif event.name == GAME_OVER:
+        print(f'Game is finished by {event.player_id}, who gets {data["bonus"]} bonus points')
+        print(f'Scores: {data["scores"]}')
+        print(f'Winner is {data["winner"]} with a score of {data["scores"][data["winner"]]}')
+    elif event.name == SCORES:
+        print('Scores:')
+        print(*data['scores'].items())
+    elif event.name == GAME_INFO:
+        print(f'Turn: {event.turn}')
+        print(f'Tiles in purse: {data["purse"]}')
+        print('Scores:')
+        print(*data['scores'].items())
+        print(data['board'])
+        print(f'Player turn: {event.player_id}')
+        print(data['rack'])
+
+
+def logging_listener(logger: logging.Logger, level: int = logging.DEBUG):
+    """
+    Return a listener logging the events as dicts, skipped below the logger level
+    """
+    def log_event(event: GameEvent) -> None:
+        if logger.isEnabledFor(level):
+            logger.log(level, 'GAME EVENT %s', event.to_dict())
+    return log_event
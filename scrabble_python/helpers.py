@@ -37,7 +37,7 @@ def create_dictionary(lang='fr', dirPath='scrabble_python/dict_and_dist/dictiona
     """
     with open(get_path(lang, dirPath)) as dictTxt:
         lines = dictTxt.readlines()
-        words = [line[:-1] for line in lines]
+        words = [line.rstrip('\n') for line in lines]
 
     return words
 
@@ -75,5 +75,3 @@ def create_distribution(lang='fr', format='list', dirPath='scrabble_python/dict_
             raise ValueError('2 formats are available: list or dict')
 
     return distribution
-
-dico = create_dictionary('fr')
\ No newline at end of file
@@ -1,10 +1,15 @@
-from itertools import repeat, chain
+from array import array
+from functools import lru_cache
 from pprint import pformat
 
+from scrabble_python.dawg import ALL_LETTERS, CHILD_SHIFT, WORD_FLAG
+from scrabble_python.distribution import ALPHABET, CODES, get_distribution
 from scrabble_python.errors import (BadWords, BoardOverlap, NoCenter,
                                     NoContact, OutOfBoard, ScrabbleError,
                                     UnalignedTiles)
 
+from scrabble_python.lexicon import get_lexicon
+
 from .tile import Tile
 from .word import Word
 
@@ -22,13 +27,76 @@ word_magic = {
         (7, 7), (10, 4), (10, 10), (11, 3), (11, 11), (12, 2), (12, 12), (13, 1), (13, 13)],
 }
 
+# Premium squares of each board size, other sizes use a scaled standard layout
+premium_layouts = {15: (letter_magic, word_magic)}
+
+
+def register_premium_layout(size: int, letter_premiums: dict, word_premiums: dict) -> None:
+    """
+    Set the premium squares ({multiplier: [positions]}) of the boards of this size
+    """
+    premium_layouts[size] = (letter_premiums, word_premiums)
+    get_premiums.cache_clear()
+
+
+def scale_layout(size: int) -> tuple[dict, dict]:
+    """
+    Return the standard premium layout scaled to the board size, word
+    premiums and higher multipliers winning when squares collide
+    """
+    def scale(pos):
+        return tuple(int(xy * (size - 1) / 14 + 0.5) for xy in pos)
+
+    word_squares = {}
+    for mult in sorted(word_magic):
+        word_squares.update({scale(pos): mult for pos in word_magic[mult]})
+    letter_squares = {}
+    for mult in sorted(letter_magic):
+        letter_squares.update({scale(pos): mult for pos in letter_magic[mult] if scale(pos) not in word_squares})
+    word_premiums = {mult: [pos for pos, m in word_squares.items() if m == mult] for mult in word_magic}
+    letter_premiums = {mult: [pos for pos, m in letter_squares.items() if m == mult] for mult in letter_magic}
+    return letter_premiums, word_premiums
+
+
+@lru_cache(maxsize=None)
+def get_premiums(size: int) -> tuple[bytes, bytes]:
+    """
+    Return the letter and word multipliers of each square, indexed by x*size+y
+    """
+    letter_premiums, word_premiums = premium_layouts.get(size) or scale_layout(size)
+    grids = []
+    for premiums in [letter_premiums, word_premiums]:
+        grid = bytearray([1]) * size * size
+        for mult, positions in premiums.items():
+            for x, y in positions:
+                grid[x * size + y] = mult
+        grids.append(bytes(grid))
+    return tuple(grids)
+
 
 class Board:
+    """
+    The board state is a flat grid of letter codes (0 for an empty square)
+    indexed by x*SIZE+y, plus a mask of the squares holding a blank
+
+    For move generation, the board also maintains, for each move direction
+    (H or V), the cross-check of each empty square (bitmask of the letters
+    forming a valid perpendicular word) with the points of the perpendicular
+    tiles (-1 when there is none), and the set of anchor squares. They are
+    only updated around the changed squares when tiles are added or removed.
+    """
+
     def __init__(self, tiles: list[Tile] = None, size: int = 15, lang: str = 'fr') -> None:
         self.SIZE = size
         self.CENTER = self.SIZE // 2
         self.LANG = lang
-        self.tiles: list[Tile] = []
+        self.grid = bytearray(size * size)
+        self.blanks = bytearray(size * size)
+        self.nb_tiles = 0
+        self.letter_mult, self.word_mult = get_premiums(size)
+        self.cross_checks = {direction: array('I', [ALL_LETTERS]) * (size * size) for direction in 'HV'}
+        self.cross_sums = {direction: array('i', [-1]) * (size * size) for direction in 'HV'}
+        self.anchors = {self.CENTER * size + self.CENTER}
         if tiles is not None:
             self.add_tiles(tiles)
 
@@ -40,38 +108,98 @@ class Board:
         return f'Board({str(self.get_words())})'
 
     def __len__(self) -> int:
-        return len(self.tiles)
+        return self.nb_tiles
 
     def __eq__(self, __o: object) -> bool:
-        s_words = self.get_words()
-        o_words = __o.get_words()
         return isinstance(__o, Board) \
-            and all(word in o_words for word in s_words) \
-            and all(word in s_words for word in o_words)
+            and self.SIZE == __o.SIZE \
+            and self.grid == __o.grid \
+            and self.blanks == __o.blanks
+
+    def __getstate__(self) -> dict:
+        # Premiums, cross-checks and anchors are derived from the grid
+        return {'SIZE': self.SIZE, 'LANG': self.LANG, 'grid': bytes(self.grid), 'blanks': bytes(self.blanks)}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(size=state['SIZE'], lang=state['LANG'])
+        self.grid[:] = state['grid']
+        self.blanks[:] = state['blanks']
+        squares = [sq for sq, code in enumerate(self.grid) if code]
+        self.nb_tiles = len(squares)
+        self.update_cross_checks(squares)
+
+    def copy(self) -> 'Board':
+        """
+        Return an independent copy of the board
+        """
+        board = Board.__new__(Board)
+        board.__dict__.update(self.__dict__)
+        board.grid = self.grid.copy()
+        board.blanks = self.blanks.copy()
+        board.cross_checks = {direction: checks[:] for direction, checks in self.cross_checks.items()}
+        board.cross_sums = {direction: sums[:] for direction, sums in self.cross_sums.items()}
+        board.anchors = self.anchors.copy()
+        return board
+
+    @property
+    def tiles(self) -> list[Tile]:
+        """
+        The tiles on the board, row by row
+        """
+        return [self.get_tile(divmod(sq, self.SIZE)) for sq, code in enumerate(self.grid) if code]
+
+    def get_tile(self, pos: tuple) -> Tile:
+        """
+        Return the tile on the square, None if the square is empty
+        """
+        sq = pos[0] * self.SIZE + pos[1]
+        code = self.grid[sq]
+        if not code:
+            return None
+        return Tile(ALPHABET[code], pos, self.LANG, bool(self.blanks[sq]))
+
+    def is_on_board(self, pos: tuple) -> bool:
+        return 0 <= pos[0] < self.SIZE and 0 <= pos[1] < self.SIZE
+
+    def is_occupied(self, pos: tuple) -> bool:
+        return self.is_on_board(pos) and self.grid[pos[0] * self.SIZE + pos[1]] != 0
+
+    def has_neighbor(self, pos: tuple) -> bool:
+        """
+        Return True if one of the 4 adjacent squares holds a tile
+        """
+        x, y = pos
+        return any(self.is_occupied(adj) for adj in [(x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)])
+
+    def get_values(self) -> list[int]:
+        """
+        Return the value of the tile on each square, indexed by x*SIZE+y
+        """
+        values = get_distribution(self.LANG).values
+        return [0 if blank else values[code] for code, blank in zip(self.grid, self.blanks)]
 
     def format_board(self) -> list[list[str]]:
         """
         Create and return a representation of the board in a list format
         """
-        row = [' '] * self.SIZE
-        board = [row.copy() for _ in range(self.SIZE)]
-        for tile in self.tiles:
-            board[tile.pos[0]][tile.pos[1]] = tile.letter
-        return board
+        letters = [ALPHABET[code] if code else ' ' for code in self.grid]
+        return [letters[x * self.SIZE:(x + 1) * self.SIZE] for x in range(self.SIZE)]
 
-    def add_tiles(self, to_add: list[Tile]) -> None:
-        board_pos = [tile.pos for tile in self.tiles]
+    def check_tiles(self, to_add: list[Tile]) -> None:
+        """
+        Raise a ScrabbleError if the tiles cannot be added to the board
+        """
         add_pos = [tile.pos for tile in to_add]
         xs = [x for (x, _) in add_pos]
         ys = [y for (_, y) in add_pos]
         # Added tiles must be on board:
-        if any(xy < 0 or xy > self.SIZE-1 for xy in chain(*add_pos)):
+        if not all(self.is_on_board(pos) for pos in add_pos):
             raise OutOfBoard
         # First added tiles must hit the center
         if len(self) == 0 and (self.CENTER, self.CENTER) not in add_pos:
             raise NoCenter
         # Added tiles must not overlap
-        if any(pos in board_pos for pos in add_pos) or len(add_pos) != len(set(add_pos)):
+        if any(self.is_occupied(pos) for pos in add_pos) or len(add_pos) != len(set(add_pos)):
             raise BoardOverlap
         # Added tiles must be on same line
         if max(xs) - min(xs) != 0 and max(ys) - min(ys) != 0:
@@ -79,80 +207,219 @@ class Board:
         # Added tiles must be in contact with board tiles
         if len(self) != 0 and not self.check_contact(add_pos):
             raise NoContact
-        self.tiles.extend(to_add)
+        # Blanks must stand for a letter
+        if any(tile.letter == '*' for tile in to_add):
+            raise ScrabbleError('Placed tiles must be letters, blanks included')
 
-    def check_contact(self, add_pos: list[tuple]):
-        board_pos = [tile.pos for tile in self.tiles]
-
-        adj_x_pos = [[(x+1, y), (x-1, y)] for (x, y) in board_pos]
-        adj_y_pos = [[(x, y + 1), (x, y-1)] for (x, y) in board_pos]
-        adj_pos = set(chain(*adj_x_pos + adj_y_pos))
+    def add_tiles(self, to_add: list[Tile]) -> None:
+        self.check_tiles(to_add)
+        squares = [tile.pos[0] * self.SIZE + tile.pos[1] for tile in to_add]
+        for sq, tile in zip(squares, to_add):
+            self.grid[sq] = CODES[tile.letter]
+            self.blanks[sq] = tile.blank
+        self.nb_tiles += len(to_add)
+        self.update_cross_checks(squares)
 
-        contact_w_board = any(pos in adj_pos for pos in add_pos)
+    def check_contact(self, add_pos: list[tuple]):
+        contact_w_board = any(self.has_neighbor(pos) for pos in add_pos)
 
         xs = [x for (x, y) in add_pos]
         ys = [y for (x, y) in add_pos]
-        x_diff = max(xs) - min(xs)
-        y_diff = max(ys) - min(ys)
-        if x_diff == 0:
-            x = repeat(min(xs), y_diff)
-            y = range(min(ys), max(ys)+1)
-        if y_diff == 0:
-            x = range(min(xs), max(xs)+1)
-            y = repeat(min(ys), x_diff)
+        if max(xs) == min(xs):
+            line = [(xs[0], y) for y in range(min(ys), max(ys) + 1)]
+        else:
+            line = [(x, ys[0]) for x in range(min(xs), max(xs) + 1)]
 
-        no_space = all(pos in add_pos + board_pos for pos in zip(x, y))
+        no_space = all(pos in add_pos or self.is_occupied(pos) for pos in line)
 
         return contact_w_board and no_space
 
-    def remove_tiles(self, to_remove: list[Tile]) -> None:
+    def save_checks(self) -> tuple:
+        """
+        Return the cross-checks and anchors of the board, for remove_tiles to
+        restore them instead of computing them again
+        """
+        return ({direction: checks[:] for direction, checks in self.cross_checks.items()},
+                {direction: sums[:] for direction, sums in self.cross_sums.items()},
+                self.anchors.copy())
+
+    def remove_tiles(self, to_remove: list[Tile], checks: tuple = None) -> None:
+        """
+        Remove tiles from the board, checks being the save_checks of the board
+        before they were added, if known
+        """
+        squares = []
         for tile in to_remove:
-            if tile not in self.tiles:
+            if tile.pos is None or not self.is_on_board(tile.pos) or self.get_tile(tile.pos) != tile:
                 raise ScrabbleError('tile not in board tiles')
-            self.tiles.remove(tile)
+            sq = tile.pos[0] * self.SIZE + tile.pos[1]
+            self.grid[sq] = 0
+            self.blanks[sq] = 0
+            self.nb_tiles -= 1
+            squares.append(sq)
+        if checks is None:
+            self.update_cross_checks(squares)
+        else:
+            self.cross_checks, self.cross_sums, self.anchors = checks
 
-    def get_word_start(self, line: list[str], line_idx, row_or_col) -> list[tuple]:
+    def compute_cross_check(self, sq: int, direction: str) -> tuple[int, int]:
         """
-        Return the start postion of words on a line
+        Return the cross-check of an empty square for a move in the direction,
+        and the points of the perpendicular tiles (-1 if there is none)
         """
-        line = [' '] + line
-        prev_curr = zip(line, line[1:])
+        grid, size = self.grid, self.SIZE
+        if direction == 'H':
+            step, first, last = size, sq % size, sq % size + (size - 1) * size
+        else:
+            step, first, last = 1, sq - sq % size, sq - sq % size + size - 1
+        start = end = sq
+        while start > first and grid[start - step]:
+            start -= step
+        while end < last and grid[end + step]:
+            end += step
+        if start == end:
+            return ALL_LETTERS, -1
+        values = get_distribution(self.LANG).values
+        points = sum(values[grid[i]] for i in range(start, end + 1, step) if not self.blanks[i])
+        dawg = get_lexicon(self.LANG).dawg
+        node = dawg.root
+        for i in range(start, sq, step):
+            node = dawg.edge(node, grid[i]) >> CHILD_SHIFT
+        mask = 0
+        for code, is_word, child in dawg.children(node):
+            edge = WORD_FLAG if is_word else 0
+            for i in range(sq + step, end + 1, step):
+                edge = dawg.edge(child, grid[i])
+                child = edge >> CHILD_SHIFT
+            if edge & WORD_FLAG:
+                mask |= 1 << code
+        return mask, points
 
-        if row_or_col == 'row':
-            return [(line_idx, i) for i, [prev, curr] in enumerate(prev_curr) if prev == ' ' and curr != ' ']
-        if row_or_col == 'col':
-            return [(i, line_idx) for i, [prev, curr] in enumerate(prev_curr) if prev == ' ' and curr != ' ']
+    def update_cross_checks(self, changed: list[int]) -> None:
+        """
+        Update the cross-checks and anchors which depend on the changed squares:
+        cross-checks of the squares and of the first empty square on each of
+        their 4 sides, anchor status of the squares and of their neighbours
+        """
+        grid, size = self.grid, self.SIZE
+        to_check = {'H': set(), 'V': set()}
+        near = set()
+        for sq in changed:
+            x, y = divmod(sq, size)
+            for direction, step, first, last in [('H', size, y, y + (size - 1) * size),
+                                                 ('V', 1, x * size, x * size + size - 1)]:
+                to_check[direction].add(sq)
+                for delta, bound in [(-step, first), (step, last)]:
+                    side = sq
+                    while side != bound:
+                        side += delta
+                        if not grid[side]:
+                            to_check[direction].add(side)
+                            break
+                    if sq != bound:
+                        near.add(sq + delta)
+            near.add(sq)
+        for direction, squares in to_check.items():
+            checks, sums = self.cross_checks[direction], self.cross_sums[direction]
+            for sq in squares:
+                checks[sq], sums[sq] = self.compute_cross_check(sq, direction) if not grid[sq] else (0, -1)
+        center = self.CENTER * size + self.CENTER
+        near.add(center)
+        for sq in near:
+            if self.is_anchor(sq):
+                self.anchors.add(sq)
+            else:
+                self.anchors.discard(sq)
+
+    def is_anchor(self, sq: int) -> bool:
+        """
+        An anchor is an empty square next to a tile, the center on an empty board
+        """
+        if self.grid[sq]:
+            return False
+        if self.nb_tiles == 0:
+            return sq == self.CENTER * self.SIZE + self.CENTER
+        return self.has_neighbor(divmod(sq, self.SIZE))
+
+    def get_line_words(self, start: int, step: int, length: int) -> list[tuple[str, int]]:
+        """
+        Return the (text, first square) of the words of more than one letter
+        on the line of length squares, starting at square start
+        """
+        grid = self.grid
+        words = []
+        text = ''
+        for sq in range(start, start + step * length, step):
+            if grid[sq]:
+                if not text:
+                    word_start = sq
+                text += ALPHABET[grid[sq]]
+            else:
+                if len(text) > 1:
+                    words.append((text, word_start))
+                text = ''
+        if len(text) > 1:
+            words.append((text, word_start))
+        return words
 
     def get_words(self) -> list[Word]:
         """
         Return list[Word] corresponding to the words present on the board in
         """
-        rows = self.format_board()
-        cols = [[row[i] for row in rows] for i in range(self.SIZE)]
-        words_args = []
-        for x, row in enumerate(rows):
-            words_text = ''.join(row).split()
-            words_start = self.get_word_start(row, x, 'row')
-            words_args.extend(zip(words_text, words_start,
-                                  repeat('H', len(words_start))))
-        for y, col in enumerate(cols):
-            words_text = ''.join(col).split()
-            words_start = self.get_word_start(col, y, 'col')
-            words_args.extend(zip(words_text, words_start,
-                              repeat('V', len(words_start))))
-
-        return [Word(*word_arg, lang=self.LANG) for word_arg in words_args if len(word_arg[0]) > 1]
+        size = self.SIZE
+        words = []
+        for x in range(size):
+            for text, sq in self.get_line_words(x * size, 1, size):
+                blanks = [i for i in range(len(text)) if self.blanks[sq + i]]
+                words.append(Word(text, divmod(sq, size), 'H', self.LANG, blanks))
+        for y in range(size):
+            for text, sq in self.get_line_words(y, size, size):
+                blanks = [i for i in range(len(text)) if self.blanks[sq + i * size]]
+                words.append(Word(text, divmod(sq, size), 'V', self.LANG, blanks))
+        return words
+
+    def get_word_through(self, pos: tuple, direction: str, placed: dict) -> Word:
+        """
+        Return the word crossing the square in the direction (H or V), the
+        placed tiles {square: tile} being considered on the board, None for
+        a single letter
+        """
+        grid, size = self.grid, self.SIZE
+        x, y = pos
+        if direction == 'H':
+            step, first, last = 1, x * size, x * size + size - 1
+        else:
+            step, first, last = size, y, (size - 1) * size + y
+        start = end = x * size + y
+        while start > first and (grid[start - step] or start - step in placed):
+            start -= step
+        while end < last and (grid[end + step] or end + step in placed):
+            end += step
+        if start == end:
+            return None
+        squares = range(start, end + 1, step)
+        text = ''.join(ALPHABET[grid[sq]] if grid[sq] else placed[sq].letter for sq in squares)
+        # A blank is looked up as its assigned letter but scores nothing
+        blanks = [i for i, sq in enumerate(squares)
+                  if (self.blanks[sq] if grid[sq] else placed[sq].blank)]
+        return Word(text, divmod(start, size), direction, self.LANG, blanks)
 
     def get_next_words(self, next_tiles: list[Tile]) -> list[Word]:
         """
         Return the words formed by the tiles to add without adding them
+        Only the line of the tiles and the lines crossing them are read
         Raise a BadWords Error if one word is unvalid
         """
-        prev_words = self.get_words()
-        self.add_tiles(next_tiles)
-        curr_words = self.get_words()
-        self.remove_tiles(next_tiles)
-        next_words = [word for word in curr_words if word not in prev_words]
+        self.check_tiles(next_tiles)
+        placed = {tile.pos[0] * self.SIZE + tile.pos[1]: tile for tile in next_tiles}
+        next_words = []
+        for direction in ['H', 'V']:
+            starts = set()
+            for tile in next_tiles:
+                word = self.get_word_through(tile.pos, direction, placed)
+                if word is not None and word.start not in starts:
+                    starts.add(word.start)
+                    next_words.append(word)
         if bad_words := [word for word in next_words if not word]:
             good_words = [word for word in next_words if word]
             raise BadWords(good_words=good_words, bad_words=bad_words)
@@ -160,27 +427,21 @@ class Board:
             raise ScrabbleError('No words')
         return next_words
 
-    def compute_score(self, next_tiles: list[Tile]) -> int:
+    def compute_score(self, next_tiles: list[Tile], next_words: list[Word] = None) -> int:
         """
         Compute and return the score marked by the tiles to add
+        The words formed by the tiles are computed if not given
         """
-        next_words = self.get_next_words(next_tiles)
-        next_pos = [tile.pos for tile in next_tiles]
+        if next_words is None:
+            next_words = self.get_next_words(next_tiles)
+        next_pos = {tile.pos for tile in next_tiles}
         for word in next_words:
-            # First compute double/triple letters
-            word_add_tiles = [
-                tile for tile in word.tiles if tile.pos in next_pos]
-            for tile in word_add_tiles:
-                magic_letter_pos = sum(letter_magic.values(), [])
-                if tile.pos in magic_letter_pos:
-                    mult = [mult for mult in letter_magic.keys(
-                    ) if tile.pos in letter_magic[mult]][0]
-                    word.score += tile.value * (mult - 1)
-            # Then compute double/triple words
-            for tile in word_add_tiles:
-                magic_word_pos = sum(word_magic.values(), [])
-                if tile.pos in magic_word_pos:
-                    mult = [mult for mult in word_magic.keys(
-                    ) if tile.pos in word_magic[mult]][0]
-                    word.score *= mult
+            score = word.get_initial_score()
+            word_mult = 1
+            for tile in word.tiles:
+                if tile.pos in next_pos:
+                    sq = tile.pos[0] * self.SIZE + tile.pos[1]
+                    score += tile.value * (self.letter_mult[sq] - 1)
+                    word_mult *= self.word_mult[sq]
+            word.score = score * word_mult
         return sum((word.score for word in next_words), 0)
@@ -8,6 +8,12 @@ class Player:
         self.rack = rack if rack is not None else []
         self.score = score if score is not None else 0
 
+    def copy(self) -> 'Player':
+        """
+        Return an independent copy of the player, tiles being immutable and shared
+        """
+        return Player(self.ID, self.score, self.rack[:])
+
     def __repr__(self) -> str:
         return f'Player({self.ID}, {self.score}, {self.rack})'
 
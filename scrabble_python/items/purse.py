@@ -1,34 +1,72 @@
 import random
 from scrabble_python.errors import EmptyPurse
-from scrabble_python.helpers import create_distribution
+from scrabble_python.distribution import ALPHABET, CODES, get_distribution
 from .tile import Tile
 
 
 class Purse:
-    def __init__(self, dist: dict = None, lang: str = 'fr') -> None:
+    """
+    The purse is a multiset of letters: a count per letter code
+
+    Tiles are drawn by weighted sampling without replacement, each draw using
+    exactly one number of a seeded generator, so a purse is fully restored
+    from its counts, its seed and its number of draws
+    """
+
+    def __init__(self, dist: dict = None, lang: str = 'fr', seed: int = None) -> None:
         self.LANG = lang
-        self.tiles = self.__init_purse() if dist is None else self.__init_from_dist(dist)
-
-    def __init_purse(self) -> list[Tile]:
-        init_dist = create_distribution(self.LANG, 'dict')
-        initial_purse_tiles = []
-        for letter in init_dist:
-            initial_purse_tiles.extend([Tile(letter)] * init_dist[letter]['count'])
-        random.shuffle(initial_purse_tiles)
-        return initial_purse_tiles
-
-    def __init_from_dist(self, dist):
-        purse_tiles = []
+        self.counts = self.__init_purse() if dist is None else self.__init_from_dist(dist)
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.rng = random.Random(self.seed)
+        self.nb_draws = 0
+
+    def __init_purse(self) -> list[int]:
+        return list(get_distribution(self.LANG).counts)
+
+    def __init_from_dist(self, dist) -> list[int]:
+        counts = [0] * len(ALPHABET)
         for letter in dist:
-            purse_tiles.extend([Tile(letter)] * dist[letter])
-        random.shuffle(purse_tiles)
-        return purse_tiles
+            counts[CODES[letter.upper()]] += dist[letter]
+        return counts
+
+    def __getstate__(self) -> dict:
+        return {'LANG': self.LANG, 'counts': self.counts, 'seed': self.seed, 'nb_draws': self.nb_draws}
+
+    def __setstate__(self, state: dict) -> None:
+        self.LANG = state['LANG']
+        self.counts = list(state['counts'])
+        self.seed = state['seed']
+        self.rng = random.Random(self.seed)
+        for _ in range(state['nb_draws']):
+            self.rng.random()
+        self.nb_draws = state['nb_draws']
 
-    def shuffle(self):
-        random.shuffle(self.tiles)
+    def copy(self) -> 'Purse':
+        """
+        Return an independent copy of the purse, its generator at the same state
+        """
+        purse = Purse.__new__(Purse)
+        purse.LANG = self.LANG
+        purse.counts = self.counts[:]
+        purse.seed = self.seed
+        purse.rng = random.Random()
+        purse.rng.setstate(self.rng.getstate())
+        purse.nb_draws = self.nb_draws
+        return purse
+
+    def snapshot(self) -> tuple:
+        """
+        Return the state of the purse, for restore to undo the draws made since
+        """
+        return self.counts[:], self.nb_draws, self.rng.getstate()
+
+    def restore(self, snapshot: tuple) -> None:
+        counts, self.nb_draws, rng_state = snapshot
+        self.counts[:] = counts
+        self.rng.setstate(rng_state)
 
     def __len__(self) -> int:
-        return len(self.tiles)
+        return sum(self.counts)
 
     def __str__(self) -> str:
         dist = self.get_dist()
@@ -39,19 +77,50 @@ class Purse:
         return(f'Purse({str(self.get_dist())})')
 
     def __eq__(self, __o: object) -> bool:
-        return isinstance(__o, Purse) and self.get_dist() == __o.get_dist()
+        return isinstance(__o, Purse) and self.counts == __o.counts
+
+    @property
+    def tiles(self) -> list[Tile]:
+        """
+        The tiles in the purse, in letter order
+        """
+        return [Tile(letter, lang=self.LANG) for letter, count in zip(ALPHABET, self.counts) for _ in range(count)]
 
     def get_dist(self) -> dict:
         """
         Return the letter distribution in the purse
         """
-        init_dist = create_distribution(lang=self.LANG, format='dict')
-        return {letter: sum(tile.letter == letter for tile in self.tiles) for letter in init_dist}
+        return {letter: self.counts[CODES[letter]] for letter in get_distribution(self.LANG)}
+
+    def put_back(self, tiles: list[Tile]) -> None:
+        """
+        Return tiles to the purse
+        """
+        for tile in tiles:
+            self.counts[CODES[tile.letter]] += 1
+
+    def replay_draw(self, letters: str, nb_draws: int) -> list[Tile]:
+        """
+        Take out the letters of a recorded draw, the generator resuming after nb_draws draws
+        """
+        for letter in letters:
+            self.counts[CODES[letter]] -= 1
+        while self.nb_draws < nb_draws:
+            self.rng.random()
+            self.nb_draws += 1
+        return [Tile(letter, lang=self.LANG) for letter in letters]
 
     def draw(self, n=1) -> list[Tile]:
+        if n > len(self):
+            raise EmptyPurse
         drawn_tiles = []
         for _ in range(n):
-            if len(self) == 0:
-                raise EmptyPurse
-            drawn_tiles.append(self.tiles.pop())
+            rank = int(self.rng.random() * len(self))
+            self.nb_draws += 1
+            for code, count in enumerate(self.counts):
+                if rank < count:
+                    break
+                rank -= count
+            self.counts[code] -= 1
+            drawn_tiles.append(Tile(ALPHABET[code], lang=self.LANG))
         return drawn_tiles
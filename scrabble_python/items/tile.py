@@ -1,26 +1,61 @@
-from scrabble_python.helpers import create_distribution
+from scrabble_python.distribution import get_distribution
 
 
 class Tile:
-    def __init__(self, letter: str, pos: tuple = None, lang: str = 'fr'):
-        self.LANG = lang
-        self.letter = letter.upper()
-        self.pos = pos
-        if pos is not None:
-            self.pos = tuple(pos)
-        self.value = self.get_value()
+    """
+    Tiles are immutable values: the tiles without position (rack and purse
+    tiles) are shared instances, one per language and letter
+    """
+
+    __slots__ = ('LANG', 'letter', 'pos', 'blank', 'value')
+    _shared = {}
+
+    def __new__(cls, letter: str, pos: tuple = None, lang: str = 'fr', blank: bool = False):
+        letter = letter.upper()
+        if pos is None and not blank:
+            tile = cls._shared.get((lang, letter))
+            if tile is None:
+                tile = cls._shared[(lang, letter)] = cls._create(letter, None, lang, False)
+            return tile
+        return cls._create(letter, tuple(pos) if pos is not None else None, lang, blank)
+
+    @classmethod
+    def _create(cls, letter: str, pos: tuple, lang: str, blank: bool) -> 'Tile':
+        tile = object.__new__(cls)
+        tile.LANG = lang
+        tile.letter = letter
+        tile.pos = pos
+        # A placed blank carries the letter it stands for, and is worth nothing
+        tile.blank = blank
+        tile.value = tile.get_value()
+        return tile
 
     def get_value(self):
-        distribution = create_distribution(self.LANG, 'dict')
-        return distribution[self.letter]['value']
+        if self.blank:
+            return 0
+        return get_distribution(self.LANG).value(self.letter)
+
+    def __reduce__(self):
+        return (Tile, (self.letter, self.pos, self.LANG, self.blank))
+
+    def __copy__(self) -> 'Tile':
+        return self
+
+    def __deepcopy__(self, memo) -> 'Tile':
+        return self
 
     def __str__(self) -> str:
         return f'{self.letter}, {self.pos}, value: {self.value}'
 
     def __repr__(self) -> str:
-        return f'Tile({self.letter}, {self.pos})' if self.pos is not None else f'Tile({self.letter})'
+        letter = f'*{self.letter}' if self.blank else self.letter
+        return f'Tile({letter}, {self.pos})' if self.pos is not None else f'Tile({letter})'
 
     def __eq__(self, other):
         return isinstance(other, Tile) \
             and self.letter == other.letter \
-            and self.pos == other.pos
+            and self.pos == other.pos \
+            and self.blank == other.blank
+
+    def __hash__(self) -> int:
+        return hash((self.letter, self.pos, self.blank))
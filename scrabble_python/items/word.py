@@ -1,9 +1,14 @@
 from .tile import Tile
-from scrabble_python.helpers import create_dictionary
+from scrabble_python.lexicon import get_lexicon
 
 
 class Word:
-    def __init__(self, text: str, start: list, direction='H', lang='fr'):
+    __slots__ = ('score', 'text', 'LANG', 'start', 'direction', 'tiles', 'end')
+
+    def __init__(self, text: str, start: list, direction='H', lang='fr', blanks=()):
+        """
+        blanks: indexes of the letters of the text played with a blank, worth 0
+        """
         self.score = 0
         self.text = text.upper()
         self.LANG = lang
@@ -13,10 +18,10 @@ class Word:
                 'direction is (H or 0)for Horizontal, or V (or 1) for Vertical')
         self.direction = direction
         if direction in ['H', 0]:
-            self.tiles = [Tile(lettre, (start[0], start[1] + i))
+            self.tiles = [Tile(lettre, (start[0], start[1] + i), lang, i in blanks)
                           for (i, lettre) in enumerate(self.text)]
         else:
-            self.tiles = [Tile(lettre, (start[0] + i, start[1]))
+            self.tiles = [Tile(lettre, (start[0] + i, start[1]), lang, i in blanks)
                           for (i, lettre) in enumerate(self.text)]
         self.end = self.tiles[-1].pos
         self.score = self.get_initial_score()
@@ -31,8 +36,7 @@ class Word:
         return len(self.tiles)
 
     def __bool__(self):
-        dico = create_dictionary(self.LANG)
-        return self.text.lower() in dico
+        return self.text in get_lexicon(self.LANG)
 
     def __eq__(self, other) -> int:
         return isinstance(other, Word) \
@@ -0,0 +1,61 @@
+from functools import lru_cache
+
+from .dawg import Dawg, load_lexicon, playable_words
+
+
+class Lexicon:
+    """
+    The playable words of a language, shared by the whole process
+
+    Words are stored in a minimized DAWG, memory-mapped from its compiled file
+    (see scrabble_python.dawg), so membership and prefix queries are O(word length)
+    """
+
+    def __init__(self, dawg: Dawg, lang: str = 'fr') -> None:
+        self.LANG = lang
+        self.dawg = dawg
+        self._gaddag = None
+
+    @classmethod
+    def from_words(cls, words: list[str], lang: str = 'fr') -> 'Lexicon':
+        """
+        Build an in-memory lexicon from a raw word list
+        """
+        return cls(Dawg.from_words(playable_words(words)), lang)
+
+    @property
+    def gaddag(self) -> Dawg:
+        """
+        The GADDAG of the lexicon, loaded (and compiled if needed) on first access
+        """
+        if self._gaddag is None:
+            self._gaddag = load_lexicon(self.LANG, 'gaddag')
+        return self._gaddag
+
+    def __contains__(self, word: str) -> bool:
+        return word.upper() in self.dawg
+
+    def __len__(self) -> int:
+        return len(self.dawg)
+
+    def __repr__(self) -> str:
+        return f'Lexicon({self.LANG}, {len(self)} words)'
+
+    def has_prefix(self, prefix: str) -> bool:
+        return self.dawg.has_prefix(prefix.upper())
+
+    def match(self, pattern: str) -> list[str]:
+        """
+        Return the words matching the pattern, * or ? standing for a blank:
+        lexicon.match('*A*SON') -> ['BASSON', 'CASSON', 'MAISON', ...]
+        """
+        return list(self.dawg.match(pattern.upper()))
+
+
+@lru_cache(maxsize=None)
+def get_lexicon(lang: str = 'fr') -> Lexicon:
+    """
+    Return the lexicon of the requested language, loaded on first call only
+    Use get_lexicon.cache_clear() to force a reload
+    """
+    return Lexicon(load_lexicon(lang), lang)
@@ -0,0 +1,438 @@
+"""
+Legal move generation (Appel & Jacobson anchor/cross-check algorithm)
+
+Moves are built along each line from its anchors (empty squares next to a
+board tile) by walking the lexicon DAWG, the letters placed on a square being
+restricted to the letters forming a valid perpendicular word (its cross-check).
+Vertical moves are generated as horizontal moves of the transposed board.
+
+Generating every move takes time in proportion to the number of legal moves,
+some 20 to 30 us per move in CPython, and blanks multiply the moves of a
+rack: a mid-game 15x15 board gives ~1,200 moves to a rack without blank (10
+to 35 ms), ~11,000 with one blank (180 to 450 ms) and ~40,000 with two (0.5
+to 1.6 s). Bots and hints only need the best moves: best scores without
+building the moves which do not enter them, and skips the lines whose
+points are bounded below them, in ~10 ms without blank, 40 to 100 ms with
+one and 150 to 400 ms with two. The low millisecond target of the request
+is met without blank only: racks with blanks need a compiled generator.
+"""
+import heapq
+import time
+
+from .dawg import CHILD_SHIFT, LAST_FLAG, LETTER_MASK, WORD_FLAG
+from .distribution import ALPHABET, CODES, get_distribution
+from .items import Board, Tile
+from .lexicon import get_lexicon
+
+
+class Move:
+    """
+    A legal placement of rack tiles, with the points it scores on the board
+    (the bonus for using the whole rack is left to the game)
+
+        placements: tuple of (x, y, letter, blank)
+        word: text of the main word, from start in direction (H or V)
+    """
+    __slots__ = ('placements', 'score', 'word', 'start', 'direction')
+
+    def __init__(self, placements: tuple, score: int, word: str, start: tuple, direction: str) -> None:
+        self.placements = placements
+        self.score = score
+        self.word = word
+        self.start = start
+        self.direction = direction
+
+    def __repr__(self) -> str:
+        return f'Move({self.word}, {self.start}, {self.direction}, {self.score})'
+
+    def __len__(self) -> int:
+        return len(self.placements)
+
+    def __eq__(self, __o: object) -> bool:
+        return isinstance(__o, Move) and set(self.placements) == set(__o.placements)
+
+    @property
+    def tiles(self) -> list[Tile]:
+        return [Tile(letter, (x, y), blank=blank) for x, y, letter, blank in self.placements]
+
+
+def transpose(grid: list, size: int) -> list:
+    return [grid[y * size + x] for x in range(size) for y in range(size)]
+
+
+class TopMoves:
+    """
+    The k moves of the most points found so far, the first found winning ties
+
+        threshold: points a move must exceed to enter, -1 until k moves are found
+    """
+    __slots__ = ('k', 'heap', 'threshold', 'count')
+
+    def __init__(self, k: int) -> None:
+        self.k = k
+        self.heap = []
+        self.threshold = -1
+        self.count = 0
+
+    def push(self, points: int, move: Move) -> None:
+        # The order of arrival breaks the ties, the first move being kept
+        self.count -= 1
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, (points, self.count, move))
+        else:
+            heapq.heapreplace(self.heap, (points, self.count, move))
+        if len(self.heap) == self.k:
+            self.threshold = self.heap[0][0]
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def moves(self) -> list[Move]:
+        return [move for *_, move in sorted(self.heap, reverse=True)]
+
+
+class MoveGenerator:
+    """
+    Generate every legal move of a rack on a board, or only the best ones
+
+    The board is read once at construction, generate and best can then be
+    called for as many racks as needed
+    """
+
+    def __init__(self, board: Board) -> None:
+        self.board = board
+        self.size = size = board.SIZE
+        self.dawg = get_lexicon(board.LANG).dawg
+        self.values = get_distribution(board.LANG).values
+        # Anchors and cross-checks are maintained by the board
+        self.anchors = sorted(board.anchors)
+        self.across = (list(board.grid), board.get_values(), board.letter_mult, board.word_mult)
+        self.down = tuple(transpose(grid, size) for grid in self.across)
+        self.across_checks = (board.cross_checks['H'], board.cross_sums['H'])
+        self.down_checks = tuple(transpose(grid, size) for grid in (board.cross_checks['V'], board.cross_sums['V']))
+
+    def generate(self, rack: list[Tile], deadline: float = None) -> list[Move]:
+        """
+        Return every legal move of the rack, blanks (*) standing for any letter
+        Past the deadline (time.perf_counter), only the moves found so far,
+        once one is found
+        """
+        moves = []
+        self._generate(rack, moves, None, deadline)
+        return moves
+
+    def best(self, rack: list[Tile], k: int = 1, bingo_size: int = 7, bingo_bonus: int = 50,
+             deadline: float = None) -> list[Move]:
+        """
+        Return the k legal moves of the most points, best first: their score,
+        plus bingo_bonus for the moves placing bingo_size tiles
+        Moves are only built when they enter the k best, and the lines which
+        cannot beat them are not searched
+        Past the deadline (time.perf_counter), the best moves found so far,
+        once one is found
+        """
+        top = TopMoves(k)
+        self._generate(rack, top, (bingo_size, bingo_bonus), deadline)
+        return top.moves()
+
+    def _generate(self, rack: list[Tile], found, bingo: tuple, deadline: float) -> None:
+        counts = [0] * len(ALPHABET)
+        for tile in rack:
+            counts[CODES[tile.letter]] += 1
+        left_parts = self.get_left_parts(counts, deadline)
+        for grids, checks, transposed in ((self.across, self.across_checks, False),
+                                          (self.down, self.down_checks, True)):
+            if not self._generate_line_moves(grids, checks, counts, left_parts, transposed, found, bingo, deadline):
+                return
+
+    def get_left_parts(self, rack: list[int], deadline: float = None) -> list[list]:
+        """
+        Return the (letters, node, out_codes) of every prefix of a word that
+        the rack can spell, in a list per length, letters being (code, blank) pairs
+        and out_codes the bitmask of the letters which may follow the prefix
+        and are left on the rack, so that an anchor whose cross-check allows
+        none of them is skipped before any blank is expanded
+
+        Squares left of an anchor without tile nor neighbour accept any letter,
+        so the left parts of all these anchors are taken from this single list
+        Past the deadline, only the left parts found so far
+        """
+        edges = self.dawg.edges
+        max_len = sum(rack) - 1
+        parts = [[] for _ in range(max(max_len, 0) + 1)]
+        letters = []
+
+        def walk(node):
+            children = []
+            idx = node
+            out_codes = 0
+            while idx:
+                edge = edges[idx]
+                children.append(edge)
+                # Only the letters left on the rack (any with a blank) may follow
+                code = edge & LETTER_MASK
+                if rack[0] or rack[code]:
+                    out_codes |= 1 << code
+                if edge & LAST_FLAG:
+                    break
+                idx += 1
+            if not out_codes:
+                return
+            parts[len(letters)].append((tuple(letters), node, out_codes))
+            if len(letters) == max_len or deadline is not None and time.perf_counter() >= deadline:
+                return
+            for edge in children:
+                code = edge & LETTER_MASK
+                for rack_code in (code, 0):
+                    if rack[rack_code]:
+                        rack[rack_code] -= 1
+                        letters.append((code, rack_code == 0))
+                        walk(edge >> CHILD_SHIFT)
+                        letters.pop()
+                        rack[rack_code] += 1
+
+        walk(self.dawg.root)
+        return parts
+
+    def get_spans(self, grids, checks, nb_tiles: int) -> list[list]:
+        """
+        Return, for each empty square of the lines, the (board_sum, letter_mults,
+        word_mult, cross_sum, cross_mults) of placing 1 to nb_tiles tiles on the
+        next empty squares, index j for j tiles, so that the points of any
+        extension of a move are bounded in constant time:
+            board_sum: values of the board tiles crossed by the main word
+            letter_mults: sum of the letter multipliers of the j squares
+            word_mult: product of their word multipliers
+            cross_sum, cross_mults: sums of the cross-word values and of the
+                letter multipliers of the squares forming a cross-word, times
+                its word multiplier
+        The list of a square stops at the first square no letter can fill
+        """
+        size = self.size
+        codes, tile_values, letter_mult, word_mult = grids
+        masks, sums = checks
+        spans = [None] * (size * size)
+        for sq in range(size * size):
+            if codes[sq]:
+                continue
+            row_end = sq - sq % size + size
+            board_sum = letter_mults = cross_sum = cross_mults = 0
+            word_mult_prod = 1
+            span = [None]
+            nxt = sq
+            while nxt < row_end and len(span) <= nb_tiles and masks[nxt]:
+                lm, wm = letter_mult[nxt], word_mult[nxt]
+                letter_mults += lm
+                word_mult_prod *= wm
+                if sums[nxt] >= 0:
+                    cross_sum += sums[nxt] * wm
+                    cross_mults += lm * wm
+                nxt += 1
+                # The board tiles following the square are part of the word
+                while nxt < row_end and codes[nxt]:
+                    board_sum += tile_values[nxt]
+                    nxt += 1
+                span.append((board_sum, letter_mults, word_mult_prod, cross_sum, cross_mults))
+            spans[sq] = span
+        return spans
+
+    def _generate_line_moves(self, grids, checks, rack, left_parts, transposed, found, bingo, deadline) -> bool:
+        """
+        Add the moves of the lines to found, a list or the TopMoves of best
+        Return False if stopped by the deadline
+        """
+        size = self.size
+        codes, tile_values, letter_mult, word_mult = grids
+        masks, sums = checks
+        edges = self.dawg.edges
+        root = self.dawg.root
+        values = self.values
+        nb_tiles = sum(rack)
+        if transposed:
+            anchors = sorted(sq % size * size + sq // size for sq in self.anchors)
+        else:
+            anchors = self.anchors
+        anchor_set = set(anchors)
+        left = []
+        placed = []
+        if bingo is None:
+            top = None
+            moves = found
+        else:
+            top = found
+            bingo_size, bingo_bonus = bingo
+            spans = self.get_spans(grids, checks, nb_tiles)
+            # Highest value of a rack letter, blanks being worth nothing
+            max_value = max((values[code] for code, count in enumerate(rack) if code and count), default=0)
+
+        def make_move(end, score):
+            # Left part squares are free squares without neighbour: no cross-word
+            anchor = placed[0][0]
+            tiles = [(anchor - len(left) + i, code, blank) for i, (code, blank) in enumerate(left)]
+            tiles.extend(placed)
+            start = end - len(word)
+            if transposed:
+                placements = tuple((sq % size, sq // size, ALPHABET[code], blank) for sq, code, blank in tiles)
+                start_pos, direction = (start % size, start // size), 'V'
+            else:
+                placements = tuple((sq // size, sq % size, ALPHABET[code], blank) for sq, code, blank in tiles)
+                start_pos, direction = (start // size, start % size), 'H'
+            text = ''.join(ALPHABET[code] for code in word)
+            return Move(placements, score, text, start_pos, direction)
+
+        def record(end, main_sum, main_mult, cross_total):
+            # A single tile forming words both ways is found by both passes
+            if transposed and not left and len(placed) == 1 and sums[placed[0][0]] >= 0:
+                return
+            score = main_sum * main_mult + cross_total
+            if top is None:
+                moves.append(make_move(end, score))
+                return
+            points = score + (bingo_bonus if len(left) + len(placed) == bingo_size else 0)
+            if points > top.threshold:
+                top.push(points, make_move(end, score))
+
+        def bound(sq, nb_used, main_sum, main_mult, cross_total):
+            # Most points of the moves extending the word from the empty square sq
+            span = spans[sq]
+            nb_placed = min(nb_tiles - nb_used, len(span) - 1)
+            if not nb_placed:
+                return -1
+            board_sum, letter_mults, word_mult_prod, cross_sum, cross_mults = span[nb_placed]
+            points = ((main_sum + board_sum + max_value * letter_mults) * main_mult * word_mult_prod
+                      + cross_total + cross_sum + max_value * cross_mults)
+            return points + (bingo_bonus if nb_used + nb_placed == bingo_size else 0)
+
+        def extend_right(node, sq, row_end, is_word, main_sum, main_mult, cross_total, anchor):
+            if sq == row_end or not codes[sq]:
+                if is_word and sq > anchor and len(word) > 1:
+                    record(sq, main_sum, main_mult, cross_total)
+                if sq == row_end or not node:
+                    return
+                if top is not None and bound(sq, len(left) + len(placed), main_sum, main_mult, cross_total) <= top.threshold:
+                    return
+                mask = masks[sq]
+                lm = letter_mult[sq]
+                wm = word_mult[sq]
+                cross_sum = sums[sq]
+                idx = node
+                while True:
+                    edge = edges[idx]
+                    code = edge & LETTER_MASK
+                    if mask >> code & 1:
+                        for blank in (False, True):
+                            if blank:
+                                if not rack[0]:
+                                    break
+                                rack_code = 0
+                                value = 0
+                            else:
+                                if not rack[code]:
+                                    continue
+                                rack_code = code
+                                value = values[code] * lm
+                            rack[rack_code] -= 1
+                            placed.append((sq, code, blank))
+                            word.append(code)
+                            cross = (cross_sum + value) * wm if cross_sum >= 0 else 0
+                            extend_right(edge >> CHILD_SHIFT, sq + 1, row_end, edge & WORD_FLAG,
+                                         main_sum + value, main_mult * wm, cross_total + cross, anchor)
+                            word.pop()
+                            placed.pop()
+                            rack[rack_code] += 1
+                    if edge & LAST_FLAG:
+                        break
+                    idx += 1
+            else:
+                code = codes[sq]
+                idx = node
+                while idx:
+                    edge = edges[idx]
+                    edge_code = edge & LETTER_MASK
+                    if edge_code == code:
+                        word.append(code)
+                        extend_right(edge >> CHILD_SHIFT, sq + 1, row_end, edge & WORD_FLAG,
+                                     main_sum + tile_values[sq], main_mult, cross_total, anchor)
+                        word.pop()
+                        return
+                    if edge_code > code or edge & LAST_FLAG:
+                        return
+                    idx += 1
+
+        word = []
+        for anchor in anchors:
+            if deadline is not None and len(found) and time.perf_counter() >= deadline:
+                return False
+            row_start = anchor - anchor % size
+            row_end = row_start + size
+            word.clear()
+            if anchor > row_start and codes[anchor - 1]:
+                # The left part is the board tiles before the anchor
+                start = anchor - 1
+                while start > row_start and codes[start - 1]:
+                    start -= 1
+                node, main_sum = root, 0
+                for sq in range(start, anchor):
+                    edge = self.dawg.edge(node, codes[sq])
+                    node = edge >> CHILD_SHIFT
+                    if not edge:
+                        break
+                    word.append(codes[sq])
+                    main_sum += tile_values[sq]
+                else:
+                    extend_right(node, anchor, row_end, False, main_sum, 1, 0, anchor)
+            else:
+                limit = 0
+                sq = anchor - 1
+                while limit < nb_tiles - 1 and sq >= row_start and not codes[sq] and sq not in anchor_set:
+                    limit += 1
+                    sq -= 1
+                allowed = masks[anchor]
+                for nb_left, parts in enumerate(left_parts[:limit + 1]):
+                    if top is not None and parts:
+                        # The left parts of this length at most give the rack letter of most value to their squares
+                        left_squares = range(anchor - nb_left, anchor)
+                        left_mult = 1
+                        for sq in left_squares:
+                            left_mult *= word_mult[sq]
+                        left_sum = max_value * sum(letter_mult[sq] for sq in left_squares)
+                        if bound(anchor, nb_left, left_sum, left_mult, 0) <= top.threshold:
+                            continue
+                    for letters, node, out_codes in parts:
+                        if not out_codes & allowed:
+                            continue
+                        # Blanks make a single anchor long to search
+                        if deadline is not None and len(found) and time.perf_counter() >= deadline:
+                            return False
+                        # The premiums of the left part squares are known from the anchor
+                        main_sum, main_mult = 0, 1
+                        sq = anchor - len(letters)
+                        for code, blank in letters:
+                            rack[0 if blank else code] -= 1
+                            if not blank:
+                                main_sum += values[code] * letter_mult[sq]
+                            main_mult *= word_mult[sq]
+                            sq += 1
+                        left[:] = letters
+                        word[:] = [code for code, _ in letters]
+                        extend_right(node, anchor, row_end, False, main_sum, main_mult, 0, anchor)
+                        for code, blank in letters:
+                            rack[0 if blank else code] += 1
+                left.clear()
+        return True
+
+
+def generate_moves(board: Board, rack: list[Tile], deadline: float = None) -> list[Move]:
+    """
+    Return every legal move of the rack on the board, with its score
+    """
+    return MoveGenerator(board).generate(rack, deadline)
+
+
+def best_moves(board: Board, rack: list[Tile], k: int = 1, bingo_size: int = 7, bingo_bonus: int = 50,
+               deadline: float = None) -> list[Move]:
+    """
+    Return the k legal moves of the rack with the most points (score plus
+    bingo bonus) on the board, best first
+    """
+    return MoveGenerator(board).best(rack, k, bingo_size, bingo_bonus, deadline)
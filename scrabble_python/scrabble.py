@@ -1,13 +1,31 @@
 import random as rd
-from copy import deepcopy
 from itertools import groupby
 
-from .errors import (BadWords, EmptyPurse, NotInRack, ScrabbleError,
+from .errors import (EmptyPurse, NotInRack, ScrabbleError,
                      UnavailableLanguage)
+from .events import (BINGO, GAME_INFO, GAME_OVER, MOVE_APPLIED,
+                     MOVE_REJECTED, PURSE_EMPTY, SCORES, TILES_EXCHANGED,
+                     GameEvent, print_event)
 from .helpers import get_avail_langs
 from .items import Board, Player, Purse, Tile, Word
 
 
+class MoveUndo:
+    """
+    What Scrabble.unmake_move needs to take back a move of make_move
+    """
+    __slots__ = ('tiles', 'player_id', 'score', 'rack', 'purse', 'checks')
+
+    def __init__(self, tiles: list[Tile], player_id: str, score: int, rack: list[Tile], purse: tuple,
+                 checks: tuple) -> None:
+        self.tiles = tiles
+        self.player_id = player_id
+        self.score = score
+        self.rack = rack
+        self.purse = purse
+        self.checks = checks
+
+
 class Scrabble:
     df_bsize = 15
     df_rsize = 7
@@ -16,6 +34,9 @@ class Scrabble:
         Player('player_1'),
         Player('player_2')
     ]
+    # Defaults of the games restored without their constructor (jsonpickle)
+    seed = None
+    listeners = ()
 
     def __init__(self, **params) -> None:
         players = params.get('players', Scrabble.df_players)
@@ -35,8 +56,16 @@ class Scrabble:
         if self.config['LANG'] not in get_avail_langs():
             raise UnavailableLanguage(unavail_lang=self.config['LANG'])
 
+        # A seed makes the first player and the draws reproducible
+        self.seed = params.get('seed', None)
+        rng = rd.Random(self.seed) if self.seed is not None else rd
+        # Listeners of the game events (see events), verbose printing them
+        self.listeners = list(params.get('listeners', ()))
+        if params.get('verbose', False):
+            self.listeners.append(print_event)
+
         self.turn = params.get('turn', 0)
-        self.turn_rd = params.get('turn_rd', rd.randint(0, self.nb_plys-1))
+        self.turn_rd = params.get('turn_rd', rng.randint(0, self.nb_plys-1))
         self.curr_player = self.get_curr_player()
         self.history = params.get('history', {})
 
@@ -46,7 +75,7 @@ class Scrabble:
             self.__initialize_game()
 
     def __initialize_game(self) -> None:
-        self.purse = Purse(lang=self.config['LANG'])
+        self.purse = Purse(lang=self.config['LANG'], seed=self.seed)
         self.board = Board(size=self.config['BOARD_SIZE'])
         for pl_id in self.players:
             self.players[pl_id].rack.clear()
@@ -55,20 +84,99 @@ class Scrabble:
                 rack = self.players[player_id].rack
                 rack.extend(self.purse.draw())
 
+    def copy(self) -> 'Scrabble':
+        """
+        Return an independent copy of the game, in O(board size): racks, purse
+        and board are copied, tiles and words being immutable and shared
+        The copy has no listeners, a search on it being silent
+        """
+        game = Scrabble.__new__(Scrabble)
+        game.__dict__.update(self.__dict__)
+        game.players = {pl_id: player.copy() for pl_id, player in self.players.items()}
+        game.pl_ids = self.pl_ids[:]
+        game.config = dict(self.config)
+        game.history = dict(self.history)
+        game.purse = self.purse.copy()
+        game.board = self.board.copy()
+        game.listeners = []
+        return game
+
+    def make_move(self, tiles: list[Tile], words: list[Word] = None) -> MoveUndo:
+        """
+        Play the tiles for the current player as save_move does (draw, bingo and
+        end game bonus included) without emitting events, and return what
+        unmake_move needs to take the move back
+        Raise a ScrabbleError, the game being unchanged, if the move is invalid
+        """
+        if words is None:
+            words = self.board.get_next_words(tiles)
+        player = self.players[self.curr_player]
+        rack = player.rack[:]
+        for tile in tiles:
+            try:
+                rack.remove(Tile('*') if tile.blank else Tile(tile.letter))
+            except ValueError as err:
+                raise NotInRack from err
+        undo = MoveUndo(tiles, self.curr_player, player.score, player.rack[:], self.purse.snapshot(),
+                        self.board.save_checks())
+        points = self.board.compute_score(tiles, words)
+        if len(tiles) == self.config['RACK_SIZE']:
+            points += 50
+        self.board.add_tiles(tiles)
+        rack.extend(self.purse.draw(min(len(tiles), len(self.purse))))
+        player.rack[:] = rack
+        player.score += points
+        if not rack:
+            player.score += sum(tile.value for pl_id in self.players for tile in self.players[pl_id].rack)
+        self.pass_turn(words)
+        return undo
+
+    def unmake_move(self, undo: MoveUndo) -> None:
+        """
+        Take back the last move played by make_move
+        """
+        self.turn -= 1
+        self.history.pop(self.turn, None)
+        self.curr_player = self.get_curr_player()
+        self.board.remove_tiles(undo.tiles, undo.checks)
+        player = self.players[undo.player_id]
+        player.rack[:] = undo.rack
+        player.score = undo.score
+        self.purse.restore(undo.purse)
+
+    def add_listener(self, listener) -> None:
+        self.listeners = [*self.listeners, listener]
+
+    def remove_listener(self, listener) -> None:
+        self.listeners = [other for other in self.listeners if other is not listener]
+
+    def emit(self, name: str, player_id: str = None, **data) -> None:
+        """
+        Call the listeners with the event, callers checking self.listeners
+        first so that nothing is built for a silent game
+        """
+        event = GameEvent(name, self.turn, player_id if player_id is not None else self.curr_player, data)
+        for listener in self.listeners:
+            listener(event)
+
     def get_curr_rack(self):
         return self.players[self.curr_player].rack
 
     def get_curr_player(self) -> str:
         return self.pl_ids[(self.turn + self.turn_rd) % self.nb_plys]
 
-    def save_move(self, tiles) -> None:
-        new_words = self.board.get_next_words(tiles)
-        scored_points = self.board.compute_score(tiles)
-        self.players[self.curr_player].score += scored_points
+    def save_move(self, tiles, new_words: list[Word] = None) -> None:
+        if new_words is None:
+            new_words = self.board.get_next_words(tiles)
+        scored_points = self.board.compute_score(tiles, new_words)
         if len(tiles) == self.config['RACK_SIZE']:
-            print('Scrabble!!! +50 bonus points!!!')
-            self.players[self.curr_player].score += 50
+            scored_points += 50
+            if self.listeners:
+                self.emit(BINGO, bonus=50)
+        self.players[self.curr_player].score += scored_points
         self.board.add_tiles(tiles)
+        if self.listeners:
+            self.emit(MOVE_APPLIED, tiles=tiles, words=new_words, score=scored_points)
 
         if not self.get_curr_rack():
             self.end_game()
@@ -76,9 +184,12 @@ class Scrabble:
         self.pass_turn(new_words)
 
     def get_print_scores(self):
+        """
+        Return the scores in player order, emitted to the listeners
+        """
         scores = [self.players[pl_id].score for pl_id in self.pl_ids]
-        print('Scores:')
-        print(*zip(self.pl_ids, scores))
+        if self.listeners:
+            self.emit(SCORES, scores=dict(zip(self.pl_ids, scores)))
         return scores
 
     def pass_turn(self, words:list[Word]=None):
@@ -87,7 +198,8 @@ class Scrabble:
         self.curr_player = self.get_curr_player()
 
     def exchange_tiles(self, tiles):
-        temp_rack = deepcopy(self.get_curr_rack())
+        # Tiles are immutable: a shallow copy of the rack is enough
+        temp_rack = self.get_curr_rack()[:]
         for tile in tiles:
             try:
                 temp_rack.remove(tile)
@@ -96,73 +208,81 @@ class Scrabble:
         rack = self.get_curr_rack()
         for tile in tiles:
             rack.remove(tile)
-            self.purse.tiles.append(tile)
-        self.purse.shuffle()
-        rack.extend(self.purse.draw(len(tiles)))
+        self.purse.put_back(tiles)
+        drawn_tiles = self.purse.draw(len(tiles))
+        rack.extend(drawn_tiles)
+        if self.listeners:
+            self.emit(TILES_EXCHANGED, nb_tiles=len(tiles))
         self.pass_turn()
+        return drawn_tiles
 
     def display_info(self) -> None:
-        print(f'Turn: {self.turn}')
-        print(f'Tiles in purse: {len(self.purse)}')
-        self.get_print_scores()
-        print(self.board)
-        print(f'Player turn: {self.curr_player}')
-        print(self.get_curr_rack())
+        """
+        Emit the state of the game to the listeners, printed by a verbose game
+        """
+        if self.listeners:
+            scores = {pl_id: self.players[pl_id].score for pl_id in self.pl_ids}
+            self.emit(GAME_INFO, purse=len(self.purse), scores=scores, board=self.board,
+                      rack=self.get_curr_rack()[:])
+
+    @staticmethod
+    def rack_letter(letter: str) -> str:
+        """
+        Return the rack letter of a move letter, a lowercase letter being a blank (*)
+        """
+        return '*' if letter.islower() else letter
 
     def check_format_move(self, move):
+        """
+        Return the tiles of the move {(x, y): letter}, a lowercase letter being
+        a blank played as this letter
+        Raise NotInRack if the current rack does not hold them
+        """
         move_letters = move.values()
-        temp_rack = deepcopy(self.get_curr_rack())
+        temp_rack = self.get_curr_rack()[:]
         for letter in move_letters:
             try:
-                temp_rack.remove(Tile(letter))
+                temp_rack.remove(Tile(self.rack_letter(letter)))
             except ValueError as err:
                 raise NotInRack from err
-        return [Tile(move[pos], pos) for pos in move.keys()]
+        return [Tile(letter.upper(), pos, blank=letter.islower()) for pos, letter in move.items()]
 
     def update_rack(self, move):
         letters = move.values()
         rack = self.get_curr_rack()
+        drawn_tiles = []
         for letter in letters:
-            rack.remove(Tile(letter))
+            rack.remove(Tile(self.rack_letter(letter)))
             try:
-                rack.extend(self.purse.draw())
+                drawn_tiles.extend(self.purse.draw())
             except EmptyPurse:
-                print('No more tile in purse')
+                pass
+        rack.extend(drawn_tiles)
+        if len(drawn_tiles) < len(move) and self.listeners:
+            self.emit(PURSE_EMPTY, missing=len(move) - len(drawn_tiles))
+        return drawn_tiles
 
     def end_game(self):
-        print(f'Game is finished by {self.curr_player}')
-        racks = [self.players[pl_id].rack for pl_id in self.players]
-        remaining_tiles = sum(racks, [])
-        print(remaining_tiles)
-        bonus_points = sum(tile.value for tile in remaining_tiles)
-        print(f'Finihser {self.curr_player} get {bonus_points} bonus_points by emptying his rack')
+        """
+        The current player, who emptied its rack, gets the value of the tiles left on the racks
+        """
+        bonus_points = sum(tile.value for pl_id in self.players for tile in self.players[pl_id].rack)
         self.players[self.curr_player].score += bonus_points
-
-        final_scores = self.get_print_scores()
-        winner_idx = final_scores.index(winner_score := max(final_scores))
-        winner = self.pl_ids[winner_idx]
-        print(f'Winner is {winner} with a score of {winner_score}')
+        if self.listeners:
+            scores = {pl_id: self.players[pl_id].score for pl_id in self.pl_ids}
+            self.emit(GAME_OVER, bonus=bonus_points, scores=scores, winner=max(self.pl_ids, key=scores.get))
 
     # move: {(x, y): letter}, dict(pos:str)
     def submit(self, move) -> None:
         try:
-            print('move submission')
             move_formated = self.check_format_move(move)
             next_words = self.board.get_next_words(move_formated)
-        except BadWords as err:
-            print('BadWords Error:')
-            print(f'These words are unvalid : {err.bad_words}')
-            print(f'These words are valid: {err.good_words}')
         except ScrabbleError as err:
-            print('Scrabble Error')
-            print(f'Type: {type(err).__name__}')
-            print(err.args)
+            if self.listeners:
+                self.emit(MOVE_REJECTED, error=err)
         else:
-            print(f'Added words: {next_words}')
             self.update_rack(move)
-            self.save_move(move_formated)
-        finally:
-            self.display_info()
+            self.save_move(move_formated, next_words)
 
     def input_move(self):
         """
@@ -0,0 +1,143 @@
+"""
+Headless bot-vs-bot games, to tune the bots and load the engine
+
+Games are spread over a pool of processes, each game being seeded by its
+number so that a run is reproducible, and their results written to a CSV
+file as they come, one row per game:
+    game, seed, first_player, turns, ended (out: a player emptied its rack,
+    passes: every player passed twice in a row), end_bonus, duration_ms,
+    winner, then for each seat i: strategy_i, score_i, moves_i, bingos_i
+
+Run with:
+    python -m scrabble_python.simulation --games 1000 --bots greedy leave [--out results.csv]
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+from .bots import BOTS, make_bot
+from .items import Player
+from .scrabble import Scrabble
+
+GAME_FIELDS = ['game', 'seed', 'first_player', 'turns', 'ended', 'end_bonus', 'duration_ms', 'winner']
+SEAT_FIELDS = ['strategy', 'score', 'moves', 'bingos']
+
+
+def result_fields(nb_players: int) -> list[str]:
+    return GAME_FIELDS + [f'{field}_{seat}' for seat in range(1, nb_players + 1) for field in SEAT_FIELDS]
+
+
+def play_game(game_nb: int, strategies: tuple, seed: int = 0, lang: str = 'fr', budget_ms: float = 50) -> dict:
+    """
+    Play a whole game between bots of the strategies, one per seat, and
+    return its result row
+    """
+    start = time.perf_counter()
+    game_seed = seed + game_nb
+    pl_ids = [f'player_{seat}' for seat in range(1, len(strategies) + 1)]
+    game = Scrabble(players=[Player(pl_id) for pl_id in pl_ids], lang=lang, seed=game_seed, verbose=False)
+    bots = {
+        pl_id: make_bot(strategy, seed=game_seed * len(pl_ids) + seat,
+                        **({'budget_ms': budget_ms} if strategy == 'montecarlo' else {}))
+        for seat, (pl_id, strategy) in enumerate(zip(pl_ids, strategies))
+    }
+    rack_size = game.config['RACK_SIZE']
+    moves = dict.fromkeys(pl_ids, 0)
+    bingos = dict.fromkeys(pl_ids, 0)
+    first_player, end_bonus, passes = game.curr_player, 0, 0
+    while True:
+        pl_id = game.curr_player
+        move = bots[pl_id].choose(game)
+        if move is None:
+            game.pass_turn()
+            passes += 1
+            if passes == 2 * len(pl_ids):
+                # Each player loses the value of its rack
+                for player in game.players.values():
+                    player.score -= sum(tile.value for tile in player.rack)
+                ended = 'passes'
+                break
+            continue
+        passes = 0
+        tiles = game.check_format_move(move)
+        words = game.board.get_next_words(tiles)
+        game.update_rack(move)
+        moves[pl_id] += 1
+        # Scored by save_move, with the 50 points of a full rack
+        bingos[pl_id] += len(tiles) == rack_size
+        if not game.get_curr_rack():
+            # Added by save_move: the tiles left on the racks of the others
+            end_bonus = sum(tile.value for player in game.players.values() for tile in player.rack)
+            game.save_move(tiles, words)
+            ended = 'out'
+            break
+        game.save_move(tiles, words)
+    scores = {pl_id: game.players[pl_id].score for pl_id in pl_ids}
+    row = {
+        'game': game_nb,
+        'seed': game_seed,
+        'first_player': first_player,
+        'turns': game.turn,
+        'ended': ended,
+        'end_bonus': end_bonus,
+        'duration_ms': round((time.perf_counter() - start) * 1e3, 1),
+        'winner': max(pl_ids, key=scores.get)
+    }
+    for seat, (pl_id, strategy) in enumerate(zip(pl_ids, strategies), 1):
+        row |= {f'strategy_{seat}': strategy, f'score_{seat}': scores[pl_id],
+                f'moves_{seat}': moves[pl_id], f'bingos_{seat}': bingos[pl_id]}
+    return row
+
+
+def _play_game(args: tuple) -> dict:
+    return play_game(*args)
+
+
+def simulate(nb_games: int, strategies: tuple, out, seed: int = 0, lang: str = 'fr', budget_ms: float = 50,
+             workers: int = None) -> int:
+    """
+    Play nb_games over a pool of workers (one per CPU by default, 0 for none)
+    and write their rows to the out file in game order, as they come
+    Return the number of games played
+    """
+    writer = csv.DictWriter(out, fieldnames=result_fields(len(strategies)))
+    writer.writeheader()
+    tasks = ((game_nb, tuple(strategies), seed, lang, budget_ms) for game_nb in range(nb_games))
+    if workers == 0:
+        writer.writerows(map(_play_game, tasks))
+        return nb_games
+    workers = workers or os.cpu_count()
+    with Pool(workers) as pool:
+        for row in pool.imap(_play_game, tasks, chunksize=max(1, min(16, nb_games // (4 * workers)))):
+            writer.writerow(row)
+    return nb_games
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Play bot-vs-bot games and write their results to a CSV file')
+    parser.add_argument('--games', type=int, default=100, help='number of games')
+    parser.add_argument('--bots', nargs='+', choices=list(BOTS), default=['greedy', 'greedy'],
+                        help='strategy of each seat, 2 to 4 seats')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the first game, the next ones following')
+    parser.add_argument('--lang', default=Scrabble.df_lang)
+    parser.add_argument('--budget-ms', type=float, default=50, help='search time of the montecarlo bots')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='worker processes, 0 for none')
+    parser.add_argument('--out', help='CSV file of the results, stdout if omitted')
+    args = parser.parse_args(argv)
+    if not 2 <= len(args.bots) <= 4:
+        parser.error('2 to 4 bots play a game')
+    start = time.perf_counter()
+    if args.out:
+        with open(args.out, 'w', newline='') as out:
+            nb_games = simulate(args.games, args.bots, out, args.seed, args.lang, args.budget_ms, args.workers)
+    else:
+        nb_games = simulate(args.games, args.bots, sys.stdout, args.seed, args.lang, args.budget_ms, args.workers)
+    elapsed = time.perf_counter() - start
+    print(f'{nb_games} games in {elapsed:.1f} s, {nb_games / elapsed * 60:.0f} games/min', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
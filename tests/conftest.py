@@ -28,6 +28,20 @@ def populate_test_db() -> None:
             'creator_id': 'player_1',
             'name': 'name_1',
             'players': [{'id': 'player_1', 'pseudo': 'pseudo_1'}]
+        }),
+        InsertOne({
+            'id': 'game_full',
+            'creator_id': 'player_2',
+            'name': 'name_full',
+            'nb_players': 1,
+            'players': [{'id': 'player_2', 'pseudo': 'pseudo_2'}]
+        }),
+        InsertOne({
+            'id': 'game__creator_leave',
+            'creator_id': 'player_2',
+            'name': 'name_creator_leave',
+            'nb_players': 2,
+            'players': [{'id': 'player_2', 'pseudo': 'pseudo_2'}]
         })
     ])
 
@@ -38,7 +52,7 @@ def app() -> Flask:
     Create an app fixture for testing, which use a specific testing database
     """
     populate_test_db()
-    return create_app({'TESTING': True, 'DB_NAME': 'Testing'})
+    return create_app({'TESTING': True, 'DB_NAME': 'Testing', 'BOT_POOL': 'inline'})
 
 
 @pytest.fixture(scope='session')
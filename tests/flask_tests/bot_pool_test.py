@@ -0,0 +1,71 @@
+import os
+
+import pytest
+from scrabble_flask.bot_pool import (BotPool, choose_bot_move, is_bot,
+                                     new_bot_seat, parse_bot_spec)
+from scrabble_flask.format_helpers import game_to_doc
+from scrabble_python import Player, Scrabble
+
+
+def test_bot_seat():
+    seat = new_bot_seat({'strategy': 'leave'})
+    assert is_bot(seat['id'])
+    assert not is_bot('player_1')
+    assert seat['pseudo'] == 'leave bot'
+
+
+@pytest.mark.parametrize('spec, parsed', [
+    ('greedy', {'strategy': 'greedy', 'budget_ms': 100}),
+    ({'strategy': 'montecarlo', 'budget_ms': 20}, {'strategy': 'montecarlo', 'budget_ms': 20}),
+])
+def test_parse_bot_spec(spec, parsed):
+    assert parse_bot_spec(spec, 100) == parsed
+
+
+@pytest.mark.parametrize('spec', ['chess', {'budget_ms': 20}, {'strategy': 'leave', 'budget_ms': 0},
+                                  {'strategy': 'leave', 'budget_ms': True}, ['greedy']])
+def test_parse_bad_bot_spec(spec):
+    with pytest.raises(ValueError):
+        parse_bot_spec(spec, 100)
+
+
+@pytest.mark.parametrize('kind', ['inline', 'thread', 'process'])
+def test_bot_pool(kind):
+    game = Scrabble(players=[Player('player_1'), Player('player_2')])
+    game_doc = game_to_doc(game)
+    pool = BotPool(kind, workers=1)
+    try:
+        move = pool.submit(choose_bot_move, game_doc, {'strategy': 'greedy', 'budget_ms': 50}).result(timeout=30)
+    finally:
+        pool.shutdown()
+    # Searched on a copy of the game, reproducibly
+    assert move == choose_bot_move(game_doc, {'strategy': 'greedy', 'budget_ms': 50})
+    assert move is None or game.board.get_next_words(game.check_format_move(move))
+
+
+def test_bot_pool_kinds():
+    with pytest.raises(ValueError):
+        BotPool('fork')
+
+
+def exit_worker():
+    os._exit(1)
+
+
+def test_broken_pool():
+    pool = BotPool('process', workers=1)
+    try:
+        with pytest.raises(Exception):
+            pool.submit(exit_worker).result(timeout=30)
+        # The pool is started again
+        assert pool.submit(is_bot, 'bot-1').result(timeout=30)
+    finally:
+        pool.shutdown()
+
+
+def test_claim():
+    pool = BotPool('inline')
+    assert pool.claim('game_1')
+    assert not pool.claim('game_1')
+    pool.release('game_1')
+    assert pool.claim('game_1')
@@ -0,0 +1,51 @@
+import time
+
+import pytest
+from scrabble_flask import create_app
+from scrabble_flask.db import get_mongo_db
+from scrabble_flask.mongo_api import with_projection
+
+
+def test_shared_client():
+    app = create_app({'TESTING': True, 'MONGO_MAX_POOL_SIZE': 7, 'MONGO_ENSURE_INDEXES': False})
+    other_app = create_app({'TESTING': True, 'MONGO_MAX_POOL_SIZE': 7, 'MONGO_ENSURE_INDEXES': False})
+    client = app.extensions['mongo_client']
+    assert other_app.extensions['mongo_client'] is client
+    assert client.options.pool_options.max_pool_size == 7
+
+    with app.app_context():
+        games_db = get_mongo_db('games')
+        assert get_mongo_db('games') is games_db
+        assert get_mongo_db('players').client is client
+        games_db.close_db()
+    # Requests never close the shared client
+    with app.test_request_context():
+        assert get_mongo_db('games') is games_db
+
+
+def test_indexes_unreachable_db():
+    # Indexes are created in the background, their failures being logged
+    start = time.perf_counter()
+    app = create_app({
+        'TESTING': True,
+        'MONGO_URI': 'mongodb://localhost:1',
+        'MONGO_SERVER_SELECTION_TIMEOUT_MS': 2000
+    })
+    assert time.perf_counter() - start < 1
+    assert 'mongo_client' in app.extensions
+
+
+def test_shared_locks_unreachable_db():
+    # Several workers need the unique indexes of locks and plays before serving
+    with pytest.raises(RuntimeError):
+        create_app({
+            'TESTING': True,
+            'MONGO_URI': 'mongodb://localhost:1',
+            'MONGO_SERVER_SELECTION_TIMEOUT_MS': 50,
+            'GAME_LOCKS': 'mongo'
+        })
+
+
+def test_projection():
+    assert with_projection() == {'_id': 0}
+    assert with_projection({'id': 1, 'pseudo': 1}) == {'_id': 0, 'id': 1, 'pseudo': 1}
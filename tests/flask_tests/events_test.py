@@ -0,0 +1,54 @@
+import queue
+
+import socketio as python_socketio
+from scrabble_flask import create_app
+from scrabble_flask.events import NAMESPACE, MemoryManager, emit_game_event, get_socketio
+
+app = create_app({'TESTING': True, 'MONGO_ENSURE_INDEXES': False})
+
+
+def test_game_rooms():
+    socketio = get_socketio(app)
+    watcher = socketio.test_client(app, namespace=NAMESPACE)
+    other = socketio.test_client(app, namespace=NAMESPACE)
+    ack = watcher.emit('watch', {'game_id': 'game_1'}, namespace=NAMESPACE, callback=True)
+    assert ack == {'game_id': 'game_1', 'watching': True}
+    other.emit('watch', {'game_id': 'game_2'}, namespace=NAMESPACE)
+
+    with app.app_context():
+        emit_game_event('game_1', 'game_started', {'turn': 0, 'curr_player': 'player_1'})
+    received = watcher.get_received(NAMESPACE)
+    assert [(event['name'], event['args'][0]) for event in received] == [
+        ('game_started', {'game_id': 'game_1', 'turn': 0, 'curr_player': 'player_1'})
+    ]
+    # Only the watchers of the game get its events
+    assert other.get_received(NAMESPACE) == []
+
+    watcher.emit('unwatch', {'game_id': 'game_1'}, namespace=NAMESPACE)
+    with app.app_context():
+        emit_game_event('game_1', 'player_left', {'player_id': 'player_2', 'nb_players': 1})
+    assert watcher.get_received(NAMESPACE) == []
+
+
+def test_memory_queue():
+    # Two workers relaying their events through an in-process queue
+    managers = [MemoryManager(channel='events_test') for _ in range(2)]
+    handled = [queue.Queue() for _ in managers]
+    for manager, manager_handled in zip(managers, handled):
+        python_socketio.Server(client_manager=manager, async_mode='threading')
+        manager._handle_emit = manager_handled.put
+        manager.initialize()
+    managers[0].emit('game_started', {'turn': 0}, namespace=NAMESPACE, room='game_1')
+    local = handled[0].get(timeout=1)
+    relayed = handled[1].get(timeout=1)
+    assert relayed['event'] == local['event'] == 'game_started'
+    assert relayed['room'] == 'game_1'
+    assert relayed['data'] == [{'turn': 0}]
+    # A worker does not handle its own messages twice
+    assert handled[0].empty()
+
+
+def test_message_queue_config():
+    worker = create_app({'TESTING': True, 'MONGO_ENSURE_INDEXES': False,
+                         'SOCKETIO_MESSAGE_QUEUE': 'memory://', 'SOCKETIO_CHANNEL': 'events_config_test'})
+    assert isinstance(get_socketio(worker).server.manager, MemoryManager)
@@ -0,0 +1,55 @@
+import bson
+import pytest
+from scrabble_flask.format_helpers import (CODEC_VERSION, doc_to_game, game_to_doc,
+                                           game_to_msgpack, msgpack_to_game)
+from scrabble_python import Player, Scrabble, Tile, Word
+
+
+@pytest.fixture
+def game() -> Scrabble:
+    game = Scrabble(players=[Player('player_1'), Player('player_2')])
+    tiles = [Tile('T', (7, 7)), Tile('E', (7, 8), blank=True), Tile('S', (7, 9)), Tile('T', (7, 10))]
+    game.board.add_tiles(tiles)
+    game.players['player_1'].score = 4
+    game.players['player_2'].rack[0] = Tile('*')
+    game.pass_turn([Word('TEST', (7, 7))])
+    return game
+
+
+def assert_same_game(game: Scrabble, decoded: Scrabble) -> None:
+    assert decoded.config == game.config
+    assert (decoded.turn, decoded.turn_rd) == (game.turn, game.turn_rd)
+    assert decoded.curr_player == game.curr_player
+    assert decoded.pl_ids == game.pl_ids
+    assert decoded.players == game.players
+    assert decoded.board == game.board
+    assert decoded.board.get_tile((7, 8)).blank
+    assert decoded.board.anchors == game.board.anchors
+    assert decoded.purse == game.purse
+    assert decoded.history == game.history
+    # The purse generator resumes where it stopped
+    assert decoded.purse.draw(7) == game.purse.draw(7)
+
+
+def test_doc_round_trip(game):
+    doc = game_to_doc(game)
+    assert doc['v'] == CODEC_VERSION
+    assert len(doc['board']) == 15 * 15
+    assert doc['players'][1]['rack'].startswith('*')
+    assert_same_game(game, doc_to_game(doc))
+
+
+def test_bson_round_trip(game):
+    encoded = bson.encode(game_to_doc(game))
+    assert_same_game(game, doc_to_game(bson.decode(encoded)))
+
+
+def test_msgpack_round_trip(game):
+    pytest.importorskip('msgpack')
+    assert_same_game(game, msgpack_to_game(game_to_msgpack(game)))
+
+
+def test_unknown_version(game):
+    doc = game_to_doc(game) | {'v': CODEC_VERSION + 1}
+    with pytest.raises(ValueError):
+        doc_to_game(doc)
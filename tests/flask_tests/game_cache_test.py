@@ -0,0 +1,243 @@
+import logging
+from threading import Event, Thread
+
+import pytest
+from pymongo.errors import AutoReconnect, DuplicateKeyError
+from scrabble_flask import create_app
+from scrabble_flask.format_helpers import game_to_doc
+from scrabble_flask.game_cache import STATE_FIELD, GameCache, StaleGame
+from scrabble_flask.move_log import make_record
+from scrabble_python import Player, Scrabble
+
+
+class FakeGamesAPI:
+    """
+    In-memory stand-in of the games MongoAPI, counting the database calls
+    """
+
+    def __init__(self, docs) -> None:
+        self.docs = docs
+        self.reads = 0
+        self.writes = 0
+
+    def read_one_doc(self, filt, projection=None):
+        self.reads += 1
+        return self.docs.get(filt['id'])
+
+    def update_versioned_doc(self, filt, version, new_version, data_to_put):
+        doc = self.docs[filt['id']]
+        if doc.get('version', 0) != version:
+            return False
+        self.writes += 1
+        doc.update(data_to_put | {'version': new_version})
+        return True
+
+
+class FakePlaysAPI:
+    """
+    In-memory stand-in of the plays MongoAPI, unique per game and turn
+    """
+
+    def __init__(self) -> None:
+        self.records = {}
+
+    def insert_doc(self, record):
+        key = (record['game_id'], record['turn'])
+        if key in self.records:
+            raise DuplicateKeyError('duplicate turn')
+        self.records[key] = record
+
+    def iter_docs(self, filt=None, n=0, projection=None, sort=None):
+        return [record for (game_id, turn), record in sorted(self.records.items())
+                if game_id == filt['game_id'] and turn >= filt['turn']['$gte']]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def new_game() -> Scrabble:
+    return Scrabble(players=[Player('player_1'), Player('player_2')])
+
+
+@pytest.fixture
+def games_api() -> FakeGamesAPI:
+    return FakeGamesAPI({
+        'game_1': {'id': 'game_1', STATE_FIELD: game_to_doc(new_game()), 'version': 3},
+        'game_2': {'id': 'game_2'}
+    })
+
+
+def test_hot_reads(games_api):
+    cache = GameCache(games_api)
+    game = cache.get('game_1')
+    assert game is not None
+    assert cache.version('game_1') == 3
+    assert cache.get('game_1') is game
+    assert games_api.reads == 1
+    # Unknown and unstarted games are not cached
+    assert cache.get('game_2') is None
+    assert cache.get('game_3') is None
+    assert len(cache) == 1
+
+
+def test_write_behind(games_api):
+    clock = FakeClock()
+    cache = GameCache(games_api, flush_moves=3, flush_seconds=10, clock=clock)
+    game = cache.get('game_1')
+    game.pass_turn()
+    assert cache.touch('game_1') == 4
+    game.pass_turn()
+    cache.touch('game_1')
+    assert games_api.writes == 0
+    game.pass_turn()
+    cache.touch('game_1')
+    assert games_api.writes == 1
+    assert games_api.docs['game_1']['version'] == 6
+    assert games_api.docs['game_1'][STATE_FIELD]['turn'] == game.turn
+    # A move older than flush_seconds is written back by maintain
+    cache.touch('game_1')
+    cache.maintain()
+    assert games_api.writes == 1
+    clock.now = 10
+    cache.maintain()
+    assert games_api.writes == 2
+
+
+def test_stale_game(games_api):
+    cache = GameCache(games_api, flush_moves=1)
+    cache.get('game_1')
+    # Another process writes the game meanwhile
+    games_api.docs['game_1']['version'] = 4
+    with pytest.raises(StaleGame):
+        cache.touch('game_1')
+    assert 'game_1' not in cache
+    cache.get('game_1')
+    assert cache.version('game_1') == 4
+
+
+def test_add(games_api):
+    cache = GameCache(games_api)
+    game = new_game()
+    cache.add('game_2', game)
+    assert cache.get('game_2') is game
+    assert cache.flush() == 1
+    assert games_api.docs['game_2']['version'] == 1
+    assert cache.flush() == 0
+
+
+def test_eviction(games_api):
+    clock = FakeClock()
+    cache = GameCache(games_api, max_size=1, ttl=60, clock=clock)
+    cache.add('game_2', new_game())
+    # The least recently used game is written back before its eviction
+    cache.get('game_1')
+    assert 'game_2' not in cache
+    assert games_api.docs['game_2']['version'] == 1
+    clock.now = 61
+    assert cache.evict_idle() == ['game_1']
+    assert len(cache) == 0
+
+
+def pass_record(game: Scrabble, game_id: str = 'game_1') -> dict:
+    record = make_record(game_id, game.turn, game.curr_player, 'pass', nb_draws=game.purse.nb_draws)
+    game.pass_turn()
+    return record
+
+
+def test_move_log(games_api):
+    plays_api = FakePlaysAPI()
+    cache = GameCache(games_api, plays_api, flush_moves=2)
+    game = cache.get('game_1')
+    cache.touch('game_1', pass_record(game))
+    assert len(plays_api.records) == 1
+    assert games_api.writes == 0
+    # Rebuilt from the snapshot and the logged move
+    other_cache = GameCache(games_api, plays_api, flush_moves=2)
+    other_game = other_cache.get('game_1')
+    assert other_game.turn == game.turn == 1
+    assert other_cache.version('game_1') == 4
+    # The other process logs the next turn, its snapshot is two moves ahead
+    other_cache.touch('game_1', pass_record(other_game))
+    assert games_api.writes == 1
+    assert games_api.docs['game_1'][STATE_FIELD]['turn'] == 2
+    with pytest.raises(StaleGame):
+        cache.touch('game_1', pass_record(game))
+    assert 'game_1' not in cache
+    assert cache.get('game_1').turn == 2
+
+
+def fail(*args, **kwargs):
+    raise AutoReconnect('connection lost')
+
+
+def test_move_not_logged(games_api, monkeypatch):
+    plays_api = FakePlaysAPI()
+    cache = GameCache(games_api, plays_api)
+    game = cache.get('game_1')
+    monkeypatch.setattr(plays_api, 'insert_doc', fail)
+    with pytest.raises(AutoReconnect):
+        cache.touch('game_1', pass_record(game))
+    # The game played ahead of its log is dropped
+    assert 'game_1' not in cache
+    assert cache.get('game_1').turn == 0
+
+
+def test_snapshot_not_written(games_api, monkeypatch):
+    plays_api = FakePlaysAPI()
+    cache = GameCache(games_api, plays_api, flush_moves=1)
+    game = cache.get('game_1')
+    monkeypatch.setattr(games_api, 'update_versioned_doc', fail)
+    # The move is logged: no error, the game being rebuilt from the log
+    assert cache.touch('game_1', pass_record(game)) == 4
+    assert 'game_1' not in cache
+    monkeypatch.undo()
+    assert cache.get('game_1').turn == 1
+    assert cache.version('game_1') == 4
+
+
+def test_slow_game_load(games_api, monkeypatch):
+    cache = GameCache(games_api)
+    cache.add('game_2', new_game())
+    loading, loaded = Event(), Event()
+    read_one_doc = games_api.read_one_doc
+
+    def slow_read(filt, projection=None):
+        loading.set()
+        loaded.wait(5)
+        return read_one_doc(filt, projection)
+    monkeypatch.setattr(games_api, 'read_one_doc', slow_read)
+    loader = Thread(target=cache.get, args=('game_1',))
+    loader.start()
+    assert loading.wait(5)
+    # The other games are played and written back while game_1 loads
+    cache.get('game_2').pass_turn()
+    cache.touch('game_2')
+    assert cache.flush('game_2') == 1
+    loaded.set()
+    loader.join(5)
+    assert 'game_1' in cache
+
+
+def test_listeners(games_api):
+    events = []
+    cache = GameCache(games_api, listeners=[events.append])
+    game = cache.get('game_1')
+    assert game.listeners == [events.append]
+    cache.add('game_3', new_game())
+    cache.get('game_3').pass_turn()
+    game.exchange_tiles(game.get_curr_rack()[:2])
+    assert [event.name for event in events] == ['tiles_exchanged']
+
+
+def test_engine_event_log():
+    # Games are silent unless the engine events are logged
+    app = create_app({'TESTING': True, 'MONGO_ENSURE_INDEXES': False})
+    assert app.extensions['game_cache'].listeners == ()
+    assert not app.logger.isEnabledFor(logging.DEBUG)
+    app = create_app({'TESTING': True, 'MONGO_ENSURE_INDEXES': False, 'ENGINE_EVENT_LOG': True})
+    assert len(app.extensions['game_cache'].listeners) == 1
@@ -0,0 +1,94 @@
+import threading
+import time
+
+import pytest
+from flask import Flask
+from pymongo.errors import DuplicateKeyError
+from scrabble_flask.game_cache import GameCache
+from scrabble_flask.game_lock import GameBusy, MongoLeases, link_app
+
+
+class FakeLocksAPI:
+    """
+    In-memory stand-in of the locks MongoAPI, unique per game id
+    """
+
+    def __init__(self) -> None:
+        self.docs = {}
+
+    def find_one_and_update_doc(self, filt, update, upsert=False, projection=None):
+        doc = self.docs.get(filt['id'])
+        if doc is not None and doc['owner'] is not None and doc['expires'] >= filt['$or'][1]['expires']['$lt']:
+            if upsert:
+                raise DuplicateKeyError('lease held')
+            return None
+        doc = self.docs.setdefault(filt['id'], {'id': filt['id'], 'owner': None})
+        doc.update(update['$set'])
+        return dict(doc)
+
+    def update_one_doc(self, filt, data_to_put):
+        doc = self.docs.get(filt['id'])
+        if doc is not None and doc['owner'] == filt['owner']:
+            doc.update(data_to_put)
+
+
+def test_leases():
+    leases = MongoLeases(FakeLocksAPI(), ttl=60, timeout=0.05)
+    lease = leases.acquire('game_1')
+    assert lease.turn is None
+    # Another worker waits, then gives up
+    with pytest.raises(GameBusy):
+        leases.acquire('game_1')
+    leases.acquire('game_2')
+    lease.turn = 3
+    leases.release(lease)
+    # The released lease tells the turn played
+    assert leases.acquire('game_1').turn == 3
+
+
+def test_expired_lease():
+    leases = MongoLeases(FakeLocksAPI(), ttl=0, timeout=0.05)
+    leases.acquire('game_1')
+    # Its worker died: the lease expired
+    time.sleep(0.001)
+    assert leases.acquire('game_1') is not None
+
+
+def test_game_locks():
+    cache = GameCache(games_api=None)
+    order = []
+    entered = threading.Event()
+
+    def play(game_id, name):
+        with cache.locked(game_id):
+            entered.set()
+            order.append(f'{name} start')
+            time.sleep(0.05)
+            order.append(f'{name} end')
+
+    first = threading.Thread(target=play, args=('game_1', 'first'))
+    first.start()
+    entered.wait()
+    # Another game is not blocked, the same game waits
+    other = threading.Thread(target=play, args=('game_2', 'other'))
+    same = threading.Thread(target=play, args=('game_1', 'same'))
+    other.start()
+    same.start()
+    for thread in (first, other, same):
+        thread.join()
+    assert order.index('other start') < order.index('first end')
+    assert order.index('same start') > order.index('first end')
+    assert cache.game_locks == {}
+
+
+@pytest.mark.parametrize('config', [
+    {'WEB_WORKERS': 2},
+    {'WEB_WORKERS': 2, 'GAME_LOCKS': 'mongo'},
+    {'WEB_WORKERS': 2, 'GAME_LOCKS': 'mongo', 'SOCKETIO_MESSAGE_QUEUE': 'memory://'},
+    {'WEB_WORKERS': 2, 'SOCKETIO_MESSAGE_QUEUE': 'redis://localhost:6379'},
+])
+def test_workers_need_shared_locks(config):
+    app = Flask(__name__)
+    app.config.from_mapping(config)
+    with pytest.raises(RuntimeError):
+        link_app(app)
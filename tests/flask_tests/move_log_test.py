@@ -0,0 +1,77 @@
+import pytest
+from scrabble_flask.format_helpers import doc_to_game, game_to_doc
+from scrabble_flask.move_log import apply_record, make_record, replay
+from scrabble_python import Player, Scrabble, Tile
+from scrabble_python.movegen import generate_moves
+
+
+def play_turn(game: Scrabble, game_id: str = 'game_1') -> dict:
+    """
+    Play the best move without blank (or exchange) and return its record
+    """
+    turn, player_id = game.turn, game.curr_player
+    player = game.players[player_id]
+    moves = [move for move in generate_moves(game.board, player.rack)
+             if not any(blank for *_, blank in move.placements)]
+    if not moves:
+        to_exchange = player.rack[:2]
+        drawn = game.exchange_tiles(to_exchange)
+        return make_record(game_id, turn, player_id, 'exchange', to_exchange,
+                           drawn=drawn, nb_draws=game.purse.nb_draws)
+    move = max(moves, key=lambda move: move.score)
+    tiles = move.tiles
+    score = player.score
+    words = game.board.get_next_words(tiles)
+    drawn = game.update_rack({tile.pos: tile.letter for tile in tiles})
+    game.save_move(tiles, words)
+    return make_record(game_id, turn, player_id, 'play', tiles, words, player.score - score,
+                       drawn, game.purse.nb_draws)
+
+
+@pytest.fixture
+def played():
+    game = Scrabble(players=[Player('player_1'), Player('player_2')])
+    snapshot = game_to_doc(game)
+    records = [play_turn(game) for _ in range(6)]
+    return game, snapshot, records
+
+
+def test_record(played):
+    game, _, records = played
+    record = records[0]
+    assert record['turn'] == 0
+    assert record['kind'] in ('play', 'exchange')
+    assert isinstance(record['drawn'], str)
+    assert [record['turn'] for record in records] == list(range(6))
+
+
+def test_replay(played):
+    game, snapshot, records = played
+    replayed = doc_to_game(snapshot)
+    assert replay(replayed, records) == 6
+    assert game_to_doc(replayed) == game_to_doc(game)
+    assert replayed.history == game.history
+    # The replayed purse draws the same tiles
+    assert replayed.purse.draw(3) == game.purse.draw(3)
+
+
+def test_replay_tail(played):
+    game, snapshot, records = played
+    partial = doc_to_game(snapshot)
+    replay(partial, records[:4])
+    # Snapshot taken after 4 moves, only the tail is replayed
+    replayed = doc_to_game(game_to_doc(partial))
+    replay(replayed, records[4:])
+    assert game_to_doc(replayed) == game_to_doc(game)
+
+
+def test_blank_record():
+    tiles = [Tile('T', (7, 7)), Tile('E', (7, 8), blank=True)]
+    record = make_record('game_1', 0, 'player_1', 'play', tiles)
+    assert record['tiles'] == [[7, 7, 'T'], [7, 8, 'e']]
+
+
+def test_turn_gap(played):
+    _, snapshot, records = played
+    with pytest.raises(ValueError):
+        apply_record(doc_to_game(snapshot), records[1])
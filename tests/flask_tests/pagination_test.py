@@ -0,0 +1,48 @@
+import json
+
+import pytest
+from flask import request
+from scrabble_flask import create_app
+from scrabble_flask.db_helpers import get_page_args_or_400, stream_json_array
+from scrabble_flask.routes.game import GAME_FILTERS
+from werkzeug.exceptions import BadRequest
+
+app = create_app({'TESTING': True, 'PAGE_SIZE': 20, 'MAX_PAGE_SIZE': 50, 'MONGO_ENSURE_INDEXES': False})
+
+
+def test_stream_json_array():
+    docs = [{'id': 'a'}, {'id': 'b', 'n': 2}]
+    assert json.loads(''.join(stream_json_array(docs))) == docs
+    assert ''.join(stream_json_array([])) == '[]'
+
+
+def test_page_args():
+    with app.test_request_context('/game/?after=abc&limit=5&state=running&private=false&lang=fr'):
+        filt, after, limit = get_page_args_or_400(request, GAME_FILTERS)
+    assert filt == {'state': 'running', 'config.private': False, 'config.lang': 'fr'}
+    assert after == 'abc'
+    assert limit == 5
+
+
+def test_page_args_defaults():
+    with app.test_request_context('/player/'):
+        assert get_page_args_or_400(request) == ({}, None, 20)
+    # n is an alias of limit
+    with app.test_request_context('/player/?n=3'):
+        assert get_page_args_or_400(request) == ({}, None, 3)
+    # A page is never larger than MAX_PAGE_SIZE
+    with app.test_request_context('/player/?limit=1000000'):
+        assert get_page_args_or_400(request) == ({}, None, 50)
+
+
+def test_page_args_400():
+    with app.test_request_context('/game/?private=maybe'):
+        with pytest.raises(BadRequest):
+            get_page_args_or_400(request, GAME_FILTERS)
+    for limit in (-1, 0):
+        with app.test_request_context(f'/game/?limit={limit}'):
+            with pytest.raises(BadRequest):
+                get_page_args_or_400(request, GAME_FILTERS)
+    with app.test_request_context('/game/?n=0'):
+        with pytest.raises(BadRequest):
+            get_page_args_or_400(request, GAME_FILTERS)
@@ -0,0 +1,73 @@
+"""
+Server-side budget of a move: the p99 time of a PUT /play/ request on a
+15x15 French board, from loading the game to serializing the response,
+must stay under 10 ms
+
+The phases are read from the Server-Timing header of the responses. Wall
+clock budgets depend on the machine: the benchmark only runs when selected,
+with pytest -m benchmark
+"""
+import random
+
+import pytest
+from scrabble_flask.game_cache import get_game_cache
+from scrabble_python.movegen import generate_moves
+
+pytestmark = pytest.mark.benchmark
+
+BUDGET_MS = 10
+PHASES = ('load', 'play', 'persist', 'response')
+NB_GAMES = 4
+NB_TURNS = 30
+
+
+def start_game(client) -> str:
+    post_resp = client.post('/game/', json={'name': 'bench_game', 'nb_players': 2, 'creator_id': 'player_2'})
+    game_id = post_resp.json['id']
+    client.put('/game/join', json={'game_id': game_id, 'player_id': 'player_1'})
+    start_resp = client.put('/game/start', json={'game_id': game_id, 'creator_id': 'player_2'})
+    assert start_resp.status_code == 201
+    return game_id
+
+
+def server_timing(header: str) -> dict:
+    """
+    Return the {phase: duration in ms} of a Server-Timing header
+    """
+    phases = (metric.split(';dur=') for metric in header.split(', '))
+    return {phase: float(duration) for phase, duration in phases}
+
+
+def test_move_budget(app, client):
+    rng = random.Random(0)
+    timings = []
+    nb_blank_moves = 0
+    for _ in range(NB_GAMES):
+        game_id = start_game(client)
+        for _ in range(NB_TURNS):
+            with app.app_context():
+                game = get_game_cache().get(game_id)
+                moves = generate_moves(game.board, game.get_curr_rack())
+                player_id = game.curr_player
+            if not moves:
+                break
+            # Any legal move, blanks included, played as lowercase letters
+            move = rng.choice(moves)
+            nb_blank_moves += any(blank for *_, blank in move.placements)
+            play_resp = client.put('/play/', json={
+                'game_id': game_id,
+                'player_id': player_id,
+                'tiles': [[x, y, letter.lower() if blank else letter] for x, y, letter, blank in move.placements]
+            })
+            assert play_resp.status_code == 201
+            timings.append(server_timing(play_resp.headers['Server-Timing']))
+            if play_resp.json['finished']:
+                break
+    assert nb_blank_moves > 0
+    assert all(set(PHASES) < set(timing) for timing in timings)
+    for phase in (*PHASES, 'total'):
+        durations = sorted(timing[phase] for timing in timings)
+        print(f'{phase}: median {durations[len(durations) // 2]:.2f} ms, '
+              f'p99 {durations[int(len(durations) * 0.99)]:.2f} ms')
+    totals = sorted(timing['total'] for timing in timings)
+    assert totals[int(len(totals) * 0.99)] < BUDGET_MS
@@ -95,16 +95,45 @@ def test_start_game(client):
     assert start_resp.status_code == 201
     game_resp = client.get('/game/game_1')
     assert game_resp.json['state'] == 'running'
+    assert 'scrabble' not in game_resp.json
+    list_resp = client.get('/game/', query_string={'state': 'running'})
+    assert list_resp.status_code == 200
+    assert all('scrabble' not in game_doc for game_doc in list_resp.json)
 
 
 def test_start_uncomplete_game(client):
-    start_resp = client.put('/game/start', json={'game_id': 'game_1', 'creator_id': 'player_1'})
+    start_resp = client.put('/game/start', json={'game_id': 'game__creator_leave', 'creator_id': 'player_2'})
     assert start_resp.status_code == 403
     assert start_resp.json['err_msg'] == 'uncomplete game'
 
 
+def test_restart_game(client):
+    start_resp = client.put('/game/start', json={'game_id': 'game_1', 'creator_id': 'player_1'})
+    assert start_resp.status_code == 403
+    assert start_resp.json['err_msg'] == 'game already started'
+
+
 def test_delete_game(client):
     del_resp = client.delete('/game/game_1')
     assert del_resp.status_code == 204
     dup_del_resp = client.get('/game/game_1')
     assert dup_del_resp.status_code == 404
+
+
+def test_post_bots(client):
+    bots = ['greedy', {'strategy': 'montecarlo', 'budget_ms': 50}]
+    post_game_resp = client.post('/game/', json=basic_config | {'nb_players': 3, 'bots': bots})
+    assert post_game_resp.status_code == 201
+    game_doc = client.get(f'/game/{post_game_resp.json["id"]}').json
+    creator, *bot_docs = game_doc['players']
+    assert creator['id'] == 'player_1'
+    assert [bot_doc['pseudo'] for bot_doc in bot_docs] == ['greedy bot', 'montecarlo bot']
+    assert [game_doc['bots'][bot_doc['id']] for bot_doc in bot_docs] == [
+        {'strategy': 'greedy', 'budget_ms': 300}, {'strategy': 'montecarlo', 'budget_ms': 50}
+    ]
+
+
+def test_post_bad_bots(client):
+    for bots in (['greedy', 'greedy'], ['chess'], [{'strategy': 'leave', 'budget_ms': -1}], 'greedy'):
+        post_game_resp = client.post('/game/', json=basic_config | {'bots': bots})
+        assert post_game_resp.status_code == 400
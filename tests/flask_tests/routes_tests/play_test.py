@@ -1,15 +1,162 @@
-def test_play(client):
-    play_resp = client.put('/play/', json={})
-    assert False
+import pytest
+from scrabble_flask.events import NAMESPACE, get_socketio
+from scrabble_flask.game_cache import get_game_cache
+from scrabble_python import Tile
+from scrabble_python.movegen import generate_moves
 
 
-def test_abort_play(client):
-    assert False
+@pytest.fixture(scope='module')
+def game_id(client):
+    post_resp = client.post('/game/', json={'name': 'play_game', 'nb_players': 2, 'creator_id': 'player_2'})
+    game_id = post_resp.json['id']
+    client.put('/game/join', json={'game_id': game_id, 'player_id': 'player_1'})
+    start_resp = client.put('/game/start', json={'game_id': game_id, 'creator_id': 'player_2'})
+    assert start_resp.status_code == 201
+    return game_id
 
 
-def test_end_play(client):
-    assert False
+def live_game(app, game_id):
+    with app.app_context():
+        return get_game_cache().get(game_id)
 
 
-def test_cheat_detection(client):
-    assert False
+def best_move(game):
+    return max(generate_moves(game.board, game.get_curr_rack()), key=lambda move: move.score)
+
+
+def move_tiles(move):
+    # Blanks are played as lowercase letters
+    return [[x, y, letter.lower() if blank else letter] for x, y, letter, blank in move.placements]
+
+
+def test_play(app, client, game_id):
+    game = live_game(app, game_id)
+    player_id = game.curr_player
+    move = best_move(game)
+    watcher = get_socketio(app).test_client(app, namespace=NAMESPACE)
+    watcher.emit('watch', {'game_id': game_id}, namespace=NAMESPACE)
+    play_resp = client.put('/play/', json={
+        'game_id': game_id,
+        'player_id': player_id,
+        'tiles': move_tiles(move)
+    })
+    assert play_resp.status_code == 201
+    assert play_resp.json['turn'] == 1
+    event, = watcher.get_received(NAMESPACE)
+    assert event['name'] == 'move_played'
+    assert event['args'][0]['scores'] == play_resp.json['scores']
+    assert 'rack' not in event['args'][0]
+    assert play_resp.json['curr_player'] != player_id
+    assert play_resp.json['scores'][player_id] >= move.score
+    assert len(play_resp.json['rack']) == 7
+    assert 'total;dur=' in play_resp.headers['Server-Timing']
+
+
+def test_abort_play(app, client, game_id):
+    game = live_game(app, game_id)
+    player_id = game.curr_player
+    other_id = next(pl_id for pl_id in game.pl_ids if pl_id != player_id)
+    wrong_turn_resp = client.put('/play/abort', json={'game_id': game_id, 'player_id': other_id})
+    assert wrong_turn_resp.status_code == 403
+    assert wrong_turn_resp.json['err_msg'] == 'not your turn'
+    abort_resp = client.put('/play/abort', json={'game_id': game_id, 'player_id': player_id})
+    assert abort_resp.status_code == 201
+    assert abort_resp.json['curr_player'] == other_id
+
+
+def test_cheat_detection(app, client, game_id):
+    game = live_game(app, game_id)
+    missing = next(letter for letter in 'ZYXWKJQ' if Tile(letter) not in game.get_curr_rack())
+    cheat_resp = client.put('/play/', json={
+        'game_id': game_id,
+        'player_id': game.curr_player,
+        'tiles': [[0, 0, missing]]
+    })
+    assert cheat_resp.status_code == 403
+    assert cheat_resp.json['err_msg'] == 'You do not have the tile'
+
+
+def test_bad_letter(client, game_id):
+    bad_resp = client.put('/play/', json={'game_id': game_id, 'player_id': 'player_1', 'tiles': [[7, 7, '*']]})
+    assert bad_resp.status_code == 400
+
+
+def test_end_play(app, client, game_id):
+    game = live_game(app, game_id)
+    move = best_move(game)
+    # Empty purse, and a rack holding only the tiles of the move
+    game.purse.counts = [0] * len(game.purse.counts)
+    game.get_curr_rack()[:] = [Tile('*' if blank else letter) for _, _, letter, blank in move.placements]
+    play_resp = client.put('/play/', json={
+        'game_id': game_id,
+        'player_id': game.curr_player,
+        'tiles': move_tiles(move)
+    })
+    assert play_resp.status_code == 201
+    assert play_resp.json['finished']
+    assert client.get(f'/game/{game_id}').json['state'] == 'finished'
+    # A finished game takes no more move
+    abort_resp = client.put('/play/abort', json={'game_id': game_id, 'player_id': game.curr_player})
+    assert abort_resp.status_code == 403
+    assert abort_resp.json['err_msg'] == 'game not running'
+
+
+def test_bot_reply(app, client):
+    post_resp = client.post('/game/', json={'name': 'bot_game', 'nb_players': 2, 'creator_id': 'player_1',
+                                            'bots': ['greedy']})
+    game_id = post_resp.json['id']
+    start_resp = client.put('/game/start', json={'game_id': game_id})
+    assert start_resp.status_code == 201
+    # A bot starting the game has played at once
+    game = live_game(app, game_id)
+    assert game.curr_player == 'player_1'
+    turn = game.turn
+    play_resp = client.put('/play/', json={
+        'game_id': game_id,
+        'player_id': 'player_1',
+        'tiles': move_tiles(best_move(game))
+    })
+    assert play_resp.status_code == 201
+    assert play_resp.json['curr_player'] != 'player_1'
+    game = live_game(app, game_id)
+    assert game.turn == turn + 2
+    assert game.curr_player == 'player_1'
+
+
+def start_bot_game(client):
+    post_resp = client.post('/game/', json={'name': 'bot_game', 'nb_players': 2, 'creator_id': 'player_1',
+                                            'bots': ['greedy']})
+    game_id = post_resp.json['id']
+    assert client.put('/game/start', json={'game_id': game_id}).status_code == 201
+    return game_id
+
+
+def test_bot_search_failure(app, client, monkeypatch):
+    def fail(game_doc, spec):
+        raise RuntimeError('search failed')
+    monkeypatch.setattr('scrabble_flask.routes.play.choose_bot_move', fail)
+    game_id = start_bot_game(client)
+    game = live_game(app, game_id)
+    if game.turn == 0:
+        client.put('/play/abort', json={'game_id': game_id, 'player_id': 'player_1'})
+    # The bot passed its turn
+    game = live_game(app, game_id)
+    assert game.curr_player == 'player_1'
+    assert game.turn in (1, 2)
+
+
+def test_bot_turn_resumed(app, client, monkeypatch):
+    # No bot task: the turn of the bot is left pending
+    monkeypatch.setattr('scrabble_flask.routes.play.run_bot_turns', lambda app, game_id: None)
+    game_id = start_bot_game(client)
+    if live_game(app, game_id).curr_player == 'player_1':
+        client.put('/play/abort', json={'game_id': game_id, 'player_id': 'player_1'})
+    turn = live_game(app, game_id).turn
+    monkeypatch.undo()
+    # The next request on the game resumes it
+    abort_resp = client.put('/play/abort', json={'game_id': game_id, 'player_id': 'player_1'})
+    assert abort_resp.status_code == 403
+    assert abort_resp.json['err_msg'] == 'not your turn'
+    game = live_game(app, game_id)
+    assert game.turn == turn + 1
+    assert game.curr_player == 'player_1'
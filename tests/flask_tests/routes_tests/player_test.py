@@ -33,3 +33,11 @@ def test_delete_player(client):
 def test_delete_404(client):
     redelete_resp = client.delete('/player/unexistent_id')
     assert redelete_resp.status_code == 404
+
+
+def test_get_players_page(client):
+    first_page = client.get('/player/?limit=1').json
+    assert len(first_page) == 1
+    next_page = client.get(f'/player/?after={first_page[0]["id"]}&limit=10').json
+    assert first_page[0]['id'] < next_page[0]['id']
+    assert first_page[0] not in next_page
@@ -0,0 +1,97 @@
+import time
+
+import pytest
+from scrabble_python import Player, Scrabble, Tile
+from scrabble_python.bots import (BOTS, MonteCarloBot, leave_value, make_bot,
+                                  rack_leave)
+from scrabble_python.movegen import generate_moves
+
+
+def new_game(rack: str) -> Scrabble:
+    game = Scrabble(players=[Player('player_1'), Player('player_2')])
+    game.get_curr_rack()[:] = [Tile(letter) for letter in rack]
+    return game
+
+
+def test_leave_value():
+    assert leave_value('*') > leave_value('S') > leave_value('E') > leave_value('Q')
+    # Duplicates and unbalanced racks are penalized
+    assert leave_value('EE') < 2 * leave_value('E')
+    assert leave_value('AEIO') < leave_value('AERT')
+
+
+def test_rack_leave():
+    game = new_game('MAISON*')
+    move = next(move for move in generate_moves(game.board, game.get_curr_rack()) if move.word == 'MAISON')
+    assert rack_leave('MAISON*', move) == '*'
+
+
+@pytest.mark.parametrize('strategy', list(BOTS))
+def test_bot_move_is_valid(strategy):
+    game = new_game('MAISONS')
+    move = make_bot(strategy, seed=1, **({'budget_ms': 20} if strategy == 'montecarlo' else {})).choose(game)
+    tiles = game.check_format_move(move)
+    assert game.board.get_next_words(tiles)
+
+
+def test_greedy_bot_best_score():
+    game = new_game('MAISONS')
+    move = make_bot('greedy').choose(game)
+    best = max(generate_moves(game.board, game.get_curr_rack()), key=lambda move: move.score)
+    assert game.board.compute_score(game.check_format_move(move)) == best.score
+
+
+def test_leave_bot_equity():
+    game = new_game('RAT*QVW')
+    moves = generate_moves(game.board, game.get_curr_rack())
+    leave_bot, greedy_bot = make_bot('leave'), make_bot('greedy')
+    equities = leave_bot.equities(game, moves)
+    assert equities[moves.index(leave_bot.pick(game, moves))] == max(equities)
+    assert equities[moves.index(leave_bot.pick(game, moves))] >= equities[moves.index(greedy_bot.pick(game, moves))]
+    # Nothing to keep for once the purse is empty: the best score is played
+    game.purse.counts = [0] * len(game.purse.counts)
+    assert leave_bot.equities(game, moves) == [move.score for move in moves]
+
+
+def test_bot_passes_without_move():
+    game = new_game('QQQQQQQ')
+    assert make_bot('greedy').choose(game) is None
+
+
+def mid_game(rack: str) -> Scrabble:
+    game = Scrabble(players=[Player('player_1'), Player('player_2')], seed=4)
+    bot = make_bot('greedy')
+    for _ in range(10):
+        game.submit(bot.choose(game))
+    game.get_curr_rack()[:] = [Tile(letter) for letter in rack]
+    return game
+
+
+@pytest.mark.parametrize('rack', ['EARTLSN', 'EAR**SN'])
+def test_montecarlo_budget(rack):
+    # Two blanks give some 40,000 moves, generated in about a second
+    game = mid_game(rack)
+    bot = make_bot('montecarlo', seed=3, budget_ms=100)
+    start = time.perf_counter()
+    move = bot.choose(game)
+    assert time.perf_counter() - start < 0.1 + 0.05
+    assert game.board.get_next_words(game.check_format_move(move))
+
+
+def test_montecarlo_no_time():
+    # Out of time, the bot plays one of the first moves found, without simulation
+    game = new_game('EARTLSN')
+    move = make_bot('montecarlo', seed=3, budget_ms=1e-3).choose(game)
+    assert game.board.get_next_words(game.check_format_move(move))
+
+
+def test_montecarlo_unseen_tiles():
+    game = new_game('EARTLSN')
+    unseen = MonteCarloBot.unseen_tiles(game)
+    assert len(unseen) == len(game.purse) + 7
+    assert len(game.purse.tiles) == len(game.purse)
+
+
+def test_unknown_strategy():
+    with pytest.raises(ValueError):
+        make_bot('chess')
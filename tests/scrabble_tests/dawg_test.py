@@ -0,0 +1,45 @@
+import pytest
+from scrabble_python.dawg import Dawg, compile_lexicon, gaddag_entries
+
+words = ['CAR', 'CARS', 'CAT', 'CATS', 'DOG', 'DOGS', 'DO']
+
+
+@pytest.fixture(scope='module', params=['dawg', 'gaddag'])
+def dawg(request) -> Dawg:
+    return Dawg.from_words(words, request.param)
+
+
+def test_membership(dawg: Dawg):
+    assert len(dawg) == len(words)
+    assert all(word in dawg for word in words)
+    assert all(word not in dawg for word in ['', 'C', 'CA', 'D', 'DOGSS', 'TAC'])
+
+
+def test_prefix(dawg: Dawg):
+    assert dawg.has_prefix('CA')
+    assert dawg.has_prefix('DOGS')
+    assert not dawg.has_prefix('CO')
+
+
+def test_iter_words():
+    dawg = Dawg.from_words(words)
+    assert list(dawg.iter_words()) == sorted(words)
+    assert list(dawg.iter_words('CA')) == ['CAR', 'CARS', 'CAT', 'CATS']
+    assert list(dawg.iter_words('Z')) == []
+
+
+def test_minimized():
+    # CAR/CAT and CARS/CATS share their suffix nodes
+    dawg = Dawg.from_words(['CAR', 'CARS', 'CAT', 'CATS'])
+    assert len(dawg.edges) == 1 + 1 + 1 + 2 + 1
+
+
+def test_gaddag_entries():
+    assert gaddag_entries('CAT') == ['TAC', 'C>AT', 'AC>T']
+
+
+def test_save_and_mmap(tmp_path):
+    path = compile_lexicon('en', 'dawg', f'{tmp_path}/')
+    loaded = Dawg.load(path)
+    assert 'HELLO' in loaded and 'WORLD' in loaded
+    assert list(loaded.iter_words()) == ['HELLO', 'WORLD']
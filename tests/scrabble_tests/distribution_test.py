@@ -0,0 +1,34 @@
+import pytest
+from scrabble_python.distribution import CODES, get_distribution
+from scrabble_python.helpers import create_distribution
+
+
+def test_distribution_loaded_once():
+    dist = get_distribution('fr')
+    assert get_distribution('fr') is dist
+    get_distribution.cache_clear()
+    assert get_distribution('fr') is not dist
+
+
+@pytest.mark.parametrize('lang', ['fr', 'en'])
+def test_distribution_matches_csv(lang):
+    csv_dist = create_distribution(lang, 'dict')
+    dist = get_distribution(lang)
+    assert list(dist) == list(csv_dist)
+    for letter, infos in csv_dist.items():
+        assert dist.value(letter) == infos['value']
+        assert dist.count(letter) == infos['count']
+        assert dist.values[CODES[letter]] == infos['value']
+    assert len(dist) == sum(infos['count'] for infos in csv_dist.values())
+
+
+def test_distribution_codes():
+    assert CODES['*'] == 0
+    assert CODES['A'] == 1 and CODES['Z'] == 26
+    assert len(get_distribution('fr').counts) == 27
+
+
+def test_distribution_immutable():
+    dist = get_distribution('fr')
+    with pytest.raises(TypeError):
+        dist.values[1] = 5
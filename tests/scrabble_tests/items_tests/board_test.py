@@ -1,3 +1,4 @@
+import pickle
 from copy import deepcopy
 
 import pytest
@@ -5,6 +6,8 @@ from scrabble_python.errors import (BadWords, BoardOverlap, NoCenter,
                                     NoContact, OutOfBoard, ScrabbleError,
                                     UnalignedTiles)
 from scrabble_python import Board, Tile, Word
+from scrabble_python.items.board import (get_premiums, premium_layouts,
+                                         register_premium_layout)
 
 
 def test_init_board():
@@ -141,3 +144,156 @@ def test_get_new_words_unvalid(test_board: Board):
 def test_get_score(empty_test_board: Board, next_tiles, points):
     assert empty_test_board.compute_score(next_tiles) == points
     empty_test_board.add_tiles(next_tiles)
+
+
+def test_board_grid(test_board: Board):
+    assert test_board.is_occupied((7, 7))
+    assert not test_board.is_occupied((8, 7))
+    assert not test_board.is_occupied((7, 15))
+    assert test_board.has_neighbor((8, 7))
+    assert not test_board.has_neighbor((9, 7))
+    assert test_board.get_tile((7, 8)) == Tile('E', (7, 8))
+    assert test_board.get_tile((8, 8)) is None
+    assert test_board.tiles == [Tile('T', (7, 7)), Tile('E', (7, 8)),
+                                Tile('S', (7, 9)), Tile('T', (7, 10))]
+
+
+def test_board_copy(test_board: Board):
+    board_copy = test_board.copy()
+    assert board_copy == test_board
+    board_copy.add_tiles([Tile('O', (8, 7)), Tile('I', (9, 7))])
+    assert board_copy != test_board
+    assert len(board_copy) == 6 and len(test_board) == 4
+
+
+def test_unassigned_blank(test_board: Board):
+    with pytest.raises(ScrabbleError):
+        test_board.add_tiles([Tile('*', (8, 7))])
+    test_board.add_tiles([Tile('O', (8, 7), blank=True)])
+    assert test_board.get_tile((8, 7)).blank
+
+
+def test_blank_score(test_board: Board):
+    # TOI down from the T of TEST, the O being a blank on a double letter
+    next_tiles = [Tile('O', (8, 7), blank=True), Tile('I', (9, 7))]
+    next_words = test_board.get_next_words(next_tiles)
+    assert [word.text for word in next_words] == ['TOI']
+    assert test_board.compute_score(next_tiles, next_words) == 1 + 0 + 1
+    test_board.add_tiles(next_tiles)
+    # The blank keeps scoring nothing in the words crossing it later, S on a double letter
+    assert test_board.compute_score([Tile('S', (8, 8)), Tile('E', (8, 9))]) == (0 + 1*2 + 1) + (1 + 1*2) + (1 + 1)
+
+
+def test_get_next_words_no_mutation(test_board: Board):
+    grid = test_board.grid.copy()
+    test_board.get_next_words([Tile('O', (8, 7)), Tile('I', (9, 7))])
+    with pytest.raises(BadWords):
+        test_board.get_next_words([Tile('Z', (8, 7)), Tile('W', (9, 7))])
+    assert test_board.grid == grid
+    assert len(test_board) == 4
+
+
+def test_get_next_words_cross_words(test_board: Board):
+    test_board.add_tiles([Tile('O', (8, 7)), Tile('I', (9, 7))])
+    next_words = test_board.get_next_words([Tile('S', (8, 8)), Tile('E', (8, 9))])
+    assert {(word.text, word.start, word.direction) for word in next_words} == {
+        ('OSE', (8, 7), 'H'), ('ES', (7, 8), 'V'), ('SE', (7, 9), 'V')
+    }
+
+
+def test_premiums_standard_layout():
+    letter_mult, word_mult = get_premiums(15)
+    assert len(letter_mult) == len(word_mult) == 15 * 15
+    assert word_mult[7 * 15 + 7] == 2 and word_mult[0] == 3
+    assert letter_mult[1 * 15 + 5] == 3 and letter_mult[0 * 15 + 3] == 2
+    assert sum(mult > 1 for mult in letter_mult) == 36
+    assert sum(mult > 1 for mult in word_mult) == 25
+
+
+@pytest.mark.parametrize('size', [7, 11, 21])
+def test_premiums_scaled_layout(size):
+    letter_mult, word_mult = get_premiums(size)
+    center = size // 2
+    assert word_mult[center * size + center] == 2
+    assert word_mult[0] == word_mult[size * size - 1] == 3
+    assert all(letter_mult[sq] == 1 for sq in range(size * size) if word_mult[sq] > 1)
+
+
+@pytest.fixture
+def custom_layout_size():
+    # The layout registry is global: the custom layout is removed after the test
+    yield 5
+    premium_layouts.pop(5, None)
+    get_premiums.cache_clear()
+
+
+def test_custom_premium_layout(custom_layout_size):
+    register_premium_layout(custom_layout_size, {2: [(0, 1)]}, {3: [(0, 0)]})
+    board = Board(size=custom_layout_size)
+    assert board.compute_score([Tile('E', (2, 2)), Tile('T', (2, 3))]) == 2
+    assert board.letter_mult[1] == 2 and board.word_mult[0] == 3
+    assert sum(board.word_mult) == 25 + 2
+
+
+def test_score_with_given_words(test_board: Board):
+    next_tiles = [Tile('O', (8, 7)), Tile('I', (9, 7))]
+    next_words = test_board.get_next_words(next_tiles)
+    score = test_board.compute_score(next_tiles, next_words)
+    assert score == test_board.compute_score(next_tiles) == 1 + 1 + 1
+    assert test_board.compute_score(next_tiles, next_words) == score
+
+
+def assert_caches_up_to_date(board: Board):
+    size = board.SIZE
+    for direction in 'HV':
+        for sq in range(size * size):
+            if not board.grid[sq]:
+                assert (board.cross_checks[direction][sq], board.cross_sums[direction][sq]) \
+                    == board.compute_cross_check(sq, direction)
+    assert board.anchors == {sq for sq in range(size * size) if board.is_anchor(sq)}
+
+
+def test_cross_checks(test_board: Board):
+    # Under the first T, T? must be a word (TA but not TZ), after TEST, TEST? must be one
+    checks = test_board.cross_checks
+    assert checks['H'][8 * 15 + 7] >> 1 & 1 and checks['H'][8 * 15 + 7] >> 26 & 1 == 0
+    assert test_board.cross_sums['H'][8 * 15 + 7] == 1
+    assert checks['V'][7 * 15 + 11] >> 19 & 1 and checks['V'][7 * 15 + 11] >> 26 & 1 == 0
+    assert test_board.cross_sums['V'][7 * 15 + 11] == 4
+    assert test_board.anchors == {6 * 15 + y for y in range(7, 11)} | {8 * 15 + y for y in range(7, 11)} \
+        | {7 * 15 + 6, 7 * 15 + 11}
+
+
+def test_cross_checks_incremental(test_board: Board):
+    assert_caches_up_to_date(test_board)
+    moves = [[Tile('O', (8, 7)), Tile('I', (9, 7))], [Tile('S', (8, 8)), Tile('E', (8, 9))]]
+    for tiles in moves:
+        test_board.add_tiles(tiles)
+        assert_caches_up_to_date(test_board)
+    for tiles in reversed(moves):
+        test_board.remove_tiles(tiles)
+        assert_caches_up_to_date(test_board)
+    test_board.remove_tiles(test_board.tiles)
+    assert test_board.anchors == {7 * 15 + 7}
+    assert_caches_up_to_date(test_board)
+
+
+def test_board_pickle(test_board: Board):
+    restored = pickle.loads(pickle.dumps(test_board))
+    assert restored == test_board
+    assert restored.anchors == test_board.anchors
+    assert restored.cross_checks == test_board.cross_checks
+
+
+def test_remove_tiles_restore_checks(test_board: Board):
+    board_copy = test_board.copy()
+    checks = test_board.save_checks()
+    new_tiles = [Tile('O', (8, 7)), Tile('I', (9, 7))]
+    test_board.add_tiles(new_tiles)
+    board_copy.add_tiles(new_tiles)
+    test_board.remove_tiles(new_tiles, checks)
+    board_copy.remove_tiles(new_tiles)
+    assert test_board == board_copy
+    assert test_board.cross_checks == board_copy.cross_checks
+    assert test_board.cross_sums == board_copy.cross_sums
+    assert test_board.anchors == board_copy.anchors
@@ -12,3 +12,12 @@ def test_player():
     assert player.ID == 'id_str'
     assert player.score == 5
     assert len(player.rack) == 2
+
+
+def test_player_copy():
+    player = Player(player_id='id_str', score=5, rack=[Tile('A'), Tile('B')])
+    player_copy = player.copy()
+    assert player_copy == player
+    player_copy.rack.pop()
+    player_copy.score += 1
+    assert len(player.rack) == 2 and player.score == 5
@@ -1,3 +1,5 @@
+import pickle
+
 import pytest
 from scrabble_python.errors import EmptyPurse, ScrabbleError
 from scrabble_python.helpers import create_distribution
@@ -44,3 +46,54 @@ def test_empty_purse():
     with pytest.raises(ScrabbleError) as err_info:
         purse.draw(103)
     assert err_info.typename == EmptyPurse.__name__
+
+
+def test_seeded_purse():
+    purse, same_seed_purse = Purse(seed=42), Purse(seed=42)
+    assert purse.draw(7) == same_seed_purse.draw(7)
+    assert purse == same_seed_purse
+
+
+def test_purse_state():
+    purse = Purse(seed=7)
+    purse.draw(10)
+    state = purse.__getstate__()
+    assert len(state['counts']) == 27 and all(isinstance(count, int) for count in state['counts'])
+    restored = pickle.loads(pickle.dumps(purse))
+    assert restored == purse
+    assert restored.draw(20) == purse.draw(20)
+
+
+def test_put_back():
+    purse = Purse({'A': 1, 'B': 1})
+    tiles = purse.draw(2)
+    assert len(purse) == 0
+    purse.put_back(tiles)
+    assert purse.get_dist()['A'] == 1 and purse.get_dist()['B'] == 1
+
+
+def test_draw_too_many_keeps_tiles():
+    purse = Purse({'A': 2})
+    with pytest.raises(EmptyPurse):
+        purse.draw(3)
+    assert len(purse) == 2
+
+
+def test_purse_copy():
+    purse = Purse(seed=5)
+    purse.draw(3)
+    purse_copy = purse.copy()
+    assert purse_copy == purse and purse_copy.nb_draws == 3
+    # Same next draws, independent counts
+    assert purse_copy.draw(4) == purse.draw(4)
+    purse_copy.draw(1)
+    assert len(purse_copy) == len(purse) - 1
+
+
+def test_purse_snapshot():
+    purse = Purse(seed=5)
+    snapshot = purse.snapshot()
+    drawn = purse.draw(7)
+    purse.restore(snapshot)
+    assert len(purse) == 102 and purse.nb_draws == 0
+    assert purse.draw(7) == drawn
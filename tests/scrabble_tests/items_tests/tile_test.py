@@ -1,3 +1,6 @@
+import pickle
+from copy import deepcopy
+
 import pytest
 from scrabble_python import Tile
 
@@ -23,3 +26,23 @@ def test_tile_eq():
     assert tileA != tileAbis
     tileAter = Tile('a', (1, 1))
     assert tileA == tileAter
+
+
+def test_tile_shared():
+    assert Tile('a') is Tile('A')
+    assert Tile('A') is not Tile('A', lang='en')
+    assert Tile('A', (1, 1)) is not Tile('A', (1, 1))
+    assert not hasattr(Tile('A'), '__dict__')
+
+
+def test_tile_hash():
+    assert hash(Tile('A', [1, 1])) == hash(Tile('a', (1, 1)))
+    assert len({Tile('A'), Tile('A'), Tile('A', (1, 1)), Tile('A', (1, 1), blank=True)}) == 3
+    assert {Tile('B', (2, 3)): 'b'}[Tile('B', (2, 3))] == 'b'
+
+
+def test_tile_copy():
+    tile = Tile('A', (1, 1))
+    assert deepcopy(tile) is tile
+    assert pickle.loads(pickle.dumps(tile)) == tile
+    assert pickle.loads(pickle.dumps(Tile('A'))) is Tile('A')
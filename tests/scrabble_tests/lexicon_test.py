@@ -0,0 +1,48 @@
+import re
+
+import pytest
+from scrabble_python.lexicon import Lexicon, get_lexicon
+
+
+def test_lexicon_loaded_once():
+    assert get_lexicon('fr') is get_lexicon('fr')
+    assert get_lexicon('fr') is not get_lexicon('en')
+
+
+@pytest.mark.parametrize('word, validity', [
+    ('VALIDE', True), ('valide', True), ('VALLIDE', False), ('MINITEL', False)
+])
+def test_lexicon_membership(word, validity):
+    assert (word in get_lexicon('fr')) is validity
+
+
+def test_custom_lexicon():
+    lexicon = Lexicon.from_words(['test', 'Proper'], 'fr')
+    assert len(lexicon) == 1
+    assert 'TEST' in lexicon
+    assert 'PROPER' not in lexicon
+
+
+def test_last_word_not_truncated():
+    assert 'WORLD' in get_lexicon('en')
+
+
+def test_lexicon_prefix():
+    lexicon = get_lexicon('fr')
+    assert lexicon.has_prefix('zyth')
+    assert not lexicon.has_prefix('ZYX')
+
+
+@pytest.mark.parametrize('pattern', ['T*ST', 'T??T', '*EST', 'TES*', 'TEST', 'T*', '**'])
+def test_lexicon_match(pattern):
+    lexicon = Lexicon.from_words(['tes', 'test', 'teste', 'tost', 'taste', 'ta', 'best', 'tact'], 'fr')
+    regex = re.compile(pattern.replace('*', '.').replace('?', '.'))
+    expected = [word for word in lexicon.dawg.iter_words() if regex.fullmatch(word)]
+    assert lexicon.match(pattern) == expected
+
+
+def test_lexicon_match_two_blanks():
+    matches = get_lexicon('fr').match('*a*son')
+    assert 'MAISON' in matches
+    assert all(len(word) == 6 and word.endswith('SON') and word[1] == 'A' for word in matches)
+    assert get_lexicon('fr').match('zx*') == []
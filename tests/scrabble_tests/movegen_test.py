@@ -0,0 +1,85 @@
+from itertools import combinations, permutations
+
+import pytest
+from scrabble_python import Board, Tile
+from scrabble_python.errors import ScrabbleError
+from scrabble_python.movegen import MoveGenerator, best_moves, generate_moves
+
+
+def rack_of(letters: str) -> list[Tile]:
+    return [Tile(letter) for letter in letters]
+
+
+def test_first_move_on_center():
+    moves = generate_moves(Board(), rack_of('TEST'))
+    assert moves
+    assert all((7, 7) in [tile.pos for tile in move.tiles] for move in moves)
+    assert {'TEST', 'SET', 'TES'} <= {move.word for move in moves}
+
+
+@pytest.mark.parametrize('letters', ['AEIRSNT', 'ZOUK', 'QA'])
+def test_moves_are_legal_and_scored(test_board: Board, letters):
+    moves = generate_moves(test_board, rack_of(letters))
+    assert moves
+    for move in moves:
+        test_board.get_next_words(move.tiles)
+        assert test_board.compute_score(move.tiles) == move.score
+
+
+def test_moves_are_exhaustive(test_board: Board):
+    rack = 'AS'
+    legal = set()
+    free = [(x, y) for x in range(4, 11) for y in range(4, 14) if x != 7]
+    for tiles in [[Tile(letter, pos)] for pos in free for letter in rack] + \
+            [[Tile(l1, p1), Tile(l2, p2)] for p1, p2 in combinations(free, 2)
+             for l1, l2 in permutations(rack) if p1[0] == p2[0] or p1[1] == p2[1]]:
+        try:
+            legal.add((frozenset((tile.letter, tile.pos) for tile in tiles), test_board.compute_score(tiles)))
+        except ScrabbleError:
+            pass
+    generated = {(frozenset((tile.letter, tile.pos) for tile in move.tiles), move.score)
+                 for move in generate_moves(test_board, rack_of(rack))
+                 if all(4 <= x < 11 and 4 <= y < 14 and x != 7 for x, y, _, _ in move.placements)}
+    assert legal == generated
+
+
+def test_no_duplicate_moves(test_board: Board):
+    moves = generate_moves(test_board, rack_of('AEIRSNT'))
+    placements = [frozenset(move.placements) for move in moves]
+    assert len(placements) == len(set(placements))
+
+
+def test_blank_moves(test_board: Board):
+    moves = MoveGenerator(test_board).generate(rack_of('*Z'))
+    blank_moves = [move for move in moves if any(tile.blank for tile in move.tiles)]
+    assert blank_moves
+    for move in blank_moves:
+        test_board.get_next_words(move.tiles)
+        assert all(tile.value == 0 for tile in move.tiles if tile.blank)
+
+
+def test_no_move(test_board: Board):
+    assert generate_moves(test_board, []) == []
+
+
+def move_points(move) -> int:
+    return move.score + (50 if len(move) == 7 else 0)
+
+
+@pytest.mark.parametrize('letters', ['AEIRSNT', 'ZOUK', 'RAT*QVW', 'E*S*'])
+def test_best_moves(test_board: Board, letters):
+    generator = MoveGenerator(test_board)
+    points = sorted(map(move_points, generator.generate(rack_of(letters))), reverse=True)
+    for k in (1, 8):
+        best = generator.best(rack_of(letters), k)
+        assert [move_points(move) for move in best] == points[:k]
+        for move in best:
+            assert test_board.compute_score(move.tiles) == move.score
+
+
+def test_deadline(test_board: Board):
+    # Past the deadline, only the moves found so far, once one is found
+    moves = generate_moves(test_board, rack_of('AEIRSNT'), deadline=0)
+    assert 0 < len(moves) < len(generate_moves(test_board, rack_of('AEIRSNT')))
+    assert len(best_moves(test_board, rack_of('AEIRSNT'), 8, deadline=0)) >= 1
+    assert generate_moves(test_board, rack_of('QQQ'), deadline=0) == []
@@ -1,6 +1,7 @@
 import pytest
-from scrabble_python import Player, Scrabble
-from scrabble_python.errors import ScrabbleError
+from scrabble_python import Player, Scrabble, Tile
+from scrabble_python.errors import NotInRack, ScrabbleError
+from scrabble_python.movegen import generate_moves
 
 custom_config = {
     'board_size': 11,
@@ -59,3 +60,115 @@ def test_exchange_letter(nb_tiles):
     assert all(tile in curr_rack for tile in to_keep)
     # Not always true due to randomness
     #assert any(tile not in curr_rack for tile in tiles_to_exchange)
+
+
+def test_blank_move():
+    game = Scrabble()
+    rack = game.get_curr_rack()
+    rack[:] = [Tile(letter) for letter in 'TES*ABC']
+    move = {(7, 7): 'T', (7, 8): 'E', (7, 9): 'S', (7, 10): 't'}
+    tiles = game.check_format_move(move)
+    assert [tile.blank for tile in tiles] == [False, False, False, True]
+    assert tiles[-1].letter == 'T' and tiles[-1].value == 0
+    assert [word.text for word in game.board.get_next_words(tiles)] == ['TEST']
+    drawn = game.update_rack(move)
+    # The other blank of the purse may have been drawn
+    assert rack.count(Tile('*')) == drawn.count(Tile('*')) and len(rack) == 7
+    # A single blank is not played twice
+    rack[:] = [Tile(letter) for letter in 'TES*ABC']
+    with pytest.raises(NotInRack):
+        game.check_format_move({(7, 7): 't', (7, 8): 'E', (7, 9): 'S', (7, 10): 't'})
+
+
+def test_seeded_game():
+    game = Scrabble(players=[Player('player1'), Player('player2')], seed=7)
+    other = Scrabble(players=[Player('player1'), Player('player2')], seed=7)
+    assert game.curr_player == other.curr_player
+    assert [game.players[pl_id].rack for pl_id in game.pl_ids] == [other.players[pl_id].rack for pl_id in other.pl_ids]
+    assert game.purse == other.purse
+
+
+def test_silent_game(capsys):
+    game = Scrabble(players=[Player('player1'), Player('player2')])
+    game.get_curr_rack()[:] = [Tile(letter) for letter in 'TEST']
+    game.submit({(7, 7): 'T', (7, 8): 'E', (7, 9): 'S', (7, 10): 'T'})
+    game.display_info()
+    assert game.get_print_scores() == [game.players[pl_id].score for pl_id in game.pl_ids]
+    assert capsys.readouterr().out == ''
+
+
+def test_info_events(capsys):
+    events = []
+    game = Scrabble(players=[Player('player1'), Player('player2')], listeners=[events.append], verbose=True)
+    game.get_print_scores()
+    game.display_info()
+    assert [event.name for event in events] == ['scores', 'game_info']
+    assert events[0].data['scores'] == {'player1': 0, 'player2': 0}
+    assert events[1].data['purse'] == len(game.purse)
+    assert events[1].data['rack'] == game.get_curr_rack()
+    out = capsys.readouterr().out
+    assert 'Scores:' in out and f'Player turn: {game.curr_player}' in out
+
+
+def test_game_events(capsys):
+    events = []
+    game = Scrabble(players=[Player('player1'), Player('player2')], listeners=[events.append], verbose=True)
+    player_id = game.curr_player
+    game.purse.counts = [0] * len(game.purse.counts)
+    game.get_curr_rack()[:] = [Tile(letter) for letter in 'TEST']
+    game.submit({(7, 7): 'T', (7, 8): 'E', (7, 9): 'S', (7, 10): 'Z'})
+    game.submit({(7, 7): 'T', (7, 8): 'E', (7, 9): 'S', (7, 10): 'T'})
+    assert [event.name for event in events] == ['move_rejected', 'purse_empty', 'move_applied', 'game_over']
+    assert all(event.player_id == player_id for event in events)
+    assert events[2].data['score'] == 8
+    assert events[3].data['winner'] == player_id
+    assert events[3].data['scores'][player_id] == 8 + events[3].data['bonus']
+    # verbose prints the events
+    assert 'Winner is' in capsys.readouterr().out
+
+
+def game_state(game: Scrabble) -> tuple:
+    return (game.turn, game.curr_player, bytes(game.board.grid), game.board.cross_checks['H'][:],
+            sorted(game.board.anchors), game.purse.counts[:], game.purse.nb_draws, dict(game.history),
+            [(player.score, player.rack[:]) for player in game.players.values()])
+
+
+def test_game_copy():
+    game = Scrabble(players=[Player('player1'), Player('player2')], seed=3, listeners=[print])
+    game_copy = game.copy()
+    assert game_state(game_copy) == game_state(game)
+    assert game_copy.listeners == []
+    state = game_state(game)
+    move = max(generate_moves(game_copy.board, game_copy.get_curr_rack()), key=lambda move: move.score)
+    game_copy.make_move(move.tiles)
+    assert game_state(game) == state
+    # The purse of a copy draws the same tiles
+    assert game.copy().purse.draw(2) == game.purse.draw(2)
+
+
+def test_make_unmake_move():
+    game = Scrabble(players=[Player('player1'), Player('player2')], seed=3)
+    state = game_state(game)
+    moves = generate_moves(game.board, game.get_curr_rack())
+    for move in moves:
+        undo = game.make_move(move.tiles)
+        assert game.turn == 1 and len(game.board) == len(move)
+        assert game.players[undo.player_id].score == move.score + (50 if len(move) == 7 else 0)
+        game.unmake_move(undo)
+        assert game_state(game) == state
+    # Same result as the validated path
+    move = max(moves, key=lambda move: move.score)
+    game_copy = game.copy()
+    game_copy.make_move(move.tiles)
+    submission = {(x, y): letter.lower() if blank else letter for x, y, letter, blank in move.placements}
+    game.submit(submission)
+    assert game_state(game_copy) == game_state(game)
+
+
+def test_make_invalid_move():
+    game = Scrabble(players=[Player('player1'), Player('player2')], seed=3)
+    state = game_state(game)
+    missing = next(letter for letter in 'ZYXWKJQ' if Tile(letter) not in game.get_curr_rack())
+    with pytest.raises(NotInRack):
+        game.make_move([Tile(missing, (7, 7)), Tile('A', (7, 8))], words=[])
+    assert game_state(game) == state
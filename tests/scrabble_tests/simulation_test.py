@@ -0,0 +1,38 @@
+import csv
+import io
+
+from scrabble_python.simulation import main, play_game, result_fields, simulate
+
+
+def test_play_game():
+    row = play_game(3, ('greedy', 'leave'), seed=10)
+    assert list(row) == result_fields(2)
+    assert row['seed'] == 13
+    assert row['ended'] in ('out', 'passes')
+    assert row['turns'] >= row['moves_1'] + row['moves_2']
+    assert row['winner'] == max(('player_1', 'player_2'), key=lambda pl_id: row[f'score_{pl_id[-1]}'])
+    # A game is reproduced by its seed
+    assert {**row, 'duration_ms': 0} == {**play_game(3, ('greedy', 'leave'), seed=10), 'duration_ms': 0}
+
+
+def test_simulate_pool():
+    inline, pooled = io.StringIO(), io.StringIO()
+    assert simulate(3, ('greedy', 'greedy'), inline, workers=0) == 3
+    assert simulate(3, ('greedy', 'greedy'), pooled, workers=2) == 3
+    inline_rows = [{**row, 'duration_ms': 0} for row in csv.DictReader(io.StringIO(inline.getvalue()))]
+    pooled_rows = [{**row, 'duration_ms': 0} for row in csv.DictReader(io.StringIO(pooled.getvalue()))]
+    assert [row['game'] for row in inline_rows] == ['0', '1', '2']
+    assert inline_rows == pooled_rows
+
+
+def test_main(tmp_path, capsys):
+    out = tmp_path / 'results.csv'
+    main(['--games', '2', '--bots', 'greedy', 'leave', 'greedy', '--workers', '0', '--out', str(out)])
+    with open(out, newline='') as results:
+        rows = list(csv.DictReader(results))
+    assert len(rows) == 2
+    assert rows[0]['strategy_3'] == 'greedy'
+    # Games are played silently, the summary only going to stderr
+    captured = capsys.readouterr()
+    assert captured.out == ''
+    assert '2 games' in captured.err